@@ -0,0 +1,313 @@
+import os
+import sys
+
+# Make the repo root importable so the shared ``common`` package resolves
+# regardless of invocation CWD.
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from common.zobrist import PLAYER_INDEX, SIDE_TO_MOVE_KEY, position_hash, zobrist_keys
+
+
+class BitBoard:
+    """
+    Bitboard implementation of the 6×6 Gomoku board.
+
+    This class is a drop-in replacement for
+    :class:`EASY_GOMOKU_class_board.Board`. Instead of a list of lists of
+    characters, each player's stones are stored in a single Python
+    integer, one bit per cell. Move generation and win detection are then
+    performed with shifts and bitwise operations rather than by walking
+    every cell of the grid.
+
+    Cells are laid out row by row with one padding column per row
+    (``STRIDE = SIZE + 1``), so the bit of cell ``(r, c)`` is
+    ``r * STRIDE + c``. The padding column is never occupied, which
+    prevents horizontal and diagonal shifts from wrapping from one row
+    into the next.
+
+    The public interface (``player``, ``grid``, ``copy``, ``legal_moves``,
+    ``play``, ``is_full``, ``print_board``, ``check_winner``,
+    ``winner_after_last_move`` and ``zobrist_key``) matches the
+    list-based board, so the Minimax search and the shape-based
+    evaluation run on it unchanged. ``zobrist_key`` is indexed by the
+    unpadded cell ``r * SIZE + c``, so both boards hash a position to the
+    same value.
+    """
+
+    SIZE = 6
+    EMPTY = '-'
+    STRIDE = SIZE + 1
+
+    # Bit shifts for the four line directions: horizontal, vertical,
+    # main diagonal and anti-diagonal.
+    SHIFTS = (1, STRIDE, STRIDE + 1, STRIDE - 1)
+
+    # Every real cell set, padding column clear: 0b0111111 repeated per row.
+    BOARD_MASK = int(('0' + '1' * SIZE) * SIZE, 2)
+
+    ZOBRIST_KEYS = zobrist_keys(SIZE, SIZE)
+
+    def __init__(self, grid=None, player='X'):
+        """
+        Initialize a board state.
+
+        Parameters
+        ----------
+        grid : list[list[str]] or None, optional
+            A 6×6 matrix representing the board state. Each cell contains
+            'X', 'O', or EMPTY. If None, an empty board is created.
+        player : {'X', 'O'}, optional
+            The player whose turn it is at this board state.
+            By convention, player 'X' moves first.
+        """
+        self.player = player
+        self.bits = {'X': 0, 'O': 0}
+        self.last_move = None
+        self._grid = None
+
+        stones = []
+        if grid:
+            for r in range(self.SIZE):
+                for c in range(self.SIZE):
+                    stone = grid[r][c]
+                    if stone != self.EMPTY:
+                        self.bits[stone] |= 1 << (r * self.STRIDE + c)
+                        stones.append((r * self.SIZE + c, stone))
+        self.zobrist_key = position_hash(self.SIZE, self.SIZE, stones, player)
+
+    @property
+    def grid(self):
+        """
+        Lazy list-of-lists view of the board.
+
+        The view is only materialised when requested (e.g. by the shape
+        detector or for printing) and is cached afterwards. Since boards
+        are never modified in place, the cache stays valid.
+
+        Returns
+        -------
+        list[list[str]]
+            A 6×6 matrix with 'X', 'O' or EMPTY in each cell.
+        """
+        if self._grid is None:
+            x_bits = self.bits['X']
+            o_bits = self.bits['O']
+            grid = []
+            for r in range(self.SIZE):
+                row = []
+                for c in range(self.SIZE):
+                    bit = 1 << (r * self.STRIDE + c)
+                    if x_bits & bit:
+                        row.append('X')
+                    elif o_bits & bit:
+                        row.append('O')
+                    else:
+                        row.append(self.EMPTY)
+                grid.append(row)
+            self._grid = grid
+        return self._grid
+
+    @property
+    def occupied(self):
+        """Bitmask of all occupied cells."""
+        return self.bits['X'] | self.bits['O']
+
+    def copy(self):
+        """
+        Create an independent copy of the board.
+
+        Copying only duplicates two integers and the player symbol.
+
+        Returns
+        -------
+        BitBoard
+            A copy of the current board.
+        """
+        new_board = BitBoard.__new__(BitBoard)
+        new_board.player = self.player
+        new_board.bits = dict(self.bits)
+        new_board.last_move = self.last_move
+        new_board.zobrist_key = self.zobrist_key
+        new_board._grid = None
+        return new_board
+
+    def _neighbor_mask(self, occupied):
+        """
+        Compute the empty cells adjacent to at least one stone.
+
+        The occupied mask is dilated by one step in the eight compass
+        directions using shifts; bits pushed into the padding column or
+        past the last row are removed by ``BOARD_MASK``.
+
+        Parameters
+        ----------
+        occupied : int
+            Bitmask of occupied cells.
+
+        Returns
+        -------
+        int
+            Bitmask of empty cells with at least one occupied neighbor.
+        """
+        dilated = 0
+        for shift in self.SHIFTS:
+            dilated |= (occupied << shift) | (occupied >> shift)
+        return dilated & self.BOARD_MASK & ~occupied
+
+    def legal_moves(self):
+        """
+        Generate legal moves for the current board state.
+
+        Legal moves are restricted to empty cells that are adjacent
+        (including diagonals) to at least one already placed stone.
+        If the board is empty, the center position is returned as the
+        only legal opening move.
+
+        Moves are returned in row-major order, exactly as in the
+        list-based board.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            A list of (row, column) coordinates representing legal moves.
+        """
+        occupied = self.occupied
+        if not occupied:
+            center = self.SIZE // 2 - 1
+            return [(center, center)]
+
+        candidates = self._neighbor_mask(occupied)
+        moves = []
+        while candidates:
+            low_bit = candidates & -candidates
+            moves.append(divmod(low_bit.bit_length() - 1, self.STRIDE))
+            candidates ^= low_bit
+        return moves
+
+    def play(self, move):
+        """
+        Apply a move and return the resulting board state.
+
+        The move is applied immutably: a new board is returned,
+        leaving the current board unchanged.
+
+        Parameters
+        ----------
+        move : tuple[int, int]
+            The (row, column) position where the current player
+            places a stone.
+
+        Returns
+        -------
+        BitBoard
+            A new board state after the move is applied.
+
+        Raises
+        ------
+        ValueError
+            If the specified cell is already occupied.
+        """
+        r, c = move
+        bit = 1 << (r * self.STRIDE + c)
+        if self.occupied & bit:
+            raise ValueError(f"Cell {move} is already occupied")
+
+        new_board = self.copy()
+        new_board.bits[self.player] |= bit
+        new_board.player = 'O' if self.player == 'X' else 'X'
+        new_board.last_move = move
+        new_board.zobrist_key ^= (
+            self.ZOBRIST_KEYS[PLAYER_INDEX[self.player]][r * self.SIZE + c]
+            ^ SIDE_TO_MOVE_KEY
+        )
+        return new_board
+
+    def is_full(self):
+        """
+        Check whether the board is completely filled.
+
+        Returns
+        -------
+        bool
+            True if there are no empty cells remaining, False otherwise.
+        """
+        return self.occupied == self.BOARD_MASK
+
+    def print_board(self):
+        """
+        Print the board state to the terminal.
+        """
+        print('  ' + ''.join(str(i + 1) for i in range(self.SIZE)))
+        for i, row in enumerate(self.grid):
+            print(f"{i + 1} " + ''.join(row))
+
+    def check_winner(self, stone):
+        """
+        Determine whether a given player has won the game.
+
+        For each direction, ``pairs = b & (b >> s)`` marks the stones
+        followed by another stone, and ``pairs & (pairs >> 2s)`` is
+        non-zero exactly when four stones are aligned.
+
+        Parameters
+        ----------
+        stone : {'X', 'O'}
+            The player symbol to check for a winning condition.
+
+        Returns
+        -------
+        bool
+            True if the specified player has achieved four in a row,
+            False otherwise.
+        """
+        stones = self.bits[stone]
+        for shift in self.SHIFTS:
+            pairs = stones & (stones >> shift)
+            if pairs & (pairs >> (2 * shift)):
+                return True
+        return False
+
+    def winner_after_last_move(self):
+        """
+        Determine the winner by looking only at the last move played.
+
+        Starting from the bit of the last move, runs of the same color
+        are followed with single-step shifts in both senses of each
+        direction. The padding column stops horizontal and diagonal runs
+        at the board edge.
+
+        If the last move is unknown (empty board, or a board built
+        directly from a grid), the method falls back to
+        :meth:`check_winner` for both players.
+
+        Returns
+        -------
+        str or None
+            The symbol of the winning player ('X' or 'O'), or None if
+            there is no winner.
+        """
+        if self.last_move is None:
+            for stone in ('X', 'O'):
+                if self.check_winner(stone):
+                    return stone
+            return None
+
+        r, c = self.last_move
+        bit = 1 << (r * self.STRIDE + c)
+        stone = 'X' if self.bits['X'] & bit else 'O'
+        stones = self.bits[stone]
+        for shift in self.SHIFTS:
+            count = 1
+            probe = bit << shift
+            while stones & probe:
+                count += 1
+                probe <<= shift
+            probe = bit >> shift
+            while stones & probe:
+                count += 1
+                probe >>= shift
+            if count >= 4:
+                return stone
+        return None
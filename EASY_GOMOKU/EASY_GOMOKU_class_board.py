@@ -1,3 +1,43 @@
+import itertools
+import os
+import sys
+
+# Make the repo root importable so the shared ``common`` package resolves
+# regardless of invocation CWD.
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from common.geometry import board_geometry
+from common.zobrist import PLAYER_INDEX, SIDE_TO_MOVE_KEY, position_hash, zobrist_keys
+
+
+def _neighbor_masks(size):
+    """
+    Precompute the 8-neighbourhood of every cell as a bitmask.
+
+    Parameters
+    ----------
+    size : int
+        Width and height of the square board.
+
+    Returns
+    -------
+    tuple[int, ...]
+        For the cell with flat index ``r * size + c``, a bitmask with one
+        bit set for each on-board neighbour (including diagonals).
+    """
+    masks = []
+    for r, c in itertools.product(range(size), repeat=2):
+        mask = 0
+        for dr, dc in itertools.product((-1, 0, 1), repeat=2):
+            nr, nc = r + dr, c + dc
+            if (dr or dc) and 0 <= nr < size and 0 <= nc < size:
+                mask |= 1 << (nr * size + nc)
+        masks.append(mask)
+    return tuple(masks)
+
+
 class Board:
     """
     Represents the Gomoku board and game state.
@@ -8,11 +48,26 @@ class Board:
 
     The game is played on a fixed 6×6 board with a four-in-a-row winning
     condition.
+
+    Besides the grid, the board keeps two bitmasks over the flat cell
+    indices ``r * SIZE + c``: the occupied cells, and the frontier of
+    empty cells adjacent to at least one stone. Both are updated in
+    constant time by :meth:`play` and :meth:`do`, so the grid must only
+    be modified through these methods. The same holds for
+    ``zobrist_key``, the 64-bit Zobrist hash of the position (see
+    :mod:`common.zobrist`).
     """
 
     SIZE = 6
     EMPTY = '-'
 
+    # (row, column) of every flat cell index, in row-major order.
+    CELLS = tuple(itertools.product(range(SIZE), repeat=2))
+    NEIGHBOR_MASKS = _neighbor_masks(SIZE)
+    FULL_MASK = (1 << (SIZE * SIZE)) - 1
+    ZOBRIST_KEYS = zobrist_keys(SIZE, SIZE)
+    GEOMETRY = board_geometry(SIZE, SIZE, 4)
+
     def __init__(self, grid=None, player='X'):
         """
         Initialize a board state.
@@ -31,6 +86,29 @@ class Board:
             [self.EMPTY for _ in range(self.SIZE)]
             for _ in range(self.SIZE)
         ]
+        # Position of the most recent stone, or None when unknown
+        # (empty board, or a board built directly from a grid).
+        self.last_move = None
+        # (move, previous last_move, previous frontier) for moves applied
+        # in place with do().
+        self._undo_stack = []
+
+        # Occupied cells and candidate-move frontier, built once here and
+        # maintained incrementally afterwards.
+        self._occupied = 0
+        self._frontier = 0
+        for index, (r, c) in enumerate(self.CELLS):
+            if self.grid[r][c] != self.EMPTY:
+                self._occupied |= 1 << index
+                self._frontier |= self.NEIGHBOR_MASKS[index]
+        self._frontier &= ~self._occupied
+
+        self.zobrist_key = position_hash(
+            self.SIZE, self.SIZE,
+            ((index, self.grid[r][c]) for index, (r, c) in enumerate(self.CELLS)
+             if self.grid[r][c] != self.EMPTY),
+            self.player,
+        )
 
     def copy(self):
         """
@@ -46,7 +124,15 @@ class Board:
             A deep copy of the current board, including the grid and
             the current player.
         """
-        return Board(grid=[row[:] for row in self.grid], player=self.player)
+        new_board = Board.__new__(Board)
+        new_board.player = self.player
+        new_board.grid = [row[:] for row in self.grid]
+        new_board.last_move = self.last_move
+        new_board._undo_stack = []
+        new_board._occupied = self._occupied
+        new_board._frontier = self._frontier
+        new_board.zobrist_key = self.zobrist_key
+        return new_board
 
     def legal_moves(self):
         """
@@ -60,40 +146,24 @@ class Board:
         If the board is empty, the center position is returned as the
         only legal opening move.
 
+        The candidate cells are read from the incrementally maintained
+        frontier bitmask and returned in row-major order.
+
         Returns
         -------
         list[tuple[int, int]]
             A list of (row, column) coordinates representing legal moves.
         """
-        moves = []
-        is_empty_board = True
-
-        for r in range(self.SIZE):
-            for c in range(self.SIZE):
-                if self.grid[r][c] == self.EMPTY:
-                    has_neighbor = False
-                    for dr in [-1, 0, 1]:
-                        for dc in [-1, 0, 1]:
-                            if dr == 0 and dc == 0:
-                                continue
-                            nr, nc = r + dr, c + dc
-                            if 0 <= nr < self.SIZE and 0 <= nc < self.SIZE:
-                                if self.grid[nr][nc] != self.EMPTY:
-                                    has_neighbor = True
-                                    is_empty_board = False
-                                    break
-                        if has_neighbor:
-                            break
-
-                    if has_neighbor:
-                        moves.append((r, c))
-                else:
-                    is_empty_board = False
-
-        if is_empty_board:
+        if not self._occupied:
             center = self.SIZE // 2 - 1
             return [(center, center)]
 
+        moves = []
+        frontier = self._frontier
+        while frontier:
+            low_bit = frontier & -frontier
+            moves.append(self.CELLS[low_bit.bit_length() - 1])
+            frontier ^= low_bit
         return moves
 
     def play(self, move):
@@ -126,8 +196,79 @@ class Board:
         new_board = self.copy()
         new_board.grid[r][c] = self.player
         new_board.player = 'O' if self.player == 'X' else 'X'
+        new_board.last_move = move
+
+        index = r * self.SIZE + c
+        new_board._occupied = self._occupied | (1 << index)
+        new_board._frontier = (
+            (self._frontier | self.NEIGHBOR_MASKS[index])
+            & ~new_board._occupied
+        )
+        new_board.zobrist_key = (
+            self.zobrist_key
+            ^ self.ZOBRIST_KEYS[PLAYER_INDEX[self.player]][index]
+            ^ SIDE_TO_MOVE_KEY
+        )
         return new_board
 
+    def do(self, move):
+        """
+        Apply a move in place.
+
+        This is the mutable counterpart of :meth:`play`. Instead of
+        allocating a new board, the stone is written into the current
+        grid and the move is pushed onto an undo stack, so that the
+        search can restore the previous state with :meth:`undo`.
+
+        Parameters
+        ----------
+        move : tuple[int, int]
+            The (row, column) position where the current player
+            places a stone.
+
+        Raises
+        ------
+        ValueError
+            If the specified cell is already occupied.
+        """
+        r, c = move
+        if self.grid[r][c] != self.EMPTY:
+            raise ValueError(f"Cell {move} is already occupied")
+
+        stone = self.player
+        self.grid[r][c] = stone
+        self._undo_stack.append((move, self.last_move, self._frontier))
+        self.last_move = move
+        self.player = 'O' if stone == 'X' else 'X'
+
+        index = r * self.SIZE + c
+        self._occupied |= 1 << index
+        self._frontier = (
+            (self._frontier | self.NEIGHBOR_MASKS[index]) & ~self._occupied
+        )
+        self.zobrist_key ^= (
+            self.ZOBRIST_KEYS[PLAYER_INDEX[stone]][index] ^ SIDE_TO_MOVE_KEY
+        )
+
+    def undo(self):
+        """
+        Revert the most recent move applied with :meth:`do`.
+
+        Raises
+        ------
+        IndexError
+            If there is no move to undo.
+        """
+        (r, c), self.last_move, self._frontier = self._undo_stack.pop()
+        stone = self.grid[r][c]
+        self.grid[r][c] = self.EMPTY
+        self.player = stone
+        index = r * self.SIZE + c
+        self._occupied &= ~(1 << index)
+        self.zobrist_key ^= (
+            self.ZOBRIST_KEYS[PLAYER_INDEX[stone]][index] ^ SIDE_TO_MOVE_KEY
+        )
+
     def is_full(self):
         """
         Check whether the board is completely filled.
@@ -137,11 +278,7 @@ class Board:
         bool
             True if there are no empty cells remaining, False otherwise.
         """
-        return all(
-            self.grid[r][c] != self.EMPTY
-            for r in range(self.SIZE)
-            for c in range(self.SIZE)
-        )
+        return self._occupied == self.FULL_MASK
 
     def print_board(self):
         """
@@ -159,7 +296,8 @@ class Board:
         Determine whether a given player has won the game.
 
         A win is defined as four consecutive stones aligned
-        horizontally, vertically, or diagonally.
+        horizontally, vertically, or diagonally. The candidate lines are
+        the precomputed winning windows of :mod:`common.geometry`.
 
         Parameters
         ----------
@@ -172,23 +310,57 @@ class Board:
             True if the specified player has achieved four in a row,
             False otherwise.
         """
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-
-        for r in range(self.SIZE):
-            for c in range(self.SIZE):
+        coords = self.GEOMETRY.cell_coords
+        for window in self.GEOMETRY.window_cells:
+            for cell in window:
+                r, c = coords[cell]
                 if self.grid[r][c] != stone:
-                    continue
-                for dr, dc in directions:
-                    count = 1
-                    nr, nc = r + dr, c + dc
-                    while (
-                        0 <= nr < self.SIZE
-                        and 0 <= nc < self.SIZE
-                        and self.grid[nr][nc] == stone
-                    ):
-                        count += 1
-                        if count == 4:
-                            return True
-                        nr += dr
-                        nc += dc
-        return False
\ No newline at end of file
+                    break
+            else:
+                return True
+        return False
+
+    def winner_after_last_move(self):
+        """
+        Determine the winner by looking only at the last move played.
+
+        A new four-in-a-row can only appear on one of the four lines
+        through the stone that was just placed, so only those lines are
+        scanned, instead of every cell of the board as in
+        :meth:`check_winner`. This assumes the position before the last
+        move had no winner, which holds for every node of a search that
+        stops at terminal states.
+
+        If the last move is unknown (empty board, or a board built
+        directly from a grid), the method falls back to a full scan for
+        both players.
+
+        Returns
+        -------
+        str or None
+            The symbol of the winning player ('X' or 'O'), or None if
+            there is no winner.
+        """
+        if self.last_move is None:
+            for stone in ('X', 'O'):
+                if self.check_winner(stone):
+                    return stone
+            return None
+
+        r, c = self.last_move
+        stone = self.grid[r][c]
+        for dr, dc in ((1, 0), (0, 1), (1, 1), (1, -1)):
+            count = 1
+            for sign in (1, -1):
+                nr, nc = r + sign * dr, c + sign * dc
+                while (
+                    0 <= nr < self.SIZE
+                    and 0 <= nc < self.SIZE
+                    and self.grid[nr][nc] == stone
+                ):
+                    count += 1
+                    nr += sign * dr
+                    nc += sign * dc
+            if count >= 4:
+                return stone
+        return None
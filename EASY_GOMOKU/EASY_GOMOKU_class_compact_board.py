@@ -0,0 +1,317 @@
+import os
+import sys
+
+# Make the repo root importable so the shared ``common`` package resolves
+# regardless of invocation CWD.
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from common.zobrist import PLAYER_INDEX, SIDE_TO_MOVE_KEY, position_hash
+
+from EASY_GOMOKU_class_board import Board
+
+
+class CompactBoard:
+    """
+    Memory-compact variant of :class:`EASY_GOMOKU_class_board.Board`.
+
+    The instance has no ``__dict__`` (all attributes are declared in
+    ``__slots__``) and the 6×6 grid is a single 36-byte ``bytearray``
+    holding the ASCII codes of 'X', 'O' and EMPTY, indexed by the flat
+    cell ``r * SIZE + c``. A search that allocates one board per node
+    (:meth:`play`) therefore creates two small objects per node instead of
+    a board, its ``__dict__``, an undo list and seven row lists.
+
+    The public interface matches the list-based board, including the
+    occupied/frontier bitmasks behind :meth:`legal_moves`, in-place
+    :meth:`do`/:meth:`undo` and ``zobrist_key``. The one difference is
+    ``grid``: it is built from the bytes on every access, so writing into
+    it does not change the board.
+    """
+
+    __slots__ = ('player', 'cells', 'last_move', 'zobrist_key',
+                 '_occupied', '_frontier', '_undo_stack')
+
+    SIZE = Board.SIZE
+    EMPTY = Board.EMPTY
+
+    CELLS = Board.CELLS
+    NEIGHBOR_MASKS = Board.NEIGHBOR_MASKS
+    FULL_MASK = Board.FULL_MASK
+    ZOBRIST_KEYS = Board.ZOBRIST_KEYS
+    GEOMETRY = Board.GEOMETRY
+
+    _EMPTY_CODE = ord(EMPTY)
+    _CODES = {'X': ord('X'), 'O': ord('O')}
+
+    def __init__(self, grid=None, player='X'):
+        """
+        Initialize a board state.
+
+        Parameters
+        ----------
+        grid : list[list[str]] or None, optional
+            A 6×6 matrix representing the board state. Each cell contains
+            'X', 'O', or EMPTY. If None, an empty board is created.
+        player : {'X', 'O'}, optional
+            The player whose turn it is at this board state.
+            By convention, player 'X' moves first.
+        """
+        self.player = player
+        if grid:
+            self.cells = bytearray(''.join(''.join(row) for row in grid), 'ascii')
+        else:
+            self.cells = bytearray(self.EMPTY * (self.SIZE * self.SIZE), 'ascii')
+        self.last_move = None
+        # Allocated by the first do(); most search nodes never need it.
+        self._undo_stack = None
+
+        self._occupied = 0
+        self._frontier = 0
+        for index, code in enumerate(self.cells):
+            if code != self._EMPTY_CODE:
+                self._occupied |= 1 << index
+                self._frontier |= self.NEIGHBOR_MASKS[index]
+        self._frontier &= ~self._occupied
+
+        self.zobrist_key = position_hash(
+            self.SIZE, self.SIZE,
+            ((index, chr(code)) for index, code in enumerate(self.cells)
+             if code != self._EMPTY_CODE),
+            self.player,
+        )
+
+    @property
+    def grid(self):
+        """
+        List-of-lists view of the board, built on every access.
+
+        Returns
+        -------
+        list[list[str]]
+            A 6×6 matrix with 'X', 'O' or EMPTY in each cell.
+        """
+        text = self.cells.decode('ascii')
+        return [list(text[i:i + self.SIZE])
+                for i in range(0, self.SIZE * self.SIZE, self.SIZE)]
+
+    def copy(self):
+        """
+        Create an independent copy of the board.
+
+        Returns
+        -------
+        CompactBoard
+            A copy of the current board, without its undo stack.
+        """
+        new_board = CompactBoard.__new__(CompactBoard)
+        new_board.player = self.player
+        new_board.cells = self.cells[:]
+        new_board.last_move = self.last_move
+        new_board.zobrist_key = self.zobrist_key
+        new_board._occupied = self._occupied
+        new_board._frontier = self._frontier
+        new_board._undo_stack = None
+        return new_board
+
+    def legal_moves(self):
+        """
+        Generate legal moves for the current board state.
+
+        Empty cells adjacent to at least one stone, read from the frontier
+        bitmask in row-major order, or the center on an empty board.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            A list of (row, column) coordinates representing legal moves.
+        """
+        if not self._occupied:
+            center = self.SIZE // 2 - 1
+            return [(center, center)]
+
+        moves = []
+        frontier = self._frontier
+        while frontier:
+            low_bit = frontier & -frontier
+            moves.append(self.CELLS[low_bit.bit_length() - 1])
+            frontier ^= low_bit
+        return moves
+
+    def play(self, move):
+        """
+        Apply a move and return the resulting board state.
+
+        Parameters
+        ----------
+        move : tuple[int, int]
+            The (row, column) position where the current player
+            places a stone.
+
+        Returns
+        -------
+        CompactBoard
+            A new board state after the move is applied.
+
+        Raises
+        ------
+        ValueError
+            If the specified cell is already occupied.
+        """
+        r, c = move
+        index = r * self.SIZE + c
+        if self.cells[index] != self._EMPTY_CODE:
+            raise ValueError(f"Cell {move} is already occupied")
+
+        new_board = self.copy()
+        new_board.cells[index] = self._CODES[self.player]
+        new_board.player = 'O' if self.player == 'X' else 'X'
+        new_board.last_move = move
+        new_board._occupied = self._occupied | (1 << index)
+        new_board._frontier = (
+            (self._frontier | self.NEIGHBOR_MASKS[index])
+            & ~new_board._occupied
+        )
+        new_board.zobrist_key = (
+            self.zobrist_key
+            ^ self.ZOBRIST_KEYS[PLAYER_INDEX[self.player]][index]
+            ^ SIDE_TO_MOVE_KEY
+        )
+        return new_board
+
+    def do(self, move):
+        """
+        Apply a move in place; see :meth:`EASY_GOMOKU_class_board.Board.do`.
+
+        Parameters
+        ----------
+        move : tuple[int, int]
+            The (row, column) position where the current player
+            places a stone.
+
+        Raises
+        ------
+        ValueError
+            If the specified cell is already occupied.
+        """
+        r, c = move
+        index = r * self.SIZE + c
+        if self.cells[index] != self._EMPTY_CODE:
+            raise ValueError(f"Cell {move} is already occupied")
+
+        stone = self.player
+        self.cells[index] = self._CODES[stone]
+        if self._undo_stack is None:
+            self._undo_stack = []
+        self._undo_stack.append((move, self.last_move, self._frontier))
+        self.last_move = move
+        self.player = 'O' if stone == 'X' else 'X'
+
+        self._occupied |= 1 << index
+        self._frontier = (
+            (self._frontier | self.NEIGHBOR_MASKS[index]) & ~self._occupied
+        )
+        self.zobrist_key ^= (
+            self.ZOBRIST_KEYS[PLAYER_INDEX[stone]][index] ^ SIDE_TO_MOVE_KEY
+        )
+
+    def undo(self):
+        """
+        Revert the most recent move applied with :meth:`do`.
+
+        Raises
+        ------
+        IndexError
+            If there is no move to undo.
+        """
+        if not self._undo_stack:
+            raise IndexError("pop from empty undo stack")
+        (r, c), self.last_move, self._frontier = self._undo_stack.pop()
+        index = r * self.SIZE + c
+        stone = chr(self.cells[index])
+        self.cells[index] = self._EMPTY_CODE
+        self.player = stone
+        self._occupied &= ~(1 << index)
+        self.zobrist_key ^= (
+            self.ZOBRIST_KEYS[PLAYER_INDEX[stone]][index] ^ SIDE_TO_MOVE_KEY
+        )
+
+    def is_full(self):
+        """
+        Check whether the board is completely filled.
+
+        Returns
+        -------
+        bool
+            True if there are no empty cells remaining, False otherwise.
+        """
+        return self._occupied == self.FULL_MASK
+
+    def print_board(self):
+        """
+        Print the board state to the terminal.
+        """
+        print('  ' + ''.join(str(i + 1) for i in range(self.SIZE)))
+        for i, row in enumerate(self.grid):
+            print(f"{i + 1} " + ''.join(row))
+
+    def check_winner(self, stone):
+        """
+        Determine whether a given player has won the game.
+
+        Parameters
+        ----------
+        stone : {'X', 'O'}
+            The player symbol to check for a winning condition.
+
+        Returns
+        -------
+        bool
+            True if the specified player has achieved four in a row,
+            False otherwise.
+        """
+        cells = self.cells
+        code = self._CODES[stone]
+        for window in self.GEOMETRY.window_cells:
+            for cell in window:
+                if cells[cell] != code:
+                    break
+            else:
+                return True
+        return False
+
+    def winner_after_last_move(self):
+        """
+        Determine the winner by looking only at the last move played.
+
+        Walks the precomputed rays through the last move; falls back to
+        :meth:`check_winner` for both players when the last move is
+        unknown.
+
+        Returns
+        -------
+        str or None
+            The symbol of the winning player ('X' or 'O'), or None if
+            there is no winner.
+        """
+        if self.last_move is None:
+            for stone in ('X', 'O'):
+                if self.check_winner(stone):
+                    return stone
+            return None
+
+        r, c = self.last_move
+        index = r * self.SIZE + c
+        cells = self.cells
+        code = cells[index]
+        for ray_pair in self.GEOMETRY.rays[index]:
+            count = 1
+            for ray in ray_pair:
+                for cell in ray:
+                    if cells[cell] != code:
+                        break
+                    count += 1
+            if count >= 4:
+                return chr(code)
+        return None
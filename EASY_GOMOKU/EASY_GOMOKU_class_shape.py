@@ -1,3 +1,183 @@
+import itertools
+from functools import lru_cache
+
+import numpy as np
+
+# Symbol codes of the 5-cell windows: empty, the two stones, and the
+# boundary marker 'B'. A window is encoded in base 4, cell k of the
+# window holding digit k, which gives 4 ** 5 = 1024 possible windows.
+SYMBOL_CODES = {'-': 0, 'X': 1, 'O': 2, 'B': 3}
+SYMBOLS = '-XOB'
+WINDOW_LENGTH = 5
+N_WINDOW_CODES = len(SYMBOLS) ** WINDOW_LENGTH
+
+PATTERNS = {
+    'four_in_row': ['XXXX', 'OOOO'],
+    'open_3': ['-XXX-', '-OOO-'],
+    'jump_3': ['XX-X', 'X-XX', 'OO-O', 'O-OO'],
+    'blocked_3': [
+        'BXXX', 'XXXB', 'OXXX', 'XXXO',
+        'BOOO', 'OOOB', 'XOOO', 'OOOX'
+    ],
+    'open_2': ['-XX-', '-OO-'],
+    'blocked_2': [
+        'BXX', 'XXB', 'BOO', 'OOB',
+        'OXX', 'XXO', 'XOO', 'OOX'
+    ],
+    'single': ['X', 'O'],
+}
+
+
+def match_patterns(line):
+    """
+    List the pattern types found in a window string.
+
+    Parameters
+    ----------
+    line : str
+        A window of cells ('X', 'O', '-' or 'B').
+
+    Returns
+    -------
+    tuple[str, ...]
+        One pattern type per pattern string of :data:`PATTERNS` that
+        occurs in ``line``, in the order of :data:`PATTERNS`.
+    """
+    return tuple(
+        pattern_type
+        for pattern_type, pattern_strings in PATTERNS.items()
+        for pattern in pattern_strings
+        if pattern in line
+    )
+
+
+def window_code(line):
+    """
+    Encode a window string as an integer in ``range(N_WINDOW_CODES)``.
+
+    Parameters
+    ----------
+    line : str
+        A window of :data:`WINDOW_LENGTH` cells.
+
+    Returns
+    -------
+    int
+        ``sum(SYMBOL_CODES[line[k]] * 4 ** k)``.
+    """
+    return sum(SYMBOL_CODES[symbol] << (2 * k) for k, symbol in enumerate(line))
+
+
+# Pattern types of every possible window, indexed by window_code().
+SHAPE_TABLE = [None] * N_WINDOW_CODES
+for _line in itertools.product(SYMBOLS, repeat=WINDOW_LENGTH):
+    SHAPE_TABLE[window_code(_line)] = match_patterns(''.join(_line))
+SHAPE_TABLE = tuple(SHAPE_TABLE)
+
+
+@lru_cache(maxsize=None)
+def window_cells(size, directions):
+    """
+    Precompute the cells of the window centred on every cell.
+
+    Parameters
+    ----------
+    size : int
+        Width and height of the square board.
+    directions : tuple[tuple[int, int], ...]
+        Line directions as (row, column) increments.
+
+    Returns
+    -------
+    tuple
+        For each flat cell ``r * size + c``, one tuple per direction of
+        the :data:`WINDOW_LENGTH` flat cells from offset -2 to +2 along
+        it. Cells off the board are given as ``size * size``, the index
+        of the boundary symbol appended by :meth:`Shape.window_codes`.
+    """
+    half = WINDOW_LENGTH // 2
+    boundary = size * size
+    table = []
+    for r, c in itertools.product(range(size), repeat=2):
+        windows = []
+        for dr, dc in directions:
+            cells = []
+            for k in range(-half, half + 1):
+                nr, nc = r + k * dr, c + k * dc
+                if 0 <= nr < size and 0 <= nc < size:
+                    cells.append(nr * size + nc)
+                else:
+                    cells.append(boundary)
+            windows.append(tuple(cells))
+        table.append(tuple(windows))
+    return tuple(table)
+
+
+# Symbol code of every byte value, for grids encoded as ASCII text.
+_BYTE_SYMBOL_CODES = np.zeros(256, dtype=np.int8)
+for _symbol, _code in SYMBOL_CODES.items():
+    _BYTE_SYMBOL_CODES[ord(_symbol)] = _code
+
+
+def batch_window_codes(boards):
+    """
+    Encode the window centred on every cell of many boards at once.
+
+    The vectorized counterpart of :meth:`Shape.window_codes`: the boards
+    are stacked into an int8 array of symbol codes, which
+    :func:`stone_window_codes` encodes.
+
+    Parameters
+    ----------
+    boards : sequence of Board
+        Boards of the same ``SIZE``, exposing ``grid``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer array of shape ``(len(boards), SIZE * SIZE, 4)``: the
+        :func:`window_code` of the window centred on each cell, in each
+        direction of :attr:`Shape.DIRECTIONS`. Windows centred on empty
+        cells are included; their centre digit is 0.
+    """
+    size = boards[0].SIZE
+    text = ''.join([''.join(row) for board in boards for row in board.grid])
+    cells = np.frombuffer(text.encode('ascii'), dtype=np.uint8).reshape(len(boards), -1)
+    return stone_window_codes(_BYTE_SYMBOL_CODES[cells], size)
+
+
+def stone_window_codes(stones, size):
+    """
+    :func:`batch_window_codes` of boards given as arrays of symbol codes.
+
+    All windows are gathered through the :func:`window_cells` index
+    table, so positions that never existed as ``Board`` objects (e.g.
+    replayed from game records) are encoded without building one.
+
+    Parameters
+    ----------
+    stones : numpy.ndarray
+        Integer array of shape ``(n_boards, size * size)``: the
+        :data:`SYMBOL_CODES` of the cells ('-' 0, 'X' 1, 'O' 2), row by row.
+    size : int
+        Width and height of the square boards.
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer array of shape ``(n_boards, size * size, 4)``, as
+        :func:`batch_window_codes`.
+    """
+    symbols = np.full((len(stones), size * size + 1), SYMBOL_CODES['B'], dtype=np.int8)
+    symbols[:, :-1] = stones
+    cells = symbols[:, np.array(window_cells(size, Shape.DIRECTIONS))].astype(np.int16)
+    # digit k of the code is window cell k (integer matmul is much slower)
+    codes = cells[..., 0]
+    for k in range(1, WINDOW_LENGTH):
+        codes = codes | cells[..., k] << (2 * k)
+    return codes
+
+
 class Shape:
     """
     Detect and classify local stone patterns on a Gomoku board.
@@ -11,12 +191,12 @@ class Shape:
     elements when identifying patterns.
     """
 
-    DIRECTIONS = [
+    DIRECTIONS = (
         (1, 0),   # vertical
         (0, 1),   # horizontal
         (1, 1),   # main diagonal
         (1, -1),  # anti-diagonal
-    ]
+    )
 
     def __init__(self, board):
         """
@@ -86,44 +266,43 @@ class Shape:
             ``(pattern_type, stone)``, where ``pattern_type`` is the
             name of the detected configuration and ``stone`` is the
             corresponding player symbol ('X' or 'O').
+
+        Each window is looked up in the precomputed :data:`SHAPE_TABLE`
+        instead of being searched for every pattern string.
         """
         shapes = []
+        for stone, code in self.window_codes():
+            shapes.extend((pattern_type, stone) for pattern_type in SHAPE_TABLE[code])
+        return shapes
 
-        patterns = {
-            'four_in_row': ['XXXX', 'OOOO'],
-            'open_3': ['-XXX-', '-OOO-'],
-            'jump_3': ['XX-X', 'X-XX', 'OO-O', 'O-OO'],
-            'blocked_3': [
-                'BXXX', 'XXXB', 'OXXX', 'XXXO',
-                'BOOO', 'OOOB', 'XOOO', 'OOOX'
-            ],
-            'open_2': ['-XX-', '-OO-'],
-            'blocked_2': [
-                'BXX', 'XXB', 'BOO', 'OOB',
-                'OXX', 'XXO', 'XOO', 'OOX'
-            ],
-            'single': ['X', 'O'],
-        }
-
-        for row in range(self.size):
-            for column in range(self.size):
-                stone = self.board[row][column]
-                if stone == '-':
-                    continue
-
-                for direction_row, direction_column in self.DIRECTIONS:
-                    line = ''
-                    for k in range(-2, 3):
-                        row_index = row + k * direction_row
-                        column_index = column + k * direction_column
-                        if 0 <= row_index < self.size and 0 <= column_index < self.size:
-                            line += self.board[row_index][column_index]
-                        else:
-                            line += 'B'  # boundary counts as block
-
-                    for pattern_type, pattern_strings in patterns.items():
-                        for pattern in pattern_strings:
-                            if pattern in line:
-                                shapes.append((pattern_type, stone))
-
-        return shapes
\ No newline at end of file
+    def window_codes(self):
+        """
+        Encode the window around every stone in every direction.
+
+        The window of a stone is the five cells from two steps before it
+        to two steps after it along a direction, off-board cells being
+        the boundary symbol 'B'.
+
+        Returns
+        -------
+        list[tuple[str, int]]
+            ``(stone, code)`` for each stone in row-major order and each
+            direction of :attr:`DIRECTIONS`, where ``code`` is the
+            :func:`window_code` of the window, an index into
+            :data:`SHAPE_TABLE`.
+        """
+        symbols = [SYMBOL_CODES[cell] for row in self.board for cell in row]
+        symbols.append(SYMBOL_CODES['B'])
+        windows = window_cells(self.size, self.DIRECTIONS)
+        codes = []
+        for index, symbol in enumerate(symbols[:-1]):
+            if not symbol:
+                continue
+            stone = SYMBOLS[symbol]
+            for a, b, c, d, e in windows[index]:
+                codes.append((
+                    stone,
+                    symbols[a] | symbols[b] << 2 | symbols[c] << 4
+                    | symbols[d] << 6 | symbols[e] << 8,
+                ))
+        return codes
@@ -1,4 +1,11 @@
-from EASY_GOMOKU_class_shape import Shape
+from functools import lru_cache
+
+import numpy as np
+
+from EASY_GOMOKU_class_shape import (
+    N_WINDOW_CODES, SHAPE_TABLE, SYMBOL_CODES, SYMBOLS, Shape, batch_window_codes,
+    window_cells,
+)
 
 SCORES = {
     'four_in_row': 1_000_000_000,   # XXXX
@@ -11,6 +18,56 @@ SCORES = {
 }
 
 
+def shape_score(shape_type, owner, root_player):
+    """
+    Score of one detected shape from the perspective of ``root_player``.
+
+    Parameters
+    ----------
+    shape_type : str
+        A key of :data:`SCORES`.
+    owner : {'X', 'O'}
+        The stone the shape was detected around.
+    root_player : {'X', 'O'}
+        The player for whom the evaluation is performed.
+
+    Returns
+    -------
+    int or float
+        The shape value, negated for the opponent. Opponent open threes
+        are treated as near-winning configurations and cost
+        ``0.9 * SCORES['four_in_row']`` (a float).
+    """
+    if owner == root_player:
+        return SCORES[shape_type]
+    if shape_type == 'open_3':
+        return -SCORES['four_in_row'] * 0.9
+    return -SCORES[shape_type]
+
+
+def _window_scores(root_player):
+    """
+    Sum of :func:`shape_score` over the shapes of every window code.
+
+    A window holding an opponent open three sums to a float, as the
+    running total of :func:`evaluate` did before the table existed; all
+    values are integers far below 2 ** 53, so the sums are exact.
+    """
+    table = []
+    for code in range(N_WINDOW_CODES):
+        owner = SYMBOLS[(code >> 4) & 3]  # the centre cell of the window
+        score = 0
+        for shape_type in SHAPE_TABLE[code]:
+            score += shape_score(shape_type, owner, root_player)
+        table.append(score)
+    return tuple(table)
+
+
+# Score of every window code (see EASY_GOMOKU_class_shape.window_code)
+# for each root player.
+WINDOW_SCORES = {root_player: _window_scores(root_player) for root_player in 'XO'}
+
+
 def evaluate(board, root_player):
     """
     Heuristic evaluation of a board state.
@@ -23,6 +80,11 @@ def evaluate(board, root_player):
     The score is positive if the position is favorable to the root
     player and negative if it favors the opponent.
 
+    Every stone contributes the precomputed score of the window around
+    it in each direction (:data:`WINDOW_SCORES`), which equals the sum
+    of :func:`shape_score` over the shapes
+    :meth:`Shape.detect_shapes` reports for that window.
+
     Parameters
     ----------
     board : Board
@@ -37,23 +99,224 @@ def evaluate(board, root_player):
         A heuristic score representing the desirability of the board
         state for the root player.
     """
-    shape_detector = Shape(board)
-    shapes = shape_detector.detect_shapes()
+    scores = WINDOW_SCORES[root_player]
+    return sum([scores[code] for _, code in Shape(board).window_codes()])
+
+
+@lru_cache(maxsize=None)
+def _affected_windows(size, directions):
+    """
+    For every cell, the windows of :func:`window_cells` containing it.
+
+    Parameters
+    ----------
+    size : int
+        Width and height of the square board.
+    directions : tuple[tuple[int, int], ...]
+        Line directions, as in :attr:`Shape.DIRECTIONS`.
+
+    Returns
+    -------
+    tuple
+        Indexed by flat cell: one ``(window, a, b, c, d, e)`` tuple per
+        window through the cell, where ``window`` is
+        ``centre * len(directions) + direction`` and ``a`` to ``e`` are
+        the window cells.
+    """
+    windows = window_cells(size, directions)
+    affected = [[] for _ in range(size * size)]
+    for centre in range(size * size):
+        for direction, cells in enumerate(windows[centre]):
+            window = centre * len(directions) + direction
+            for cell in cells:
+                if cell < size * size:
+                    affected[cell].append((window,) + cells)
+    return tuple(tuple(cell_windows) for cell_windows in affected)
+
+
+def _counted_scores(root_player):
+    """
+    Split :data:`WINDOW_SCORES` into the tables of :class:`IncrementalEvaluator`.
+
+    Returns
+    -------
+    tuple[tuple[int, ...], tuple[int, ...]]
+        The integer value of every window score, and 1 where the score is
+        a float (an opponent open three). Both are 0 for windows with an
+        empty centre, which :func:`evaluate` does not count.
+    """
+    scores, floats = [], []
+    for code, score in enumerate(WINDOW_SCORES[root_player]):
+        counted = (code >> 4) & 3 not in (SYMBOL_CODES['-'], SYMBOL_CODES['B'])
+        scores.append(int(score) if counted else 0)
+        floats.append(int(counted and isinstance(score, float)))
+    return tuple(scores), tuple(floats)
+
+
+_X_SCORES, _X_FLOATS = _counted_scores('X')
+_O_SCORES, _O_FLOATS = _counted_scores('O')
+
+
+class IncrementalEvaluator:
+    """
+    Running :func:`evaluate` scores of a board, updated move by move.
+
+    :func:`evaluate` sums the score of the window around every stone in
+    every direction. A stone placed or removed on a cell only changes the
+    windows that contain this cell: the windows along each direction
+    centred at most two cells away from it. The evaluator keeps the code
+    of every window and, on each move, recomputes only those (at most 20)
+    windows, keeping the totals for both root players. Like the board's
+    ``do``/``undo``, moves are taken back in LIFO order.
+
+    The evaluator must see every move made on the board it tracks, by
+    calling :meth:`place` after ``board.do(move)`` and :meth:`remove`
+    after ``board.undo()``.
+
+    Parameters
+    ----------
+    board : Board
+        The position to start from; any board exposing ``grid`` and
+        ``SIZE``.
+    """
+
+    def __init__(self, board):
+        self.size = board.SIZE
+        directions = Shape.DIRECTIONS
+        # Symbol code of every cell, plus the boundary at index
+        # SIZE * SIZE (see Shape.window_codes).
+        self.symbols = [SYMBOL_CODES[cell] for row in board.grid for cell in row]
+        self.symbols.append(SYMBOL_CODES['B'])
+        self.affected = _affected_windows(self.size, directions)
+        # Code of the window of every (centre cell, direction), counted
+        # or not; windows with an empty centre score 0.
+        self.codes = []
+        for cells in window_cells(self.size, directions):
+            for a, b, c, d, e in cells:
+                self.codes.append(self._code(a, b, c, d, e))
+        # Per root player: integer sum of the window scores, and number
+        # of windows whose score is a float (opponent open threes).
+        self.score_x = sum(_X_SCORES[code] for code in self.codes)
+        self.floats_x = sum(_X_FLOATS[code] for code in self.codes)
+        self.score_o = sum(_O_SCORES[code] for code in self.codes)
+        self.floats_o = sum(_O_FLOATS[code] for code in self.codes)
+        # (cell, previous window codes, score changes) per place()
+        self._undo_stack = []
+
+    def _code(self, a, b, c, d, e):
+        symbols = self.symbols
+        return (symbols[a] | symbols[b] << 2 | symbols[c] << 4
+                | symbols[d] << 6 | symbols[e] << 8)
+
+    def place(self, move, stone):
+        """
+        Account for ``stone`` placed at ``move``.
 
-    opponent = 'O' if root_player == 'X' else 'X'
-    total_score = 0
+        Parameters
+        ----------
+        move : tuple[int, int]
+            The (row, column) of the new stone.
+        stone : {'X', 'O'}
+            The player who placed it.
+        """
+        r, c = move
+        cell = r * self.size + c
+        symbols = self.symbols
+        codes = self.codes
+        x_scores, x_floats, o_scores, o_floats = _X_SCORES, _X_FLOATS, _O_SCORES, _O_FLOATS
+        symbols[cell] = SYMBOL_CODES[stone]
+        old_codes = []
+        score_x = floats_x = score_o = floats_o = 0
+        # every window through the cell changes code
+        for window, a, b, c, d, e in self.affected[cell]:
+            new = (symbols[a] | symbols[b] << 2 | symbols[c] << 4
+                   | symbols[d] << 6 | symbols[e] << 8)
+            old = codes[window]
+            codes[window] = new
+            old_codes.append(old)
+            score_x += x_scores[new] - x_scores[old]
+            floats_x += x_floats[new] - x_floats[old]
+            score_o += o_scores[new] - o_scores[old]
+            floats_o += o_floats[new] - o_floats[old]
+        self.score_x += score_x
+        self.floats_x += floats_x
+        self.score_o += score_o
+        self.floats_o += floats_o
+        self._undo_stack.append((cell, old_codes, score_x, floats_x, score_o, floats_o))
 
-    for shape_type, owner in shapes:
-        value = SCORES[shape_type]
+    def remove(self):
+        """
+        Revert the most recent :meth:`place`.
 
-        if owner == root_player:
-            total_score += value
-        elif owner == opponent:
-            # Opponent threats are penalized, with open threes treated
-            # as near-winning configurations.
-            if shape_type == 'open_3':
-                total_score -= SCORES['four_in_row'] * 0.9
-            else:
-                total_score -= value
+        The old window codes and score changes were saved by
+        :meth:`place`, so nothing is recomputed.
 
-    return total_score
+        Raises
+        ------
+        IndexError
+            If there is no move to revert.
+        """
+        cell, old_codes, score_x, floats_x, score_o, floats_o = self._undo_stack.pop()
+        self.symbols[cell] = SYMBOL_CODES['-']
+        codes = self.codes
+        for (window, *_), old in zip(self.affected[cell], old_codes):
+            codes[window] = old
+        self.score_x -= score_x
+        self.floats_x -= floats_x
+        self.score_o -= score_o
+        self.floats_o -= floats_o
+
+    def score(self, root_player):
+        """
+        Current value of ``evaluate(board, root_player)``.
+
+        Parameters
+        ----------
+        root_player : {'X', 'O'}
+            The player for whom the evaluation is performed.
+
+        Returns
+        -------
+        int or float
+            Equal to :func:`evaluate`, including its type: a float when
+            an opponent open three is on the board.
+        """
+        if root_player == 'X':
+            score, floats = self.score_x, self.floats_x
+        else:
+            score, floats = self.score_o, self.floats_o
+        return float(score) if floats else score
+
+
+# Integer window scores for evaluate_batch(), 0 for empty centres.
+_BATCH_SCORES = {'X': np.array(_X_SCORES, dtype=np.int64),
+                 'O': np.array(_O_SCORES, dtype=np.int64)}
+
+
+def evaluate_batch(boards, root_player):
+    """
+    :func:`evaluate` of many boards in one vectorized pass.
+
+    The windows of all boards are encoded together by
+    :func:`batch_window_codes` and scored with one lookup in the window
+    score table, so the cost per board is a few NumPy operations instead
+    of a Python loop over every stone.
+
+    Parameters
+    ----------
+    boards : sequence of Board
+        Boards of the same ``SIZE``, exposing ``grid``.
+    root_player : {'X', 'O'}
+        The player for whom the evaluation is performed, for every board.
+
+    Returns
+    -------
+    numpy.ndarray
+        int64 array of shape ``(len(boards),)``, equal element-wise to
+        :func:`evaluate`. Where :func:`evaluate` returns a float (an
+        opponent open three), the value is the same integer.
+    """
+    if not len(boards):
+        return np.zeros(0, dtype=np.int64)
+    codes = batch_window_codes(boards)
+    return _BATCH_SCORES[root_player][codes].sum(axis=(1, 2))
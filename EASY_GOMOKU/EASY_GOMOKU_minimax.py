@@ -1,8 +1,8 @@
 from EASY_GOMOKU_class_shape import Shape
-from EASY_GOMOKU_evaluation_function import evaluate
+from EASY_GOMOKU_evaluation_function import IncrementalEvaluator, evaluate
 
 
-def minimax(board, depth, is_maximizing, ai_player):
+def minimax(board, depth, is_maximizing, ai_player, eval_cache=None):
     """
     Perform a depth-limited Minimax search.
 
@@ -27,6 +27,9 @@ def minimax(board, depth, is_maximizing, ai_player):
     ai_player : {'X', 'O'}
         The player symbol controlled by the AI. This defines the
         evaluation perspective throughout the search.
+    eval_cache : common.eval_cache.EvalCache or None, optional
+        Memo of :func:`evaluate` to score the leaves with, so positions
+        reached through several move orders are evaluated once.
 
     Returns
     -------
@@ -35,16 +38,20 @@ def minimax(board, depth, is_maximizing, ai_player):
     """
     opponent = 'O' if ai_player == 'X' else 'X'
 
-    # 1. Terminal states: win or loss
-    if board.check_winner(ai_player):
+    # 1. Terminal states: win or loss. Only the player who made the last
+    # move can have just won, so only the lines through it are checked.
+    winner = board.winner_after_last_move()
+    if winner == ai_player:
         # Prefer faster wins
         return 10_000_000 + depth
-    if board.check_winner(opponent):
+    if winner == opponent:
         # Prefer slower losses
         return -10_000_000 - depth
 
     # 2. Base case: depth limit reached or draw
     if depth == 0 or board.is_full():
+        if eval_cache is not None:
+            return eval_cache(board, board.player)
         return evaluate(board, board.player)
 
     moves = board.legal_moves()
@@ -53,19 +60,19 @@ def minimax(board, depth, is_maximizing, ai_player):
         best_score = -float('inf')
         for move in moves:
             new_board = board.play(move)
-            score = minimax(new_board, depth - 1, False, ai_player)
+            score = minimax(new_board, depth - 1, False, ai_player, eval_cache)
             best_score = max(best_score, score)
         return best_score
     else:
         best_score = float('inf')
         for move in moves:
             new_board = board.play(move)
-            score = minimax(new_board, depth - 1, True, ai_player)
+            score = minimax(new_board, depth - 1, True, ai_player, eval_cache)
             best_score = min(best_score, score)
         return best_score
 
 
-def find_best_move(board, depth=4):
+def find_best_move(board, depth=4, eval_cache=None):
     """
     Select the best move for the current player using Minimax search.
 
@@ -79,6 +86,8 @@ def find_best_move(board, depth=4):
         The current board state.
     depth : int, optional
         Maximum search depth for Minimax.
+    eval_cache : common.eval_cache.EvalCache or None, optional
+        Memo of :func:`evaluate` used at the leaves (see :func:`minimax`).
 
     Returns
     -------
@@ -97,7 +106,139 @@ def find_best_move(board, depth=4):
     # First layer of the Minimax tree: explicitly track moves
     for move in moves:
         new_board = board.play(move)
-        move_val = minimax(new_board, depth - 1, False, ai_player)
+        move_val = minimax(new_board, depth - 1, False, ai_player, eval_cache)
+
+        if move_val > best_val:
+            best_val = move_val
+            best_move = move
+
+    return best_move
+
+
+def minimax_inplace(board, depth, is_maximizing, ai_player, evaluator=None, eval_cache=None):
+    """
+    Depth-limited Minimax search using in-place make/unmake moves.
+
+    This is equivalent to :func:`minimax`, but children are visited with
+    ``board.do(move)`` / ``board.undo()`` on a single board instead of
+    allocating a new board per node with ``board.play(move)``.
+
+    Parameters
+    ----------
+    board : Board
+        The current board state. It is modified during the search and
+        restored before the function returns.
+    depth : int
+        Remaining search depth.
+    is_maximizing : bool
+        Whether the current node is a maximizing node.
+    ai_player : {'X', 'O'}
+        The player symbol controlled by the AI.
+    evaluator : IncrementalEvaluator or None, optional
+        Running evaluation of ``board``. When given, it is updated along
+        with every ``do``/``undo`` and leaves read their score from it
+        instead of calling :func:`evaluate` on the whole board.
+    eval_cache : common.eval_cache.EvalCache or None, optional
+        Memo of :func:`evaluate` used at the leaves when there is no
+        ``evaluator``.
+
+    Returns
+    -------
+    int
+        The Minimax value (heuristic score) of the board state.
+    """
+    opponent = 'O' if ai_player == 'X' else 'X'
+
+    # 1. Terminal states: win or loss
+    winner = board.winner_after_last_move()
+    if winner == ai_player:
+        return 10_000_000 + depth
+    if winner == opponent:
+        return -10_000_000 - depth
+
+    # 2. Base case: depth limit reached or draw
+    if depth == 0 or board.is_full():
+        if evaluator is not None:
+            return evaluator.score(board.player)
+        if eval_cache is not None:
+            return eval_cache(board, board.player)
+        return evaluate(board, board.player)
+
+    moves = board.legal_moves()
+
+    if is_maximizing:
+        best_score = -float('inf')
+        for move in moves:
+            _do(board, evaluator, move)
+            score = minimax_inplace(board, depth - 1, False, ai_player, evaluator, eval_cache)
+            _undo(board, evaluator)
+            best_score = max(best_score, score)
+        return best_score
+    else:
+        best_score = float('inf')
+        for move in moves:
+            _do(board, evaluator, move)
+            score = minimax_inplace(board, depth - 1, True, ai_player, evaluator, eval_cache)
+            _undo(board, evaluator)
+            best_score = min(best_score, score)
+        return best_score
+
+
+def _do(board, evaluator, move):
+    """Apply ``move`` in place, keeping ``evaluator`` (if any) in sync."""
+    stone = board.player
+    board.do(move)
+    if evaluator is not None:
+        evaluator.place(move, stone)
+
+
+def _undo(board, evaluator):
+    """Revert the last move applied with :func:`_do`."""
+    board.undo()
+    if evaluator is not None:
+        evaluator.remove()
+
+
+def find_best_move_inplace(board, depth=4, eval_cache=None):
+    """
+    Select the best move using the in-place Minimax search.
+
+    Returns the same move as :func:`find_best_move`. The search runs on
+    a single private copy of ``board``, so the caller's board is left
+    untouched. The leaf scores are carried down the tree by an
+    :class:`IncrementalEvaluator` instead of being recomputed from the
+    whole board.
+
+    Parameters
+    ----------
+    board : Board
+        The current board state.
+    depth : int, optional
+        Maximum search depth for Minimax.
+    eval_cache : common.eval_cache.EvalCache or None, optional
+        Memo of :func:`evaluate` to score the leaves with instead of the
+        incremental evaluator.
+
+    Returns
+    -------
+    tuple[int, int] or None
+        The selected move as a (row, column) pair, or None if no legal
+        moves are available.
+    """
+    ai_player = board.player
+    best_val = -float('inf')
+    best_move = None
+
+    moves = board.legal_moves()
+    if not moves:
+        return None
+
+    work_board = board.copy()
+    evaluator = IncrementalEvaluator(work_board) if eval_cache is None else None
+    for move in moves:
+        _do(work_board, evaluator, move)
+        move_val = minimax_inplace(work_board, depth - 1, False, ai_player, evaluator, eval_cache)
+        _undo(work_board, evaluator)
 
         if move_val > best_val:
             best_val = move_val
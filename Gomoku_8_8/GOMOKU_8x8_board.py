@@ -1,12 +1,60 @@
 from Gomoku_8_8.GOMOKU_8x8_config import Config
+from Gomoku_8_8.GOMOKU_8x8_shape import LineCache
+from common.geometry import board_geometry
+from common.threat_index import ThreatIndex
+from common.window_counters import WindowCounters
+from common.zobrist import PLAYER_INDEX, SIDE_TO_MOVE_KEY, position_hash, zobrist_keys
 
 class Board:
-    def __init__(self, grid=None, player='X'):
+    # Zobrist keys shared with the other boards (see common.zobrist)
+    ZOBRIST_KEYS = zobrist_keys(Config.SIZE, Config.SIZE)
+    # Winning windows and rays shared with the other boards (see common.geometry)
+    GEOMETRY = board_geometry(Config.SIZE, Config.SIZE, Config.WIN_LENGTH)
+
+    def __init__(self, grid=None, player='X', window_counters=False, threat_index=False):
         self.player = player
         self.grid = grid if grid else [[Config.EMPTY for _ in range(Config.SIZE)] for _ in range(Config.SIZE)]
+        self.last_move = None  # None when unknown (empty board or built from a grid)
+        self._undo_stack = []  # (move, previous last_move) for moves applied with do()
+        # 64-bit position hash, side to move included; updated in O(1) per move
+        self.zobrist_key = position_hash(
+            Config.SIZE, Config.SIZE,
+            ((r * Config.SIZE + c, self.grid[r][c])
+             for r in range(Config.SIZE) for c in range(Config.SIZE)
+             if self.grid[r][c] != Config.EMPTY),
+            player)
+        # line codes for ShapeDetector, updated only where a move lands
+        self.line_cache = LineCache(self.grid)
+        # optional per-window stone counts (see common.window_counters):
+        # O(1) win queries for the cost of updating them on every move;
+        # a ThreatIndex (see common.threat_index) also tracks threat cells
+        self.window_counters = None
+        if window_counters or threat_index:
+            self.window_counters = (ThreatIndex if threat_index else WindowCounters)(self.GEOMETRY)
+            for cell, (r, c) in enumerate(self.GEOMETRY.cell_coords):
+                if self.grid[r][c] != Config.EMPTY:
+                    self.window_counters.add(cell, self.grid[r][c])
 
     def copy(self):
-        return Board(grid=[row[:] for row in self.grid], player=self.player)
+        new_board = Board.__new__(Board)
+        new_board.player = self.player
+        new_board.grid = [row[:] for row in self.grid]
+        new_board.last_move = self.last_move
+        new_board._undo_stack = []
+        new_board.zobrist_key = self.zobrist_key
+        new_board.line_cache = self.line_cache.copy()
+        new_board.window_counters = self.window_counters.copy() if self.window_counters else None
+        return new_board
+
+    @property
+    def threat_index(self):
+        # the counters when they are a ThreatIndex, else None
+        return self.window_counters if isinstance(self.window_counters, ThreatIndex) else None
+
+    def _toggle_stone_key(self, move, stone):
+        # XOR a stone in or out and pass the turn: both are self-inverse
+        r, c = move
+        self.zobrist_key ^= self.ZOBRIST_KEYS[PLAYER_INDEX[stone]][r * Config.SIZE + c] ^ SIDE_TO_MOVE_KEY
 
     def legal_moves(self):
         """
@@ -54,24 +102,79 @@ class Board:
         new_board = self.copy()
         new_board.grid[r][c] = self.player
         new_board.player = 'O' if self.player == 'X' else 'X'
+        new_board.last_move = move
+        new_board._toggle_stone_key(move, self.player)
+        new_board.line_cache.add(move, self.player)
+        if new_board.window_counters: new_board.window_counters.add(r * Config.SIZE + c, self.player)
         return new_board
 
+    def do(self, move):
+        """
+        In-place version of play(): writes the stone into this grid and
+        pushes the move on the undo stack instead of copying the board.
+        """
+        r, c = move
+        if self.grid[r][c] != Config.EMPTY:
+            raise ValueError(f"Cell {move} is occupied")
+        self.grid[r][c] = self.player
+        self._undo_stack.append((move, self.last_move))
+        self.last_move = move
+        self._toggle_stone_key(move, self.player)
+        self.line_cache.add(move, self.player)
+        if self.window_counters: self.window_counters.add(r * Config.SIZE + c, self.player)
+        self.player = 'O' if self.player == 'X' else 'X'
+
+    def undo(self):
+        """Revert the last move applied with do()."""
+        move, self.last_move = self._undo_stack.pop()
+        r, c = move
+        self.player = self.grid[r][c]
+        self.grid[r][c] = Config.EMPTY
+        self._toggle_stone_key(move, self.player)
+        self.line_cache.remove(move, self.player)
+        if self.window_counters: self.window_counters.remove(r * Config.SIZE + c, self.player)
+
     def is_full(self):
         return all(self.grid[r][c] != Config.EMPTY for r in range(Config.SIZE) for c in range(Config.SIZE))
 
     def check_winner(self, stone):
-        # 5-in-a-row check
-        dirs = [(1,0), (0,1), (1,1), (1,-1)]
-        for r in range(Config.SIZE):
-            for c in range(Config.SIZE):
-                if self.grid[r][c] != stone: continue
-                for dr, dc in dirs:
-                    # Check if 5 fit
-                    if 0 <= r + 4*dr < Config.SIZE and 0 <= c + 4*dc < Config.SIZE:
-                        if all(self.grid[r + k*dr][c + k*dc] == stone for k in range(5)):
-                            return True
+        if self.window_counters: return self.window_counters.has_win(stone)
+        # 5-in-a-row check over the precomputed winning windows
+        coords = self.GEOMETRY.cell_coords
+        for window in self.GEOMETRY.window_cells:
+            for cell in window:
+                r, c = coords[cell]
+                if self.grid[r][c] != stone: break
+            else:
+                return True
         return False
 
+    def winner_after_last_move(self):
+        """
+        Winner ('X'/'O') or None, checking only the 4 lines through the
+        last move instead of scanning the whole board.
+        Assumes the position before the last move had no winner; falls
+        back to check_winner() when the last move is unknown.
+        """
+        if self.last_move is None:
+            if self.check_winner('X'): return 'X'
+            if self.check_winner('O'): return 'O'
+            return None
+
+        r, c = self.last_move
+        stone = self.grid[r][c]
+        coords = self.GEOMETRY.cell_coords
+        for ray_pair in self.GEOMETRY.rays[r * Config.SIZE + c]:
+            count = 1
+            for ray in ray_pair:
+                for cell in ray:
+                    nr, nc = coords[cell]
+                    if self.grid[nr][nc] != stone: break
+                    count += 1
+            if count >= Config.WIN_LENGTH:
+                return stone
+        return None
+
     def print_board(self):
         print('  ' + ''.join(str(i+1) for i in range(Config.SIZE)))
         for i, row in enumerate(self.grid):
@@ -0,0 +1,136 @@
+from Gomoku_8_8.GOMOKU_8x8_board import Board
+from Gomoku_8_8.GOMOKU_8x8_config import Config
+from common.window_counters import WindowCounters
+from common.zobrist import PLAYER_INDEX, SIDE_TO_MOVE_KEY, position_hash
+
+_EMPTY = ord(Config.EMPTY)
+_CODES = {'X': ord('X'), 'O': ord('O')}
+
+class CompactBoard:
+    """
+    Drop-in variant of Board without a per-instance __dict__ (__slots__)
+    and with the grid stored as one 64-byte bytearray of 'X'/'O'/EMPTY
+    codes indexed r * SIZE + c. `grid` is rebuilt from it on every access,
+    so writing into it does not change the board.
+    """
+    __slots__ = ('player', 'cells', 'last_move', 'zobrist_key', 'window_counters', '_undo_stack')
+
+    ZOBRIST_KEYS = Board.ZOBRIST_KEYS
+    GEOMETRY = Board.GEOMETRY
+
+    def __init__(self, grid=None, player='X', window_counters=False):
+        self.player = player
+        if grid: self.cells = bytearray(''.join(''.join(row) for row in grid), 'ascii')
+        else: self.cells = bytearray(Config.EMPTY * (Config.SIZE * Config.SIZE), 'ascii')
+        self.last_move = None
+        self._undo_stack = None  # allocated by the first do()
+        stones = [(cell, chr(code)) for cell, code in enumerate(self.cells) if code != _EMPTY]
+        self.zobrist_key = position_hash(Config.SIZE, Config.SIZE, stones, player)
+        self.window_counters = None
+        if window_counters:
+            self.window_counters = WindowCounters(self.GEOMETRY)
+            for cell, stone in stones:
+                self.window_counters.add(cell, stone)
+
+    @property
+    def grid(self):
+        text = self.cells.decode('ascii')
+        return [list(text[i:i + Config.SIZE]) for i in range(0, Config.SIZE * Config.SIZE, Config.SIZE)]
+
+    def copy(self):
+        new_board = CompactBoard.__new__(CompactBoard)
+        new_board.player = self.player
+        new_board.cells = self.cells[:]
+        new_board.last_move = self.last_move
+        new_board._undo_stack = None
+        new_board.zobrist_key = self.zobrist_key
+        new_board.window_counters = self.window_counters.copy() if self.window_counters else None
+        return new_board
+
+    def legal_moves(self):
+        """Empty cells adjacent to a stone, row-major; the center on an empty board."""
+        cells = self.cells
+        if cells.count(_EMPTY) == len(cells):
+            center = Config.SIZE // 2 - 1
+            return [(center, center)]
+        coords = self.GEOMETRY.cell_coords
+        neighbors = self.GEOMETRY.neighbor_cells
+        return [coords[cell] for cell in range(len(cells))
+                if cells[cell] == _EMPTY and any(cells[n] != _EMPTY for n in neighbors[cell])]
+
+    def play(self, move):
+        r, c = move
+        cell = r * Config.SIZE + c
+        if self.cells[cell] != _EMPTY:
+            raise ValueError(f"Cell {move} is occupied")
+        new_board = self.copy()
+        new_board.cells[cell] = _CODES[self.player]
+        new_board.player = 'O' if self.player == 'X' else 'X'
+        new_board.last_move = move
+        new_board.zobrist_key ^= self.ZOBRIST_KEYS[PLAYER_INDEX[self.player]][cell] ^ SIDE_TO_MOVE_KEY
+        if new_board.window_counters: new_board.window_counters.add(cell, self.player)
+        return new_board
+
+    def do(self, move):
+        """In-place version of play(), reverted by undo()."""
+        r, c = move
+        cell = r * Config.SIZE + c
+        if self.cells[cell] != _EMPTY:
+            raise ValueError(f"Cell {move} is occupied")
+        self.cells[cell] = _CODES[self.player]
+        if self._undo_stack is None: self._undo_stack = []
+        self._undo_stack.append((move, self.last_move))
+        self.last_move = move
+        self.zobrist_key ^= self.ZOBRIST_KEYS[PLAYER_INDEX[self.player]][cell] ^ SIDE_TO_MOVE_KEY
+        if self.window_counters: self.window_counters.add(cell, self.player)
+        self.player = 'O' if self.player == 'X' else 'X'
+
+    def undo(self):
+        """Revert the last move applied with do()."""
+        if not self._undo_stack: raise IndexError("pop from empty undo stack")
+        move, self.last_move = self._undo_stack.pop()
+        r, c = move
+        cell = r * Config.SIZE + c
+        self.player = chr(self.cells[cell])
+        self.cells[cell] = _EMPTY
+        self.zobrist_key ^= self.ZOBRIST_KEYS[PLAYER_INDEX[self.player]][cell] ^ SIDE_TO_MOVE_KEY
+        if self.window_counters: self.window_counters.remove(cell, self.player)
+
+    def is_full(self):
+        return _EMPTY not in self.cells
+
+    def check_winner(self, stone):
+        if self.window_counters: return self.window_counters.has_win(stone)
+        cells = self.cells
+        code = _CODES[stone]
+        for window in self.GEOMETRY.window_cells:
+            for cell in window:
+                if cells[cell] != code: break
+            else:
+                return True
+        return False
+
+    def winner_after_last_move(self):
+        """Winner ('X'/'O') or None from the 4 lines through the last move (see Board)."""
+        if self.last_move is None:
+            if self.check_winner('X'): return 'X'
+            if self.check_winner('O'): return 'O'
+            return None
+
+        r, c = self.last_move
+        cells = self.cells
+        code = cells[r * Config.SIZE + c]
+        for ray_pair in self.GEOMETRY.rays[r * Config.SIZE + c]:
+            count = 1
+            for ray in ray_pair:
+                for cell in ray:
+                    if cells[cell] != code: break
+                    count += 1
+            if count >= Config.WIN_LENGTH:
+                return chr(code)
+        return None
+
+    def print_board(self):
+        print('  ' + ''.join(str(i+1) for i in range(Config.SIZE)))
+        for i, row in enumerate(self.grid):
+            print(f"{i+1} " + ''.join(row))
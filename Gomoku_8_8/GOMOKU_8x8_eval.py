@@ -1,5 +1,7 @@
+import numpy as np
+
 from Gomoku_8_8.GOMOKU_8x8_config import Config
-from Gomoku_8_8.GOMOKU_8x8_shape import ShapeDetector
+from Gomoku_8_8.GOMOKU_8x8_shape import LINE_COUNTS, PATTERN_NAMES, ShapeDetector, batch_line_codes
 
 def evaluate(board, current_player):
     """
@@ -8,10 +10,20 @@ def evaluate(board, current_player):
     """
     ai_role = current_player
     opponent = 'O' if ai_role == 'X' else 'X'
+
+    # Boards keeping window counters answer the win checks in O(1),
+    # before any line string is built
+    counters = getattr(board, 'window_counters', None)
+    if counters:
+        if counters.has_win(ai_role): return Config.SCORES['WIN']
+        if counters.has_win(opponent): return -Config.SCORES['WIN']
     
-    detector = ShapeDetector(board.grid)
-    my_counts = detector.count_patterns(ai_role)
-    opp_counts = detector.count_patterns(opponent)
+    # Boards keeping a LineCache only update the lines through each move
+    line_cache = getattr(board, 'line_cache', None)
+    detector = ShapeDetector(line_cache if line_cache else board.grid)
+    counts = detector.count_all()  # both players in one pass of table lookups
+    my_counts = counts[ai_role]
+    opp_counts = counts[opponent]
     
     # 1. Instant End Game Checks
     if my_counts['WIN'] > 0: return Config.SCORES['WIN']
@@ -48,4 +60,36 @@ def evaluate(board, current_player):
         # Standard balance
         score -= opp_score * 1.5
 
-    return score
\ No newline at end of file
+    return score
+
+def evaluate_batch(boards, current_player):
+    """
+    evaluate() of many boards at once, as a float64 array.
+    Pattern counts of both players come from one LINE_COUNTS lookup per
+    line of every board; the rules of evaluate() are then applied to
+    the whole batch with np.select / np.where, in the same order.
+    """
+    if not len(boards): return np.zeros(0)
+    counts = LINE_COUNTS[batch_line_codes(boards)].sum(axis=1, dtype=np.int64)
+    n = len(PATTERN_NAMES)
+    mine, theirs = (counts[:, :n], counts[:, n:]) if current_player == 'X' else (counts[:, n:], counts[:, :n])
+    col = {name: i for i, name in enumerate(PATTERN_NAMES)}
+
+    def weighted(c):
+        return (c[:, col['BLOCKED_4']] * Config.SCORES['BLOCKED_4']
+                + c[:, col['OPEN_3']] * Config.SCORES['OPEN_3']
+                + c[:, col['OPEN_2']] * Config.SCORES['OPEN_2'])
+
+    # 4. Defensive Panic Logic (see evaluate)
+    score, opp_score = weighted(mine), weighted(theirs)
+    score = np.where(theirs[:, col['BLOCKED_4']] > 0, score - opp_score * 10,
+                     np.where(theirs[:, col['OPEN_3']] > 0, score - opp_score * 5,
+                              score - opp_score * 1.5))
+
+    # 1. Instant End Game Checks, then 2. Unstoppable Threats
+    win = Config.SCORES['WIN']
+    return np.select(
+        [mine[:, col['WIN']] > 0, theirs[:, col['WIN']] > 0,
+         theirs[:, col['OPEN_4']] > 0, mine[:, col['OPEN_4']] > 0],
+        [win, -win, -win + 100, win - 100],
+        score).astype(np.float64)
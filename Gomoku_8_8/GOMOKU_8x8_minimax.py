@@ -1,26 +1,71 @@
+import numpy as np
+
+from Gomoku_8_8.GOMOKU_8x8_board import Board
 from Gomoku_8_8.GOMOKU_8x8_config import Config
 from Gomoku_8_8.GOMOKU_8x8_eval import evaluate
+from common.move_scores import move_map, stones_from_grid
+
+def ordered_moves(board, moves):
+    """
+    moves sorted for alpha-beta, best first: immediate wins, forced blocks,
+    then the longest own and opponent runs through the cell. One move_map
+    pass scores every cell (common.move_scores); ties keep their order.
+    """
+    threats = move_map(Board.GEOMETRY, stones_from_grid(board.grid), board.player)
+    cells = [r * Config.SIZE + c for r, c in moves]
+    own, opp = threats.own_runs[cells], threats.opp_runs[cells]
+    priority = (threats.wins[cells] * 1e6 + threats.blocks[cells] * 5e5
+                + own.max(axis=1) * 100 + opp.max(axis=1) * 50 + (own + opp).sum(axis=1))
+    return [moves[i] for i in np.argsort(-priority, kind='stable')]
 
-def minimax(board, depth, alpha, beta, is_maximizing, ai_player):
+def threat_value(board, depth, ai_player):
+    """
+    exact minimax value of a non-terminal node decided by immediate threats,
+    read from board.threat_index (common.threat_index); None otherwise or
+    without an index. The side to move wins next ply if it has a winning
+    cell, and loses the ply after if it has none and the opponent has two.
+    only the exact winning cells are read, never the index's window threats
+    (those include blocked and split shapes, not just open fours/threes).
+    """
+    index = getattr(board, 'threat_index', None)
+    if index is None or depth == 0: return None
+    opp = 'O' if board.player == 'X' else 'X'
+    if index.winning_cells(board.player): value = Config.SCORES['WIN'] + depth - 1
+    elif depth >= 2 and len(index.winning_cells(opp)) >= 2: value = -Config.SCORES['WIN'] - depth + 2
+    else: return None
+    return value if board.player == ai_player else -value
+
+def minimax(board, depth, alpha, beta, is_maximizing, ai_player, eval_cache=None, order_moves=False):
     """
     Alpha-Beta Pruning Search.
+    eval_cache: optional common.eval_cache.EvalCache scoring the leaves
+    instead of evaluate(), so transposed positions are evaluated once.
+    order_moves: search the moves in ordered_moves() order (more cutoffs;
+    among equally scored moves another one may be returned).
     """
     opp = 'O' if ai_player == 'X' else 'X'
     
-    # Terminal Check
-    if board.check_winner(ai_player): return Config.SCORES['WIN'] + depth
-    if board.check_winner(opp): return -Config.SCORES['WIN'] - depth
+    # Terminal Check (only the lines through the last move can hold a new win)
+    winner = board.winner_after_last_move()
+    if winner == ai_player: return Config.SCORES['WIN'] + depth
+    if winner == opp: return -Config.SCORES['WIN'] - depth
     
+    # Forced Win/Loss Check (boards created with threat_index=True)
+    value = threat_value(board, depth, ai_player)
+    if value is not None: return value
+
     # Leaf or Draw Check
     if depth == 0 or board.is_full():
+        if eval_cache is not None: return eval_cache(board, ai_player)
         return evaluate(board, ai_player)
 
     moves = board.legal_moves()
+    if order_moves: moves = ordered_moves(board, moves)
     
     if is_maximizing:
         max_eval = -float('inf')
         for move in moves:
-            eval_val = minimax(board.play(move), depth-1, alpha, beta, False, ai_player)
+            eval_val = minimax(board.play(move), depth-1, alpha, beta, False, ai_player, eval_cache, order_moves)
             max_eval = max(max_eval, eval_val)
             alpha = max(alpha, eval_val)
             if beta <= alpha:
@@ -29,14 +74,14 @@ def minimax(board, depth, alpha, beta, is_maximizing, ai_player):
     else:
         min_eval = float('inf')
         for move in moves:
-            eval_val = minimax(board.play(move), depth-1, alpha, beta, True, ai_player)
+            eval_val = minimax(board.play(move), depth-1, alpha, beta, True, ai_player, eval_cache, order_moves)
             min_eval = min(min_eval, eval_val)
             beta = min(beta, eval_val)
             if beta <= alpha:
                 break
         return min_eval
 
-def find_best_move(board, depth=3):
+def find_best_move(board, depth=3, eval_cache=None, order_moves=False):
     ai_player = board.player
     best_move = None
     best_val = -float('inf')
@@ -44,19 +89,19 @@ def find_best_move(board, depth=3):
     beta = float('inf')
     
     moves = board.legal_moves()
+    if order_moves: moves = ordered_moves(board, moves)
     
-    # Move Ordering Optimization:
-    # We could sort 'moves' here based on a shallow eval to speed up pruning,
-    # but for 8x8 depth 3, raw search is usually fast enough.
+    # Move Ordering Optimization: with order_moves, threats are searched
+    # first (see ordered_moves) to speed up pruning.
     
     for move in moves:
         new_board = board.play(move)
         
         # Instant win check (optimization)
-        if new_board.check_winner(ai_player):
+        if new_board.winner_after_last_move() == ai_player:
             return move
             
-        move_val = minimax(new_board, depth-1, alpha, beta, False, ai_player)
+        move_val = minimax(new_board, depth-1, alpha, beta, False, ai_player, eval_cache, order_moves)
         
         if move_val > best_val:
             best_val = move_val
@@ -65,4 +110,86 @@ def find_best_move(board, depth=3):
         # Update alpha for the root
         alpha = max(alpha, best_val)
         
-    return best_move
\ No newline at end of file
+    return best_move
+
+def minimax_inplace(board, depth, alpha, beta, is_maximizing, ai_player, eval_cache=None, order_moves=False):
+    """
+    Alpha-Beta search using board.do() / board.undo() instead of
+    allocating a new board per node. The board is restored on return.
+    eval_cache, order_moves: as in minimax().
+    """
+    opp = 'O' if ai_player == 'X' else 'X'
+
+    # Terminal Check (only the lines through the last move can hold a new win)
+    winner = board.winner_after_last_move()
+    if winner == ai_player: return Config.SCORES['WIN'] + depth
+    if winner == opp: return -Config.SCORES['WIN'] - depth
+
+    # Forced Win/Loss Check (boards created with threat_index=True)
+    value = threat_value(board, depth, ai_player)
+    if value is not None: return value
+
+    # Leaf or Draw Check
+    if depth == 0 or board.is_full():
+        if eval_cache is not None: return eval_cache(board, ai_player)
+        return evaluate(board, ai_player)
+
+    moves = board.legal_moves()
+    if order_moves: moves = ordered_moves(board, moves)
+
+    if is_maximizing:
+        max_eval = -float('inf')
+        for move in moves:
+            board.do(move)
+            eval_val = minimax_inplace(board, depth-1, alpha, beta, False, ai_player, eval_cache, order_moves)
+            board.undo()
+            max_eval = max(max_eval, eval_val)
+            alpha = max(alpha, eval_val)
+            if beta <= alpha:
+                break
+        return max_eval
+    else:
+        min_eval = float('inf')
+        for move in moves:
+            board.do(move)
+            eval_val = minimax_inplace(board, depth-1, alpha, beta, True, ai_player, eval_cache, order_moves)
+            board.undo()
+            min_eval = min(min_eval, eval_val)
+            beta = min(beta, eval_val)
+            if beta <= alpha:
+                break
+        return min_eval
+
+def find_best_move_inplace(board, depth=3, eval_cache=None, order_moves=False):
+    """
+    In-place counterpart of find_best_move(); returns the same move.
+    Searches a private copy so the caller's board is not modified.
+    """
+    ai_player = board.player
+    best_move = None
+    best_val = -float('inf')
+    alpha = -float('inf')
+    beta = float('inf')
+
+    work_board = board.copy()
+    moves = work_board.legal_moves()
+    if order_moves: moves = ordered_moves(work_board, moves)
+
+    for move in moves:
+        work_board.do(move)
+
+        # Instant win check (optimization)
+        if work_board.winner_after_last_move() == ai_player:
+            return move
+
+        move_val = minimax_inplace(work_board, depth-1, alpha, beta, False, ai_player, eval_cache, order_moves)
+        work_board.undo()
+
+        if move_val > best_val:
+            best_val = move_val
+            best_move = move
+
+        # Update alpha for the root
+        alpha = max(alpha, best_val)
+
+    return best_move
@@ -1,60 +1,177 @@
+import itertools
+
+import numpy as np
+
 from Gomoku_8_8.GOMOKU_8x8_config import Config
+from common.geometry import board_geometry
+
+# (row, col) of every cell of every row, column and diagonal of length >= 5,
+# in the order the lines were originally scanned (see common.geometry)
+_LINE_COORDS = tuple(
+    tuple(divmod(cell, Config.SIZE) for cell in line)
+    for line in board_geometry(Config.SIZE, Config.SIZE, 5).lines
+)
+
+PATTERN_NAMES = ('WIN', 'OPEN_4', 'BLOCKED_4', 'OPEN_3', 'BLOCKED_3', 'OPEN_2', 'BLOCKED_2')
+
+# Lines are encoded in base 3, cell k of the line being digit k
+# (EMPTY 0, X 1, O 2). Lines of different lengths get separate ranges
+# of codes: _LENGTH_OFFSET[n] is the code of the empty line of length n.
+_DIGITS = {Config.EMPTY: 0, 'X': 1, 'O': 2}
+_LINE_LENGTHS = range(5, Config.SIZE + 1)
+_LENGTH_OFFSET = {length: sum(3 ** n for n in range(5, length)) for length in _LINE_LENGTHS}
+
+# For every cell r * SIZE + c: (line index, 3 ** position in the line) of
+# the (at most 4) lines through it
+_CELL_LINES = tuple(
+    tuple((i, 3 ** coords.index((r, c))) for i, coords in enumerate(_LINE_COORDS) if (r, c) in coords)
+    for r in range(Config.SIZE) for c in range(Config.SIZE)
+)
+
+def _line_code(stones):
+    return _LENGTH_OFFSET[len(stones)] + sum(_DIGITS[s] * 3 ** k for k, s in enumerate(stones))
+
+class LineCache:
+    """
+    The line codes ShapeDetector looks up, kept up to date by the board:
+    a move only changes the (at most 4) lines through its cell instead
+    of re-encoding all of them from the grid.
+    """
+    __slots__ = ('codes',)
+
+    def __init__(self, grid=None):
+        if grid is not None:
+            self.codes = [_line_code([grid[r][c] for r, c in coords]) for coords in _LINE_COORDS]
+
+    def copy(self):
+        new_cache = LineCache.__new__(LineCache)
+        new_cache.codes = self.codes[:]
+        return new_cache
+
+    def add(self, move, stone):
+        """Stone placed on the empty cell move = (r, c)."""
+        r, c = move
+        codes, digit = self.codes, _DIGITS[stone]
+        for i, weight in _CELL_LINES[r * Config.SIZE + c]:
+            codes[i] += digit * weight
+
+    def remove(self, move, stone):
+        """Stone taken back from move = (r, c)."""
+        r, c = move
+        codes, digit = self.codes, _DIGITS[stone]
+        for i, weight in _CELL_LINES[r * Config.SIZE + c]:
+            codes[i] -= digit * weight
 
 class ShapeDetector:
-    def __init__(self, grid):
-        self.lines = self._get_all_lines(grid)
+    def __init__(self, source):
+        # source: a LineCache, or a grid to encode the lines from
+        if isinstance(source, LineCache): self.codes = source.codes
+        else: self.codes = self._get_all_lines(source)
 
     def _get_all_lines(self, grid):
-        lines = []
-        # Rows & Cols
-        for r in range(Config.SIZE): lines.append("".join(grid[r]))
-        for c in range(Config.SIZE): lines.append("".join(grid[r][c] for r in range(Config.SIZE)))
-        
-        # Diagonals (Length must be >= 5)
-        # Top-Left to Bottom-Right
-        for k in range(-(Config.SIZE - 5), Config.SIZE - 5 + 1):
-            lines.append("".join(grid[r][r+k] for r in range(Config.SIZE) if 0 <= r+k < Config.SIZE))
-        # Top-Right to Bottom-Left
-        for k in range(4, 2 * Config.SIZE - 5):
-            lines.append("".join(grid[r][k-r] for r in range(Config.SIZE) if 0 <= k-r < Config.SIZE))
-        return lines
+        # Rows, cols, then diagonals (Length must be >= 5)
+        return [_line_code([grid[r][c] for r, c in coords]) for coords in _LINE_COORDS]
+
+    def count_all(self):
+        """Pattern counts of both players, {'X': counts, 'O': counts}, in one pass."""
+        totals = list(map(sum, zip(*[LINE_TABLE[code] for code in self.codes])))
+        n = len(PATTERN_NAMES)
+        return {'X': dict(zip(PATTERN_NAMES, totals[:n])),
+                'O': dict(zip(PATTERN_NAMES, totals[n:]))}
 
     def count_patterns(self, player):
-        counts = {
-            'WIN': 0, 'OPEN_4': 0, 'BLOCKED_4': 0, 
-            'OPEN_3': 0, 'BLOCKED_3': 0, 'OPEN_2': 0, 'BLOCKED_2': 0
-        }
-        
-        # P=Player, -=Empty. 
-        # We replace found patterns to avoid double counting.
-        
-        for line in self.lines:
-            # 1. WIN (XXXXX)
-            if player * 5 in line: 
-                counts['WIN'] += 1; continue
-
-            # 2. OPEN 4 (-XXXX-) -> Guaranteed Win
-            p_open4 = f"-{player*4}-"
-            if p_open4 in line: 
-                counts['OPEN_4'] += 1; line = line.replace(p_open4, "#####")
-
-            # 3. BLOCKED 4 (OXXXX-, -XXXXO, XX-XX, XXX-X, X-XXX)
-            # Simple connected blocked 4
-            if f"-{player*4}" in line: counts['BLOCKED_4'] += 1; line = line.replace(f"-{player*4}", "####")
-            if f"{player*4}-" in line: counts['BLOCKED_4'] += 1; line = line.replace(f"{player*4}-", "####")
-            
-            # Split 4s (Jump 4)
-            split_4s = [f"{player*3}-{player}", f"{player}-{player*3}", f"{player*2}-{player*2}"]
-            for p in split_4s:
-                if p in line: counts['BLOCKED_4'] += 1; line = line.replace(p, "####")
-
-            # 4. OPEN 3 (-XXX-)
-            p_open3 = f"-{player*3}-"
-            if p_open3 in line:
-                counts['OPEN_3'] += 1; line = line.replace(p_open3, "####")
-
-            # 5. OPEN 2 (-XX-)
-            if f"-{player*2}-" in line:
-                counts['OPEN_2'] += 1
-
-        return counts
\ No newline at end of file
+        return self.count_all()[player]
+
+def _count_line(line, player):
+    """Pattern counts of one line string, in PATTERN_NAMES order."""
+    counts = dict.fromkeys(PATTERN_NAMES, 0)
+
+    # P=Player, -=Empty. 
+    # We replace found patterns to avoid double counting.
+
+    # 1. WIN (XXXXX)
+    if player * 5 in line: 
+        counts['WIN'] += 1; return tuple(counts.values())
+
+    # 2. OPEN 4 (-XXXX-) -> Guaranteed Win
+    p_open4 = f"-{player*4}-"
+    if p_open4 in line: 
+        counts['OPEN_4'] += 1; line = line.replace(p_open4, "#####")
+
+    # 3. BLOCKED 4 (OXXXX-, -XXXXO, XX-XX, XXX-X, X-XXX)
+    # Simple connected blocked 4
+    if f"-{player*4}" in line: counts['BLOCKED_4'] += 1; line = line.replace(f"-{player*4}", "####")
+    if f"{player*4}-" in line: counts['BLOCKED_4'] += 1; line = line.replace(f"{player*4}-", "####")
+    
+    # Split 4s (Jump 4)
+    split_4s = [f"{player*3}-{player}", f"{player}-{player*3}", f"{player*2}-{player*2}"]
+    for p in split_4s:
+        if p in line: counts['BLOCKED_4'] += 1; line = line.replace(p, "####")
+
+    # 4. OPEN 3 (-XXX-)
+    p_open3 = f"-{player*3}-"
+    if p_open3 in line:
+        counts['OPEN_3'] += 1; line = line.replace(p_open3, "####")
+
+    # 5. OPEN 2 (-XX-)
+    if f"-{player*2}-" in line:
+        counts['OPEN_2'] += 1
+
+    return tuple(counts.values())
+
+# LINE_TABLE[code]: the counts of X then of O (PATTERN_NAMES order each)
+# for every line content of every length, from _count_line
+LINE_TABLE = tuple(
+    _count_line(line, 'X') + _count_line(line, 'O')
+    for length in _LINE_LENGTHS
+    # product() varies the last cell fastest: reversed, cell k is digit k
+    for line in (''.join(reversed(cells)) for cells in itertools.product(Config.EMPTY + 'XO', repeat=length))
+)
+
+# Batch encoding: the cells of every line padded to SIZE with the extra
+# always-empty cell SIZE * SIZE (weight 0), and the 3 ** k weights
+_LINE_CELLS = np.full((len(_LINE_COORDS), Config.SIZE), Config.SIZE * Config.SIZE)
+_LINE_WEIGHTS = np.zeros((len(_LINE_COORDS), Config.SIZE), dtype=np.int64)
+for _i, _coords in enumerate(_LINE_COORDS):
+    _LINE_CELLS[_i, :len(_coords)] = [r * Config.SIZE + c for r, c in _coords]
+    _LINE_WEIGHTS[_i, :len(_coords)] = 3 ** np.arange(len(_coords))
+_LINE_OFFSETS = np.array([_LENGTH_OFFSET[len(coords)] for coords in _LINE_COORDS])
+_BYTE_DIGITS = np.zeros(256, dtype=np.int64)
+for _stone, _digit in _DIGITS.items():
+    _BYTE_DIGITS[ord(_stone)] = _digit
+LINE_COUNTS = np.array(LINE_TABLE, dtype=np.int8)  # at most a few patterns per line
+
+def batch_line_codes(boards):
+    """
+    Line codes of many boards as an (len(boards), 30) array: the boards'
+    LineCache codes when they all keep one, otherwise encoded from the
+    stacked grids in one vectorized pass.
+    """
+    if all(getattr(board, 'line_cache', None) for board in boards):
+        return np.array([board.line_cache.codes for board in boards], dtype=np.int64)
+    text = ''.join([''.join(row) for board in boards for row in board.grid])
+    cells = np.frombuffer(text.encode('ascii'), dtype=np.uint8).reshape(len(boards), -1)
+    return stone_line_codes(_BYTE_DIGITS[cells])
+
+
+def stone_line_codes(stones):
+    """
+    batch_line_codes() of boards given as arrays of digits, so positions
+    that never existed as Board objects (e.g. replayed from game records)
+    are encoded without building one.
+
+    Parameters
+    ----------
+    stones : numpy.ndarray
+        Integer array of shape (n_boards, SIZE * SIZE): the digit of every
+        cell (EMPTY 0, X 1, O 2), row by row.
+
+    Returns
+    -------
+    numpy.ndarray
+        int64 array of shape (n_boards, 30): the code of every line, as
+        batch_line_codes().
+    """
+    digits = np.zeros((len(stones), Config.SIZE * Config.SIZE + 1), dtype=np.int64)
+    digits[:, :-1] = stones
+    return _LINE_OFFSETS + (digits[:, _LINE_CELLS] * _LINE_WEIGHTS).sum(axis=2)
@@ -4,8 +4,103 @@
 """
 
 from __future__ import print_function
+from array import array
+import os
+import sys
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:  # python 2
+    from collections import Mapping, Sequence
+from functools import lru_cache
 import numpy as np
 
+# make the repo root importable so the shared ``common`` package resolves
+# regardless of invocation CWD
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from common.geometry import board_geometry
+from common.threat_index import ThreatIndex
+from common.window_counters import WindowCounters
+from common.zobrist import SIDE_TO_MOVE_KEY, zobrist_keys
+
+
+@lru_cache(maxsize=None)
+def _plane_offsets(width, height):
+    """offset of each move inside one flipped (width, height) input plane,
+    i.e. where current_state() used to put it after [:, ::-1, :]"""
+    return tuple((width - 1 - move // width) * height + move % height
+                 for move in range(width * height))
+
+
+class Availables(Sequence):
+    """the free moves of a board, as a sequence with O(1) removal.
+
+    moves live in a position-indexed swap array: removing a move moves the
+    last free move into its slot, so once moves have been played the order
+    is no longer ascending. mask is a boolean numpy array over all moves
+    (True = free) for vectorized masking; np.flatnonzero(mask) gives the
+    free moves in ascending order.
+    """
+
+    __slots__ = ('_moves', '_index', 'mask')
+
+    def __init__(self, n):
+        self._moves = list(range(n))
+        # position of each move in _moves (stale once the move is removed)
+        self._index = list(range(n))
+        self.mask = np.ones(n, dtype=bool)
+
+    def remove(self, move):
+        if not self.mask[move]:
+            raise ValueError('move {} is not available'.format(move))
+        i = self._index[move]
+        last = self._moves.pop()
+        if last != move:
+            self._moves[i] = last
+            self._index[last] = i
+        self.mask[move] = False
+
+    def restore(self, move):
+        """exact inverse of the most recent remove(move): the move goes back
+        to its old slot, so do/undo sequences keep the same order.
+        """
+        i = self._index[move]
+        if i == len(self._moves):
+            self._moves.append(move)
+        else:
+            last = self._moves[i]
+            self._index[last] = len(self._moves)
+            self._moves.append(last)
+            self._moves[i] = move
+        self.mask[move] = True
+
+    def copy(self):
+        new = Availables.__new__(Availables)
+        new._moves = self._moves[:]
+        new._index = self._index[:]
+        new.mask = self.mask.copy()
+        return new
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __len__(self):
+        return len(self._moves)
+
+    def __getitem__(self, i):
+        return self._moves[i]
+
+    def __iter__(self):
+        return iter(self._moves)
+
+    def __contains__(self, move):
+        return 0 <= move < len(self.mask) and bool(self.mask[move])
+
+    def __repr__(self):
+        return repr(self._moves)
+
 
 class Board(object):
     """board for the game"""
@@ -20,16 +115,129 @@ class Board(object):
         # need how many pieces in a row to win
         self.n_in_row = int(kwargs.get('n_in_row', 5))
         self.players = [1, 2]  # player1 and player2
+        # keep per-window stone counts (common.window_counters) for O(1)
+        # win and threat queries, at the cost of updating them per move
+        self.use_window_counters = bool(kwargs.get('window_counters', False))
+        # counters that also index each player's winning cells and window
+        # threats (common.threat_index); implies window_counters
+        self.use_threat_index = bool(kwargs.get('threat_index', False))
 
     def init_board(self, start_player=0):
         if self.width < self.n_in_row or self.height < self.n_in_row:
             raise Exception('board width and height can not be '
                             'less than {}'.format(self.n_in_row))
         self.current_player = self.players[start_player]  # start player
-        # keep available moves in a list
-        self.availables = list(range(self.width * self.height))
+        # keep available moves in a swap array with a boolean legal mask
+        self.availables = Availables(self.width * self.height)
         self.states = {}
         self.last_move = -1
+        # winner is computed incrementally in do_move, -1 while undecided
+        self.winner = -1
+        # (move, previous last_move, previous winner) per move, for undo_move
+        self.history = []
+        # shared line tables (windows, rays, neighbours) for this board size
+        self.geometry = board_geometry(self.width, self.height, self.n_in_row)
+        if self.use_threat_index:
+            self.window_counters = ThreatIndex(self.geometry)
+        elif self.use_window_counters:
+            self.window_counters = WindowCounters(self.geometry)
+        else:
+            self.window_counters = None
+        # 64-bit Zobrist hash of the position, side to move included,
+        # shared with the minimax boards (see common.zobrist)
+        self._zobrist_keys = zobrist_keys(self.width, self.height)
+        self.zobrist_key = (
+            SIDE_TO_MOVE_KEY if self.current_player == self.players[1] else 0
+        )
+        # network input planes for both perspectives (players[0], players[1]),
+        # float32 and already flipped. stones are kept up to date by
+        # do_move/undo_move; the last-move marker (_plane_last) and the
+        # colour plane (_plane_colour: parity of len(states) it holds, -1
+        # when never written) are synced lazily by current_state()
+        self._plane_offsets = _plane_offsets(self.width, self.height)
+        self._plane_size = self.width * self.height
+        self._plane_last = -1
+        self._plane_colour = -1
+        self._set_planes(np.zeros(8 * self._plane_size, dtype=np.float32))
+
+    def clone(self):
+        """cheap copy for MCTS playouts: copies the states dict, the
+        availables structure, the move history and the scalars; the players
+        list, the zobrist key table and the geometry are shared (never
+        mutated); window counters, if enabled, are copied.
+        """
+        board = Board.__new__(Board)
+        board.width = self.width
+        board.height = self.height
+        board.n_in_row = self.n_in_row
+        board.players = self.players
+        board.states = self.states.copy()
+        board.availables = self.availables.copy()
+        board.current_player = self.current_player
+        board.last_move = self.last_move
+        board.winner = self.winner
+        board.history = self.history[:]
+        board.geometry = self.geometry
+        board.use_window_counters = self.use_window_counters
+        board.use_threat_index = self.use_threat_index
+        board.window_counters = (
+            self.window_counters.copy() if self.window_counters else None
+        )
+        board._zobrist_keys = self._zobrist_keys
+        board.zobrist_key = self.zobrist_key
+        board._plane_offsets = self._plane_offsets
+        board._plane_size = self._plane_size
+        board._plane_last = self._plane_last
+        board._plane_colour = self._plane_colour
+        board._set_planes(self._planes.copy())
+        return board
+
+    @property
+    def threat_index(self):
+        """the window counters when they are a ThreatIndex, else None"""
+        if self.use_threat_index:
+            return self.window_counters
+        return None
+
+    def _set_planes(self, planes):
+        self._planes = planes
+        # scalar writes through a memoryview are much cheaper than
+        # numpy item assignment
+        self._plane_cells = memoryview(planes)
+
+    def __getstate__(self):
+        # memoryviews can't be pickled/deep-copied; rebuilt in __setstate__
+        state = self.__dict__.copy()
+        state.pop('_plane_cells', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if '_planes' in state:
+            self._set_planes(self._planes)
+
+    def _mark_stone(self, move, player, value):
+        """set plane 0 of player's perspective and plane 1 of the
+        opponent's at move"""
+        size = self._plane_size
+        cell = self._plane_offsets[move]
+        if player == self.players[0]:
+            self._plane_cells[cell] = value
+            self._plane_cells[5 * size + cell] = value
+        else:
+            self._plane_cells[4 * size + cell] = value
+            self._plane_cells[size + cell] = value
+
+    def _mark_last_move(self, move, value):
+        """set plane 2 of both perspectives at move"""
+        cell = self._plane_offsets[move]
+        self._plane_cells[2 * self._plane_size + cell] = value
+        self._plane_cells[6 * self._plane_size + cell] = value
+
+    @property
+    def legal_mask(self):
+        """boolean numpy array over all moves, True where the move is legal"""
+        return self.availables.mask
 
     def move_to_location(self, move):
         """
@@ -56,65 +264,88 @@ class Board(object):
     def current_state(self):
         """return the board state from the perspective of the current player.
         state shape: 4*width*height
+
+        The result is a live, read-only float32 view of the board's own
+        buffer, not a copy: it changes with the next do_move/undo_move, so
+        copy it to keep it around. Only the last-move marker and, when the
+        side to move changed, the colour plane are rewritten here.
         """
 
-        square_state = np.zeros((4, self.width, self.height))
-        if self.states:
-            moves, players = np.array(list(zip(*self.states.items())))
-            move_curr = moves[players == self.current_player]
-            move_oppo = moves[players != self.current_player]
-            square_state[0][move_curr // self.width,
-                            move_curr % self.height] = 1.0
-            square_state[1][move_oppo // self.width,
-                            move_oppo % self.height] = 1.0
+        if self._plane_last != self.last_move:
             # indicate the last move location
-            square_state[2][self.last_move // self.width,
-                            self.last_move % self.height] = 1.0
-        if len(self.states) % 2 == 0:
-            square_state[3][:, :] = 1.0  # indicate the colour to play
-        return square_state[:, ::-1, :]
+            if self._plane_last != -1:
+                self._mark_last_move(self._plane_last, 0.0)
+            if self.last_move != -1:
+                self._mark_last_move(self.last_move, 1.0)
+            self._plane_last = self.last_move
+        planes = self._planes.reshape(2, 4, self.width, self.height)
+        parity = len(self.states) % 2
+        if self._plane_colour != parity:
+            # indicate the colour to play
+            planes[:, 3] = 1.0 if parity == 0 else 0.0
+            self._plane_colour = parity
+        square_state = planes[0 if self.current_player == self.players[0] else 1]
+        square_state.flags.writeable = False
+        return square_state
 
     def do_move(self, move):
+        self.history.append((move, self.last_move, self.winner))
+        self._mark_stone(move, self.current_player, 1.0)
         self.states[move] = self.current_player
         self.availables.remove(move)
+        if self.window_counters:
+            self.window_counters.add(move, self.current_player)
+        self.zobrist_key ^= (
+            self._zobrist_keys[self.current_player][move] ^ SIDE_TO_MOVE_KEY
+        )
         self.current_player = (
             self.players[0] if self.current_player == self.players[1]
             else self.players[1]
         )
         self.last_move = move
+        if self.winner == -1:
+            player = self.states[move]
+            if (self.window_counters.has_win(player) if self.window_counters
+                    else self._wins_at(move)):
+                self.winner = player
 
-    def has_a_winner(self):
-        width = self.width
-        height = self.height
-        states = self.states
-        n = self.n_in_row
-
-        moved = list(set(range(width * height)) - set(self.availables))
-        if len(moved) < self.n_in_row *2-1:
-            return False, -1
-
-        for m in moved:
-            h = m // width
-            w = m % width
-            player = states[m]
-
-            if (w in range(width - n + 1) and
-                    len(set(states.get(i, -1) for i in range(m, m + n))) == 1):
-                return True, player
-
-            if (h in range(height - n + 1) and
-                    len(set(states.get(i, -1) for i in range(m, m + n * width, width))) == 1):
-                return True, player
-
-            if (w in range(width - n + 1) and h in range(height - n + 1) and
-                    len(set(states.get(i, -1) for i in range(m, m + n * (width + 1), width + 1))) == 1):
-                return True, player
+    def undo_move(self):
+        """take back the last move played with do_move"""
+        move, self.last_move, self.winner = self.history.pop()
+        player = self.states.pop(move)
+        self.availables.restore(move)
+        if self.window_counters:
+            self.window_counters.remove(move, player)
+        self._mark_stone(move, player, 0.0)
+        self.zobrist_key ^= (
+            self._zobrist_keys[player][move] ^ SIDE_TO_MOVE_KEY
+        )
+        self.current_player = player
 
-            if (w in range(n - 1, width) and h in range(height - n + 1) and
-                    len(set(states.get(i, -1) for i in range(m, m + n * (width - 1), width - 1))) == 1):
-                return True, player
+    def _wins_at(self, move):
+        """whether the stone at move completes n_in_row on a line through it.
+        a new line can only appear through the last stone placed, so only the
+        4 lines through move are walked instead of the whole board.
+        """
+        states = self.states
+        player = states[move]
+        for forward, backward in self.geometry.rays[move]:
+            count = 1
+            for m in forward:
+                if states.get(m) != player:
+                    break
+                count += 1
+            for m in backward:
+                if states.get(m) != player:
+                    break
+                count += 1
+            if count >= self.n_in_row:
+                return True
+        return False
 
-        return False, -1
+    def has_a_winner(self):
+        """O(1): the winner is maintained by do_move"""
+        return self.winner != -1, self.winner
 
     def game_end(self):
         """Check whether the game is ended or not"""
@@ -129,6 +360,281 @@ class Board(object):
         return self.current_player
 
 
+@lru_cache(maxsize=None)
+def _plane_offset_array(width, height):
+    offsets = np.array(_plane_offsets(width, height), dtype=np.intp)
+    offsets.flags.writeable = False
+    return offsets
+
+
+class CellStates(Mapping):
+    """read-only {move: player} view over a CompactBoard's cells, standing
+    in for Board.states. iterates over the occupied moves in ascending
+    order (Board.states iterates in the order the moves were played).
+    """
+
+    __slots__ = ('_cells',)
+
+    def __init__(self, cells):
+        self._cells = cells
+
+    def __getitem__(self, move):
+        if 0 <= move < len(self._cells) and self._cells[move]:
+            return self._cells[move]
+        raise KeyError(move)
+
+    def get(self, move, default=None):
+        if 0 <= move < len(self._cells) and self._cells[move]:
+            return self._cells[move]
+        return default
+
+    def __iter__(self):
+        return (move for move, player in enumerate(self._cells) if player)
+
+    def __len__(self):
+        return len(self._cells) - self._cells.count(0)
+
+
+class CompactBoard(object):
+    """memory-compact variant of Board for large numbers of live boards.
+
+    instances have no __dict__ (__slots__). the position is one bytearray
+    of width*height players (0 = empty) and the history an array('h') of
+    the moves played; states, availables, legal_mask and current_state()
+    are derived from them on each access instead of being kept up to
+    date. do_move/undo_move/clone/game_end behave as on Board, so the MCTS
+    players and Game accept either board.
+    """
+
+    __slots__ = ('width', 'height', 'n_in_row', 'players', 'cells',
+                 'current_player', 'last_move', 'winner', 'history',
+                 'geometry', 'zobrist_key', '_zobrist_keys', '_win_ply')
+
+    def __init__(self, **kwargs):
+        self.width = int(kwargs.get('width', 8))
+        self.height = int(kwargs.get('height', 8))
+        self.n_in_row = int(kwargs.get('n_in_row', 5))
+        self.players = [1, 2]  # player1 and player2
+        self.cells = bytearray(self.width * self.height)
+
+    def init_board(self, start_player=0):
+        if self.width < self.n_in_row or self.height < self.n_in_row:
+            raise Exception('board width and height can not be '
+                            'less than {}'.format(self.n_in_row))
+        self.current_player = self.players[start_player]  # start player
+        self.cells = bytearray(self.width * self.height)
+        self.last_move = -1
+        self.winner = -1
+        # number of moves played when winner was set, so undo_move can
+        # clear it without storing the previous winner per move
+        self._win_ply = 0
+        self.history = array('h')
+        self.geometry = board_geometry(self.width, self.height, self.n_in_row)
+        self._zobrist_keys = zobrist_keys(self.width, self.height)
+        self.zobrist_key = (
+            SIDE_TO_MOVE_KEY if self.current_player == self.players[1] else 0
+        )
+
+    def clone(self):
+        board = CompactBoard.__new__(CompactBoard)
+        board.width = self.width
+        board.height = self.height
+        board.n_in_row = self.n_in_row
+        board.players = self.players
+        board.cells = self.cells[:]
+        board.current_player = self.current_player
+        board.last_move = self.last_move
+        board.winner = self.winner
+        board._win_ply = self._win_ply
+        board.history = self.history[:]
+        board.geometry = self.geometry
+        board._zobrist_keys = self._zobrist_keys
+        board.zobrist_key = self.zobrist_key
+        return board
+
+    @property
+    def states(self):
+        return CellStates(self.cells)
+
+    @property
+    def legal_mask(self):
+        """boolean numpy array over all moves, True where the move is legal"""
+        return np.frombuffer(self.cells, dtype=np.uint8) == 0
+
+    @property
+    def availables(self):
+        """the free moves in ascending order, as a new list"""
+        return np.flatnonzero(self.legal_mask).tolist()
+
+    move_to_location = Board.move_to_location
+    location_to_move = Board.location_to_move
+    has_a_winner = Board.has_a_winner
+    get_current_player = Board.get_current_player
+
+    def current_state(self):
+        """same planes as Board.current_state(), built from the cells"""
+        offsets = _plane_offset_array(self.width, self.height)
+        stones = np.frombuffer(self.cells, dtype=np.uint8)
+        own = stones == self.current_player
+        square_state = np.zeros((4, self.width * self.height), dtype=np.float32)
+        square_state[0, offsets] = own
+        square_state[1, offsets] = (stones != 0) & ~own
+        if self.last_move != -1:
+            square_state[2, offsets[self.last_move]] = 1.0
+        if len(self.history) % 2 == 0:
+            square_state[3] = 1.0
+        return square_state.reshape(4, self.width, self.height)
+
+    def do_move(self, move):
+        if self.cells[move]:
+            raise ValueError('move {} is not available'.format(move))
+        player = self.current_player
+        self.cells[move] = player
+        self.history.append(move)
+        self.zobrist_key ^= (
+            self._zobrist_keys[player][move] ^ SIDE_TO_MOVE_KEY
+        )
+        self.current_player = (
+            self.players[0] if player == self.players[1] else self.players[1]
+        )
+        self.last_move = move
+        if self.winner == -1 and self._wins_at(move):
+            self.winner = player
+            self._win_ply = len(self.history)
+
+    def undo_move(self):
+        """take back the last move played with do_move"""
+        move = self.history.pop()
+        player = self.cells[move]
+        self.cells[move] = 0
+        if len(self.history) < self._win_ply:
+            self.winner = -1
+            self._win_ply = 0
+        self.last_move = self.history[-1] if self.history else -1
+        self.zobrist_key ^= (
+            self._zobrist_keys[player][move] ^ SIDE_TO_MOVE_KEY
+        )
+        self.current_player = player
+
+    def _wins_at(self, move):
+        """whether the stone at move completes n_in_row (see Board._wins_at)"""
+        cells = self.cells
+        player = cells[move]
+        for forward, backward in self.geometry.rays[move]:
+            count = 1
+            for m in forward:
+                if cells[m] != player:
+                    break
+                count += 1
+            for m in backward:
+                if cells[m] != player:
+                    break
+                count += 1
+            if count >= self.n_in_row:
+                return True
+        return False
+
+    def game_end(self):
+        """Check whether the game is ended or not"""
+        if self.winner != -1:
+            return True, self.winner
+        elif 0 not in self.cells:
+            return True, -1
+        return False, -1
+
+
+class BatchBoard(object):
+    """n_games independent games of the same size, stored as numpy arrays
+    (struct of arrays) so that moves, legal masks and win checks are
+    applied to every game at once, e.g. for rollouts or self-play games
+    run in lockstep with batched network inference.
+
+    cells has shape (n_games, height, width), indexed like
+    Board.move_to_location; 0 is empty, otherwise the player (1 or 2).
+    current_player, move_count, last_move and winner hold one entry per
+    game; winner is -1 while undecided.
+    """
+
+    def __init__(self, n_games, **kwargs):
+        self.n_games = int(n_games)
+        self.width = int(kwargs.get('width', 8))
+        self.height = int(kwargs.get('height', 8))
+        self.n_in_row = int(kwargs.get('n_in_row', 5))
+        self.players = [1, 2]  # player1 and player2
+
+    def init_board(self, start_player=0):
+        if self.width < self.n_in_row or self.height < self.n_in_row:
+            raise Exception('board width and height can not be '
+                            'less than {}'.format(self.n_in_row))
+        n = self.n_games
+        self.cells = np.zeros((n, self.height, self.width), dtype=np.int8)
+        # flat (n_games, width * height) view of cells, indexed by move
+        self._flat = self.cells.reshape(n, -1)
+        self.current_player = np.full(n, self.players[start_player],
+                                      dtype=np.int8)
+        self.move_count = np.zeros(n, dtype=np.intp)
+        self.last_move = np.full(n, -1, dtype=np.intp)
+        self.winner = np.full(n, -1, dtype=np.int8)
+        self.geometry = board_geometry(self.width, self.height, self.n_in_row)
+        self._plane_offsets = np.array(_plane_offsets(self.width, self.height),
+                                       dtype=np.intp)
+
+    @property
+    def legal_mask(self):
+        """boolean array (n_games, width * height), True where the move is
+        legal; all False for games that have ended"""
+        return (self._flat == 0) & (self.winner == -1)[:, None]
+
+    def game_end(self):
+        """vectorized Board.game_end(): (ended, winner) arrays over games"""
+        full = self.move_count == self.width * self.height
+        return (self.winner != -1) | full, self.winner.copy()
+
+    def do_moves(self, moves):
+        """play moves[i] in game i for every game at once.
+        a move of -1 leaves its game untouched (e.g. a game already over);
+        any other move must be legal in its game.
+        """
+        moves = np.asarray(moves, dtype=np.intp)
+        if moves.shape != (self.n_games,):
+            raise ValueError('expected {} moves, got shape {}'.format(
+                self.n_games, moves.shape))
+        games = np.flatnonzero(moves != -1)
+        moves = moves[games]
+        if len(games) == 0:
+            return
+        if not self.legal_mask[games, moves].all():
+            raise ValueError('illegal move in games {}'.format(
+                games[~self.legal_mask[games, moves]].tolist()))
+        players = self.current_player[games]
+        self._flat[games, moves] = players
+        self.move_count[games] += 1
+        self.last_move[games] = moves
+        self.current_player[games] = 3 - players
+        # a new line can only go through the stone just placed: check the
+        # windows through each move (padded with -1) in one gather
+        ids = self.geometry.cell_windows[moves]
+        window_cells = self.geometry.windows[ids]
+        stones = self._flat[games[:, None, None], window_cells]
+        filled = (stones == players[:, None, None]).all(axis=2) & (ids != -1)
+        won = filled.any(axis=1)
+        self.winner[games[won]] = players[won]
+
+    def current_states(self):
+        """Board.current_state() of every game, stacked:
+        float32 array of shape (n_games, 4, width, height)"""
+        n, size = self.n_games, self.width * self.height
+        offsets = self._plane_offsets
+        own = self._flat == self.current_player[:, None]
+        states = np.zeros((n, 4, size), dtype=np.float32)
+        states[:, 0, offsets] = own
+        states[:, 1, offsets] = (self._flat != 0) & ~own
+        played = np.flatnonzero(self.last_move != -1)
+        states[played, 2, offsets[self.last_move[played]]] = 1.0
+        states[self.move_count % 2 == 0, 3] = 1.0
+        return states.reshape(n, 4, self.width, self.height)
+
+
 class Game(object):
     """game server"""
 
@@ -199,7 +705,7 @@ class Game(object):
                                                  temp=temp,
                                                  return_prob=1)
             # store the data
-            states.append(self.board.current_state())
+            states.append(self.board.current_state().copy())
             mcts_probs.append(move_probs)
             current_players.append(self.board.current_player)
             # perform a move
@@ -13,10 +13,20 @@ Modifications:
   when available.
 """
 import math
+import os
+import sys
 import numpy as np
-import copy
 from operator import itemgetter
 
+# make the repo root importable so the shared ``common`` package resolves
+# regardless of invocation CWD
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from common.geometry import DIRECTIONS, board_geometry
+from common.move_scores import move_map, stones_from_states
+
 
 def _neighbors_of_existing_stones(board):
     """Return a list of available moves that are adjacent (8-neighborhood)
@@ -35,7 +45,7 @@ def _neighbors_of_existing_stones(board):
                 nx, ny = row + dx, col + dy
                 if 0 <= nx < height and 0 <= ny < width:
                     neighbor_positions.add(nx * width + ny)
-    candidates = [m for m in board.availables if m in neighbor_positions]
+    candidates = [m for m in sorted(neighbor_positions) if m in board.availables]
     if not candidates:
         # fallback to all availables if no neighbors (e.g. very first move)
         candidates = list(board.availables)
@@ -66,6 +76,10 @@ def _count_in_direction(states, width, move, player, dx, dy):
 def _score_move_simple(board, move, player):
     """A small heuristic to score a candidate move for `player`.
 
+    Reference implementation, kept for the benchmarks and as the
+    definition _score_moves must match: the engine (rollout_policy_fn)
+    scores all candidates at once with _score_moves.
+
     Scoring rules (simple and fast):
     - If placing here gives immediate win (line >= n_in_row): very large score.
     - If placing here blocks opponent's immediate win: high score.
@@ -78,18 +92,27 @@ def _score_move_simple(board, move, player):
     states = board.states
     opp = board.players[0] if player == board.players[1] else board.players[1]
     directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-
-    # Check immediate win for player
-    for dx, dy in directions:
-        own_len = _count_in_direction(states, width, move, player, dx, dy)
-        if own_len + 1 >= n:
-            return 1e6  # immediate win is best
-
-    # Check immediate win for opponent (block)
-    for dx, dy in directions:
-        opp_len = _count_in_direction(states, width, move, opp, dx, dy)
-        if opp_len + 1 >= n:
-            return 5e5  # blocking opponent immediate win is second best
+    counters = getattr(board, "window_counters", None)
+
+    if counters:
+        # Boards keeping window counters answer both checks from the
+        # counts of the windows through `move`, without walking lines
+        if counters.completing_windows(move, player):
+            return 1e6
+        if counters.completing_windows(move, opp):
+            return 5e5
+    else:
+        # Check immediate win for player
+        for dx, dy in directions:
+            own_len = _count_in_direction(states, width, move, player, dx, dy)
+            if own_len + 1 >= n:
+                return 1e6  # immediate win is best
+
+        # Check immediate win for opponent (block)
+        for dx, dy in directions:
+            opp_len = _count_in_direction(states, width, move, opp, dx, dy)
+            if opp_len + 1 >= n:
+                return 5e5  # blocking opponent immediate win is second best
 
     # Otherwise, reward extending own lines and blocking partially opponent lines.
     score = 0.0
@@ -103,6 +126,36 @@ def _score_move_simple(board, move, player):
     return score
 
 
+# _score_move_simple's direction order, as indices into DIRECTIONS, so
+# that _score_moves adds the same terms in the same order
+_SCORE_DIRECTIONS = [DIRECTIONS.index(d) for d in [(1, 0), (0, 1), (1, 1), (1, -1)]]
+# exp terms of _score_move_simple per run length, computed the same way
+_OWN_TERMS = np.array([math.exp(k) for k in range(64)])
+_OPP_TERMS = np.array([0.5 * math.exp(k * 0.5) for k in range(64)])
+
+
+def _score_moves(board, moves, player):
+    """_score_move_simple for every move at once, from a single move_map
+    pass over the whole board (common.move_scores). Returns a float array,
+    equal element by element to the per-move scores."""
+    if not getattr(board, "states", None) or getattr(board, "width", None) is None:
+        return np.zeros(len(moves))
+    geometry = board_geometry(board.width, board.height, board.n_in_row)
+    stones = getattr(board, "cells", None)
+    if stones is not None:
+        stones = np.frombuffer(stones, dtype=np.uint8)
+    else:
+        stones = stones_from_states(board.states, geometry.n_cells)
+    runs = move_map(geometry, stones, player)
+    moves = np.asarray(moves, dtype=np.intp)
+    own, opp = runs.own_runs[moves], runs.opp_runs[moves]
+    score = np.zeros(len(moves))
+    for d in _SCORE_DIRECTIONS:
+        score += _OWN_TERMS[own[:, d]]
+        score += _OPP_TERMS[opp[:, d]]
+    return np.where(runs.wins[moves], 1e6, np.where(runs.blocks[moves], 5e5, score))
+
+
 def rollout_policy_fn(board, temperature=0.7):
     """Guided rollout policy:
     - prefer available moves adjacent to existing stones
@@ -119,7 +172,7 @@ def rollout_policy_fn(board, temperature=0.7):
         if player is None:
             player = board.players[0] if len(board.players) > 0 else 1
 
-        scores = np.array([_score_move_simple(board, m, player) for m in candidates], dtype=float)
+        scores = _score_moves(board, candidates, player)
         # Numerical stability: shift scores
         if np.all(scores == 0):
             # fallback to uniform random among candidates
@@ -143,8 +196,9 @@ def policy_value_fn(board):
     """a function that takes in a state and outputs a list of (action, probability)
     tuples and a score for the state"""
     # return uniform probabilities and 0 score for pure MCTS
-    action_probs = np.ones(len(board.availables))/len(board.availables)
-    return zip(board.availables, action_probs), 0
+    legal_moves = np.flatnonzero(board.legal_mask).tolist()
+    action_probs = np.ones(len(legal_moves))/len(legal_moves)
+    return zip(legal_moves, action_probs), 0
 
 
 class TreeNode(object):
@@ -218,7 +272,8 @@ class TreeNode(object):
 class MCTS(object):
     """A simple implementation of Monte Carlo Tree Search."""
 
-    def __init__(self, policy_value_fn, c_puct=5, n_playout=10000):
+    def __init__(self, policy_value_fn, c_puct=5, n_playout=10000,
+                 in_place=False):
         """
         policy_value_fn: a function that takes in a board state and outputs
             a list of (action, probability) tuples and also a score in [-1, 1]
@@ -227,16 +282,21 @@ class MCTS(object):
         c_puct: a number in (0, inf) that controls how quickly exploration
             converges to the maximum-value policy. A higher value means
             relying on the prior more.
+        in_place: if True, all playouts of a search run on one working
+            board and are unwound with undo_move() after backpropagation,
+            instead of cloning the board for every playout.
         """
         self._root = TreeNode(None, 1.0)
         self._policy = policy_value_fn
         self._c_puct = c_puct
         self._n_playout = n_playout
+        self._in_place = in_place
 
     def _playout(self, state):
         """Run a single playout from the root to the leaf, getting a value at
         the leaf and propagating it back through its parents.
-        State is modified in-place, so a copy must be provided.
+        State is modified in-place, so a copy (or a board that is unwound
+        afterwards, see _run_playouts) must be provided.
         """
         node = self._root
         while(1):
@@ -321,15 +381,27 @@ class MCTS(object):
         else:
             return 1 if winner == player else -1
 
+    def _run_playouts(self, state):
+        """Run n_playout playouts from state, leaving state unchanged."""
+        if not self._in_place:
+            for n in range(self._n_playout):
+                state_copy = state.clone()
+                self._playout(state_copy)
+            return
+        board = state.clone()  # one working board for the whole search
+        n_moves = len(board.history)
+        for n in range(self._n_playout):
+            self._playout(board)
+            while len(board.history) > n_moves:
+                board.undo_move()
+
     def get_move(self, state):
         """Runs all playouts sequentially and returns the most visited action.
         state: the current game state
 
         Return: the selected action
         """
-        for n in range(self._n_playout):
-            state_copy = copy.deepcopy(state)
-            self._playout(state_copy)
+        self._run_playouts(state)
         return max(self._root._children.items(),
                    key=lambda act_node: act_node[1]._n_visits)[0]
 
@@ -349,8 +421,8 @@ class MCTS(object):
 
 class MCTSPlayer(object):
     """AI player based on MCTS"""
-    def __init__(self, c_puct=5, n_playout=2000):
-        self.mcts = MCTS(policy_value_fn, c_puct, n_playout)
+    def __init__(self, c_puct=5, n_playout=2000, in_place=False):
+        self.mcts = MCTS(policy_value_fn, c_puct, n_playout, in_place)
 
     def set_player_ind(self, p):
         self.player = p
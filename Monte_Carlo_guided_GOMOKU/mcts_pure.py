@@ -6,7 +6,6 @@ A pure implementation of the Monte Carlo Tree Search (MCTS)
 """
 
 import numpy as np
-import copy
 from operator import itemgetter
 
 
@@ -21,8 +20,9 @@ def policy_value_fn(board):
     """a function that takes in a state and outputs a list of (action, probability)
     tuples and a score for the state"""
     # return uniform probabilities and 0 score for pure MCTS
-    action_probs = np.ones(len(board.availables))/len(board.availables)
-    return zip(board.availables, action_probs), 0
+    legal_moves = np.flatnonzero(board.legal_mask).tolist()
+    action_probs = np.ones(len(legal_moves))/len(legal_moves)
+    return zip(legal_moves, action_probs), 0
 
 
 class TreeNode(object):
@@ -96,7 +96,8 @@ class TreeNode(object):
 class MCTS(object):
     """A simple implementation of Monte Carlo Tree Search."""
 
-    def __init__(self, policy_value_fn, c_puct=5, n_playout=10000):
+    def __init__(self, policy_value_fn, c_puct=5, n_playout=10000,
+                 in_place=False):
         """
         policy_value_fn: a function that takes in a board state and outputs
             a list of (action, probability) tuples and also a score in [-1, 1]
@@ -105,16 +106,21 @@ class MCTS(object):
         c_puct: a number in (0, inf) that controls how quickly exploration
             converges to the maximum-value policy. A higher value means
             relying on the prior more.
+        in_place: if True, all playouts of a search run on one working
+            board and are unwound with undo_move() after backpropagation,
+            instead of cloning the board for every playout.
         """
         self._root = TreeNode(None, 1.0)
         self._policy = policy_value_fn
         self._c_puct = c_puct
         self._n_playout = n_playout
+        self._in_place = in_place
 
     def _playout(self, state):
         """Run a single playout from the root to the leaf, getting a value at
         the leaf and propagating it back through its parents.
-        State is modified in-place, so a copy must be provided.
+        State is modified in-place, so a copy (or a board that is unwound
+        afterwards, see _run_playouts) must be provided.
         """
         node = self._root
         while(1):
@@ -156,15 +162,27 @@ class MCTS(object):
         else:
             return 1 if winner == player else -1
 
+    def _run_playouts(self, state):
+        """Run n_playout playouts from state, leaving state unchanged."""
+        if not self._in_place:
+            for n in range(self._n_playout):
+                state_copy = state.clone()
+                self._playout(state_copy)
+            return
+        board = state.clone()  # one working board for the whole search
+        n_moves = len(board.history)
+        for n in range(self._n_playout):
+            self._playout(board)
+            while len(board.history) > n_moves:
+                board.undo_move()
+
     def get_move(self, state):
         """Runs all playouts sequentially and returns the most visited action.
         state: the current game state
 
         Return: the selected action
         """
-        for n in range(self._n_playout):
-            state_copy = copy.deepcopy(state)
-            self._playout(state_copy)
+        self._run_playouts(state)
         return max(self._root._children.items(),
                    key=lambda act_node: act_node[1]._n_visits)[0]
 
@@ -184,8 +202,8 @@ class MCTS(object):
 
 class MCTSPlayer(object):
     """AI player based on MCTS"""
-    def __init__(self, c_puct=5, n_playout=2000):
-        self.mcts = MCTS(policy_value_fn, c_puct, n_playout)
+    def __init__(self, c_puct=5, n_playout=2000, in_place=False):
+        self.mcts = MCTS(policy_value_fn, c_puct, n_playout, in_place)
 
     def set_player_ind(self, p):
         self.player = p
@@ -95,7 +95,7 @@ class PolicyValueNetNumpy():
         output: a list of (action, probability) tuples for each available
         action and the score of the board state
         """
-        legal_positions = board.availables
+        legal_positions = np.flatnonzero(board.legal_mask)
         current_state = board.current_state()
 
         X = current_state.reshape(-1, 4, self.board_width, self.board_height)
@@ -111,5 +111,6 @@ class PolicyValueNetNumpy():
                                 self.params[11], padding=0))
         X_v = relu(fc_forward(X_v.flatten(), self.params[12], self.params[13]))
         value = np.tanh(fc_forward(X_v, self.params[14], self.params[15]))[0]
-        act_probs = zip(legal_positions, act_probs.flatten()[legal_positions])
+        act_probs = zip(legal_positions.tolist(),
+                        act_probs.flatten()[legal_positions])
         return act_probs, value
\ No newline at end of file
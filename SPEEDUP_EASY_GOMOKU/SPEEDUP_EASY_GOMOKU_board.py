@@ -1,10 +1,30 @@
 # Converted EASY_GOMOKU Board to use MCTS-style numeric flat representation.
-# - states: dict {index: player_int} where player_int is 1 (X) or 2 (O)
-# - availables: list of free indices
+# - cells: flat bytearray of SIZE*SIZE cells, 0 (empty), 1 (X) or 2 (O)
+# - states / availables: read-only views derived from cells, kept for callers
+#   written against the original dict/list representation
+# - adjacent: flat bytearray, number of occupied 8-neighbours of each cell
+# - move_count: number of stones on the board
 # - current_player: 1 or 2
 # - play(move) accepts flat index and returns a new Board (immutable)
+# - zobrist_key: 64-bit Zobrist hash shared with the other boards (common.zobrist)
 # Keeps the same logic (adjacency legal-move heuristic, 4-in-row win),
 # but all moves/players are numeric to match the MCTS representation.
+# Board geometry (neighbours, winning windows, rays) comes from the shared
+# common.geometry tables, so the hot methods only index into cells.
+
+import itertools
+import os
+import sys
+
+# Make the repo root importable so the shared ``common`` package resolves
+# regardless of invocation CWD.
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from common.geometry import board_geometry
+from common.zobrist import SIDE_TO_MOVE_KEY, position_hash, zobrist_keys
+
 
 class Board:
     """
@@ -13,33 +33,87 @@ class Board:
     Representation:
       SIZE (int): board width/height (6)
       N_IN_ROW (int): required in-row to win (4)
-      states (dict): mapping index -> player (1 or 2)
-      availables (list): list of available indices
+      cells (bytearray): SIZE*SIZE cells, index -> 0 (empty), 1 or 2
+      adjacent (bytearray): index -> number of occupied neighbour cells
+      move_count (int): number of occupied cells
+      states (dict): mapping index -> player (1 or 2), built from cells
+      availables (list): list of available indices, built from cells
       current_player (int): 1 or 2 (1 maps to 'X', 2 maps to 'O')
       last_move (int): last move index or -1
+      zobrist_key (int): Zobrist hash of the position, side to move included
     """
 
     SIZE = 6
     N_IN_ROW = 4
+    N_CELLS = SIZE * SIZE
     EMPTY = 0
     PLAYER_CHAR = {1: 'X', 2: 'O'}
+    ZOBRIST_KEYS = zobrist_keys(SIZE, SIZE)
+
+    # Precomputed geometry, shared by every board
+    GEOMETRY = board_geometry(SIZE, SIZE, N_IN_ROW)
+    CELL_RANGE = range(N_CELLS)
+    CELL_RC = tuple(itertools.product(range(SIZE), repeat=2))
+    NEIGHBORS = GEOMETRY.neighbor_cells
+    WINDOWS = GEOMETRY.window_cells
+    RAYS = GEOMETRY.rays
 
     def __init__(self, states=None, current_player=1):
         # states: dict mapping index -> player_int (1 or 2)
         self.current_player = current_player
-        self.states = dict(states) if states else {}
-        self.availables = [i for i in range(self.SIZE * self.SIZE) if i not in self.states]
-        self.last_move = -1 if not self.states else max(self.states.keys())
+        self.cells = bytearray(self.N_CELLS)
+        self.adjacent = bytearray(self.N_CELLS)
+        self.move_count = 0
+        if states:
+            for idx, player in states.items():
+                self.cells[idx] = player
+                self._add_neighbor(idx, 1)
+            self.move_count = len(states)
+        self.last_move = -1 if not states else max(states.keys())
+        # When built from a states dict the real last move is unknown
+        # (last_move above is only a guess); play()/do() make it exact.
+        self._last_move_known = not states
+        # (move, previous last_move, previous _last_move_known) for moves
+        # applied in place with do()
+        self._undo_stack = []
+        self.zobrist_key = position_hash(
+            self.SIZE, self.SIZE, states.items() if states else (), self.current_player
+        )
+
+    @property
+    def states(self):
+        """Dict view {index: player} of the occupied cells (a fresh copy)."""
+        return {idx: p for idx, p in enumerate(self.cells) if p}
+
+    @property
+    def availables(self):
+        """Ascending list of the empty cells (a fresh copy)."""
+        return [idx for idx, p in enumerate(self.cells) if not p]
 
     def copy(self):
-        return Board(states=self.states.copy(), current_player=self.current_player)
+        new_board = Board.__new__(Board)
+        new_board.current_player = self.current_player
+        new_board.cells = self.cells[:]
+        new_board.adjacent = self.adjacent[:]
+        new_board.move_count = self.move_count
+        new_board.last_move = self.last_move
+        new_board._last_move_known = self._last_move_known
+        new_board._undo_stack = []
+        new_board.zobrist_key = self.zobrist_key
+        return new_board
 
     def _idx_to_rc(self, idx):
-        return divmod(idx, self.SIZE)
+        return self.CELL_RC[idx]
 
     def _rc_to_idx(self, r, c):
         return r * self.SIZE + c
 
+    def _add_neighbor(self, idx, delta):
+        # Stone placed (delta=1) or removed (delta=-1) at idx
+        adjacent = self.adjacent
+        for nidx in self.NEIGHBORS[idx]:
+            adjacent[nidx] += delta
+
     def legal_moves(self):
         """
         Generate legal moves using the same adjacency heuristic as the original EASY_GOMOKU:
@@ -49,38 +123,13 @@ class Board:
         Returns:
             list[int] of flat indices
         """
-        moves = []
-        is_empty_board = len(self.states) == 0
-
-        for r in range(self.SIZE):
-            for c in range(self.SIZE):
-                idx = self._rc_to_idx(r, c)
-                if idx in self.states:
-                    is_empty_board = False
-                    continue
-
-                has_neighbor = False
-                for dr in (-1, 0, 1):
-                    for dc in (-1, 0, 1):
-                        if dr == 0 and dc == 0:
-                            continue
-                        nr, nc = r + dr, c + dc
-                        if 0 <= nr < self.SIZE and 0 <= nc < self.SIZE:
-                            nidx = self._rc_to_idx(nr, nc)
-                            if nidx in self.states:
-                                has_neighbor = True
-                                break
-                    if has_neighbor:
-                        break
-
-                if has_neighbor:
-                    moves.append(idx)
-
-        if is_empty_board:
+        if self.move_count == 0:
             center = self.SIZE // 2 - 1
             return [self._rc_to_idx(center, center)]
 
-        return moves
+        cells = self.cells
+        adjacent = self.adjacent
+        return [idx for idx in self.CELL_RANGE if adjacent[idx] and not cells[idx]]
 
     def play(self, move):
         """
@@ -101,19 +150,66 @@ class Board:
         ValueError
             If the cell is already occupied.
         """
-        if move in self.states:
+        if self.cells[move]:
             raise ValueError(f"Cell {move} is already occupied")
 
         new_board = self.copy()
-        new_board.states[move] = self.current_player
-        if move in new_board.availables:
-            new_board.availables.remove(move)
+        new_board.cells[move] = self.current_player
+        new_board._add_neighbor(move, 1)
+        new_board.move_count += 1
         new_board.last_move = move
+        new_board._last_move_known = True
         new_board.current_player = 1 if self.current_player == 2 else 2
+        new_board.zobrist_key = (
+            self.zobrist_key
+            ^ self.ZOBRIST_KEYS[self.current_player][move]
+            ^ SIDE_TO_MOVE_KEY
+        )
         return new_board
 
+    def do(self, move):
+        """
+        Apply move in place (mutable counterpart of play()).
+
+        The move and the previous last_move are pushed onto an undo stack
+        so that undo() can restore the exact previous state.
+
+        Parameters
+        ----------
+        move : int
+            Flat index (row * SIZE + col)
+
+        Raises
+        ------
+        ValueError
+            If the cell is already occupied.
+        """
+        if self.cells[move]:
+            raise ValueError(f"Cell {move} is already occupied")
+
+        self.cells[move] = self.current_player
+        self._add_neighbor(move, 1)
+        self.move_count += 1
+        self._undo_stack.append((move, self.last_move, self._last_move_known))
+        self.last_move = move
+        self._last_move_known = True
+        self.zobrist_key ^= self.ZOBRIST_KEYS[self.current_player][move] ^ SIDE_TO_MOVE_KEY
+        self.current_player = 1 if self.current_player == 2 else 2
+
+    def undo(self):
+        """
+        Revert the most recent move applied with do().
+        """
+        move, self.last_move, self._last_move_known = self._undo_stack.pop()
+        player = self.cells[move]
+        self.cells[move] = self.EMPTY
+        self._add_neighbor(move, -1)
+        self.move_count -= 1
+        self.current_player = player
+        self.zobrist_key ^= self.ZOBRIST_KEYS[player][move] ^ SIDE_TO_MOVE_KEY
+
     def is_full(self):
-        return len(self.availables) == 0
+        return self.move_count == self.N_CELLS
 
     def print_board(self):
         """
@@ -124,8 +220,7 @@ class Board:
         for r in range(self.SIZE):
             row_chars = []
             for c in range(self.SIZE):
-                idx = self._rc_to_idx(r, c)
-                p = self.states.get(idx, self.EMPTY)
+                p = self.cells[self._rc_to_idx(r, c)]
                 ch = self.PLAYER_CHAR.get(p, '-')
                 row_chars.append(ch)
             print(f"{r + 1} " + ''.join(row_chars))
@@ -140,24 +235,46 @@ class Board:
             inv = {'X': 1, 'O': 2}
             stone = inv.get(stone, stone)
 
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
+        cells = self.cells
+        for window in self.WINDOWS:
+            for idx in window:
+                if cells[idx] != stone:
+                    break
+            else:
+                return True
+        return False
 
-        for r in range(self.SIZE):
-            for c in range(self.SIZE):
-                idx = self._rc_to_idx(r, c)
-                if self.states.get(idx, self.EMPTY) != stone:
-                    continue
-                for dr, dc in directions:
-                    count = 1
-                    nr, nc = r + dr, c + dc
-                    while (
-                        0 <= nr < self.SIZE
-                        and 0 <= nc < self.SIZE
-                        and self.states.get(self._rc_to_idx(nr, nc), self.EMPTY) == stone
-                    ):
-                        count += 1
-                        if count == self.N_IN_ROW:
-                            return True
-                        nr += dr
-                        nc += dc
-        return False
\ No newline at end of file
+    def winner_after_last_move(self):
+        """
+        Return the winner (1 or 2) looking only at the lines through
+        last_move, or None if there is no winner.
+
+        A new N_IN_ROW can only appear on a line through the stone just
+        placed, so this avoids the full-board scan of check_winner().
+        It assumes the position before the last move had no winner.
+        Falls back to check_winner() for both players when the last move
+        is not known (board built from a states dict).
+        """
+        if not self._last_move_known:
+            for stone in (1, 2):
+                if self.check_winner(stone):
+                    return stone
+            return None
+        if self.last_move == -1:
+            return None
+
+        cells = self.cells
+        stone = cells[self.last_move]
+        for forward, backward in self.RAYS[self.last_move]:
+            count = 1
+            for idx in forward:
+                if cells[idx] != stone:
+                    break
+                count += 1
+            for idx in backward:
+                if cells[idx] != stone:
+                    break
+                count += 1
+            if count >= self.N_IN_ROW:
+                return stone
+        return None
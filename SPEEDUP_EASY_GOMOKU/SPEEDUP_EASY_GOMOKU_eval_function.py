@@ -1,4 +1,6 @@
-from SPEEDUP_EASY_GOMOKU_shape import Shape
+import numpy as np
+
+from SPEEDUP_EASY_GOMOKU_shape import N_WINDOW_CODES, SHAPE_TABLE, Shape, batch_window_codes
 
 SCORES = {
     'four_in_row': 1_000_000_000,   # XXXX
@@ -11,31 +13,63 @@ SCORES = {
 }
 
 
+def _window_scores(root_player):
+    # Per window code: the summed score of its shapes for root_player (int),
+    # and whether one of them is an opponent open three, which evaluate()
+    # used to subtract as a float (SCORES['four_in_row'] * 0.9)
+    scores = np.zeros(N_WINDOW_CODES, dtype=np.int64)
+    opponent_open_3 = np.zeros(N_WINDOW_CODES, dtype=bool)
+    for code in range(N_WINDOW_CODES):
+        owner = (code >> 4) & 3  # centre cell of the window
+        for shape_type in SHAPE_TABLE[code]:
+            if owner == root_player:
+                scores[code] += SCORES[shape_type]
+            elif shape_type == 'open_3':
+                scores[code] -= int(SCORES['four_in_row'] * 0.9)
+                opponent_open_3[code] = True
+            else:
+                scores[code] -= SCORES[shape_type]
+    return scores, opponent_open_3
+
+
+# root_player (1 or 2) -> (scores, opponent_open_3) indexed by window code
+WINDOW_SCORES = {root_player: _window_scores(root_player) for root_player in (1, 2)}
+
+
 def evaluate(board, root_player):
     """
     Heuristic evaluation adapted to MCTS-style Board.
     `root_player` should be 1 (X) or 2 (O).
-    The Shape detector returns owner as 'X'/'O', so map accordingly.
+    Sums the precomputed score of the window around every stone in every
+    direction; equal to scoring each shape of Shape.detect_shapes() with
+    SCORES, opponent open threes counting as -0.9 * four_in_row.
     """
-    shape_detector = Shape(board)
-    shapes = shape_detector.detect_shapes()
-
-    inv = {'X': 1, 'O': 2}
-    opponent = 1 if root_player == 2 else 2
-    total_score = 0
-
-    for shape_type, owner_char in shapes:
-        value = SCORES[shape_type]
-        owner = inv[owner_char]
-
-        if owner == root_player:
-            total_score += value
-        elif owner == opponent:
-            # Opponent threats are penalized, with open threes treated
-            # as near-winning configurations.
-            if shape_type == 'open_3':
-                total_score -= SCORES['four_in_row'] * 0.9
-            else:
-                total_score -= value
+    scores, opponent_open_3 = WINDOW_SCORES[root_player]
+    _, codes = Shape(board).window_codes()
+    total_score = int(scores[codes].sum())
+    # all partial sums are integers far below 2 ** 53, so the float total
+    # the shape-by-shape loop produced is exactly float(total_score)
+    if opponent_open_3[codes].any():
+        return float(total_score)
+    return total_score
+
+
+# WINDOW_SCORES with windows centred on an empty cell scoring 0, so that
+# evaluate_batch() can sum the windows of every cell
+_CENTRE_IS_STONE = np.isin((np.arange(N_WINDOW_CODES) >> 4) & 3, (1, 2))
+_BATCH_SCORES = {root_player: np.where(_CENTRE_IS_STONE, scores, 0)
+                 for root_player, (scores, _) in WINDOW_SCORES.items()}
 
-    return total_score
\ No newline at end of file
+
+def evaluate_batch(boards, root_player):
+    """
+    evaluate() of many boards in one pass: the windows of all boards are
+    gathered at once (batch_window_codes) and looked up in the same
+    window score table. Returns an int64 array, element-wise equal to
+    evaluate() (which returns the same integer as a float when an
+    opponent open three is on the board).
+    """
+    if not len(boards):
+        return np.zeros(0, dtype=np.int64)
+    _, codes = batch_window_codes(boards)
+    return _BATCH_SCORES[root_player][codes].sum(axis=(1, 2))
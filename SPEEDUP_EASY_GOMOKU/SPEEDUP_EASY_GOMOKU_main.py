@@ -23,7 +23,7 @@ def get_human_move(board):
 
             if 0 <= r < board.SIZE and 0 <= c < board.SIZE:
                 idx = r * board.SIZE + c
-                if idx not in board.states:
+                if board.cells[idx] == board.EMPTY:
                     return idx
                 else:
                     print("That cell is already occupied!")
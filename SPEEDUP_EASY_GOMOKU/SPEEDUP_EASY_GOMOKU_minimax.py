@@ -13,11 +13,13 @@ def minimax(board, depth, is_maximizing, ai_player):
     """
     opponent = 1 if ai_player == 2 else 2
 
-    # 1. Terminal states: win or loss
-    if board.check_winner(ai_player):
+    # 1. Terminal states: win or loss. Only the player who made the last
+    # move can have just won, so only the lines through it are checked.
+    winner = board.winner_after_last_move()
+    if winner == ai_player:
         # Prefer faster wins
         return 10_000_000 + depth
-    if board.check_winner(opponent):
+    if winner == opponent:
         # Prefer slower losses
         return -10_000_000 - depth
 
@@ -65,4 +67,70 @@ def find_best_move(board, depth=4):
             best_val = move_val
             best_move = move
 
-    return best_move
\ No newline at end of file
+    return best_move
+
+
+def minimax_inplace(board, depth, is_maximizing, ai_player):
+    """
+    Same search as minimax(), but children are visited with
+    board.do(move) / board.undo() on a single board instead of
+    allocating a new Board per node.
+    The board is restored before returning.
+    """
+    opponent = 1 if ai_player == 2 else 2
+
+    # 1. Terminal states: win or loss
+    winner = board.winner_after_last_move()
+    if winner == ai_player:
+        return 10_000_000 + depth
+    if winner == opponent:
+        return -10_000_000 - depth
+
+    # 2. Base case: depth limit reached or draw
+    if depth == 0 or board.is_full():
+        return evaluate(board, board.current_player)
+
+    moves = board.legal_moves()
+
+    if is_maximizing:
+        best_score = -float('inf')
+        for move in moves:
+            board.do(move)
+            score = minimax_inplace(board, depth - 1, False, ai_player)
+            board.undo()
+            best_score = max(best_score, score)
+        return best_score
+    else:
+        best_score = float('inf')
+        for move in moves:
+            board.do(move)
+            score = minimax_inplace(board, depth - 1, True, ai_player)
+            board.undo()
+            best_score = min(best_score, score)
+        return best_score
+
+
+def find_best_move_inplace(board, depth=4):
+    """
+    In-place counterpart of find_best_move(); returns the same move.
+    The search runs on one private copy, so `board` is not modified.
+    """
+    ai_player = board.current_player
+    best_val = -float('inf')
+    best_move = None
+
+    moves = board.legal_moves()
+    if not moves:
+        return None
+
+    work_board = board.copy()
+    for move in moves:
+        work_board.do(move)
+        move_val = minimax_inplace(work_board, depth - 1, False, ai_player)
+        work_board.undo()
+
+        if move_val > best_val:
+            best_val = move_val
+            best_move = move
+
+    return best_move
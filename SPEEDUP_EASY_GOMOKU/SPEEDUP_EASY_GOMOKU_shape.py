@@ -1,6 +1,105 @@
 # Shape detector adapted to the MCTS-style Board representation.
 # It produces the same pattern strings as before, using 'X', 'O', '-' and 'B' for boundaries.
 # Returns shapes as (pattern_type, owner_char) where owner_char is 'X' or 'O'.
+#
+# The board's cells already hold 0 (empty), 1 (X) and 2 (O); with 3 for the
+# boundary they are the digits of a base-4 window code. Each evaluation copies
+# the cells once into a grid padded with two rings of boundary cells, reads
+# the 5-cell window around every stone in every direction through one
+# precomputed index array, and looks the resulting codes up in tables built
+# once over all 4 ** 5 = 1024 windows.
+
+import itertools
+from functools import lru_cache
+
+import numpy as np
+
+SYMBOLS = '-XOB'  # code 0, 1, 2, 3
+BOUNDARY = 3
+WINDOW_LENGTH = 5
+PAD = WINDOW_LENGTH // 2
+N_WINDOW_CODES = len(SYMBOLS) ** WINDOW_LENGTH
+# shift of each window cell: cell k is digit k of the base-4 code
+DIGIT_SHIFTS = 2 * np.arange(WINDOW_LENGTH, dtype=np.int16)
+
+PATTERNS = {
+    'four_in_row': ['XXXX', 'OOOO'],
+    'open_3': ['-XXX-', '-OOO-'],
+    'jump_3': ['XX-X', 'X-XX', 'OO-O', 'O-OO'],
+    'blocked_3': [
+        'BXXX', 'XXXB', 'OXXX', 'XXXO',
+        'BOOO', 'OOOB', 'XOOO', 'OOOX'
+    ],
+    'open_2': ['-XX-', '-OO-'],
+    'blocked_2': [
+        'BXX', 'XXB', 'BOO', 'OOB',
+        'OXX', 'XXO', 'XOO', 'OOX'
+    ],
+    'single': ['X', 'O'],
+}
+
+
+def match_patterns(line):
+    # pattern types found in a window string, one per matching pattern string
+    return tuple(
+        pattern_type
+        for pattern_type, pattern_strings in PATTERNS.items()
+        for pattern in pattern_strings
+        if pattern in line
+    )
+
+
+# SHAPE_TABLE[code]: pattern types of the window with that code
+SHAPE_TABLE = tuple(
+    match_patterns(''.join(SYMBOLS[(code >> (2 * k)) & 3] for k in range(WINDOW_LENGTH)))
+    for code in range(N_WINDOW_CODES)
+)
+
+
+@lru_cache(maxsize=None)
+def padded_geometry(size, directions):
+    """
+    Index arrays into the padded grid of a size x size board:
+      interior: (size*size,) padded index of every board cell
+      windows: (size*size, len(directions), 5) padded indices of the window
+               centred on every cell, offsets -2..2 along each direction
+    """
+    width = size + 2 * PAD
+    interior = np.array([(r + PAD) * width + c + PAD
+                         for r, c in itertools.product(range(size), repeat=2)])
+    offsets = np.array([[k * (dr * width + dc) for k in range(-PAD, PAD + 1)]
+                        for dr, dc in directions])
+    windows = interior[:, None, None] + offsets[None, :, :]
+    interior.flags.writeable = False
+    windows.flags.writeable = False
+    return width * width, interior, windows
+
+
+def window_code_array(window_cells):
+    """
+    Codes of windows given as an int array whose last axis holds the 5
+    window cells: the digits are shifted into place and or-ed together
+    (integer matmul is much slower on large batches).
+    """
+    return np.bitwise_or.reduce(window_cells << DIGIT_SHIFTS, axis=-1)
+
+
+def batch_window_codes(boards):
+    """
+    Vectorized Shape.window_codes() over many boards of the same SIZE.
+    The cells are stacked into one (len(boards), SIZE*SIZE) array and
+    padded together. Returns (cells, codes): the stacked cells and an
+    int array of shape (len(boards), SIZE*SIZE, 4) holding the code of
+    the window centred on every cell (empty cells included).
+    """
+    size = boards[0].SIZE
+    n_padded, interior, windows = padded_geometry(size, Shape.DIRECTIONS)
+    cells = np.frombuffer(b''.join([board.cells for board in boards]), dtype=np.uint8)
+    cells = cells.reshape(len(boards), size * size)
+    padded = np.full((len(boards), n_padded), BOUNDARY, dtype=np.int16)
+    padded[:, interior] = cells
+    return cells, window_code_array(padded[:, windows])
+
 
 class Shape:
     """
@@ -8,15 +107,15 @@ class Shape:
 
     This version expects Board with:
       - SIZE attribute
-      - states dict mapping idx -> player_int (1/2)
+      - cells bytearray mapping idx -> player_int (0 empty, 1/2)
     """
 
-    DIRECTIONS = [
+    DIRECTIONS = (
         (1, 0),   # vertical
         (0, 1),   # horizontal
         (1, 1),   # main diagonal
         (1, -1),  # anti-diagonal
-    ]
+    )
 
     def __init__(self, board):
         """
@@ -24,14 +123,14 @@ class Shape:
         """
         self.board_obj = board
         self.size = board.SIZE
-        self.states = board.states
+        self.cells = board.cells
         self.player_char = {1: 'X', 2: 'O'}
         self.empty_char = '-'
 
     def _cell_char(self, r, c):
         if 0 <= r < self.size and 0 <= c < self.size:
             idx = r * self.size + c
-            p = self.states.get(idx, 0)
+            p = self.cells[idx]
             return self.player_char.get(p, self.empty_char)
         else:
             return 'B'  # boundary
@@ -50,44 +149,27 @@ class Shape:
                 line.append('B')
         return ''.join(line)
 
+    def window_codes(self):
+        """
+        Codes of the windows around every stone.
+        Returns (stones, codes): the stone indices in ascending order and an
+        int array of shape (len(stones), 4), one code per direction.
+        """
+        n_padded, interior, windows = padded_geometry(self.size, self.DIRECTIONS)
+        cells = np.frombuffer(self.cells, dtype=np.uint8)
+        padded = np.full(n_padded, BOUNDARY, dtype=np.int16)
+        padded[interior] = cells
+        stones = np.flatnonzero(cells)
+        return stones, window_code_array(padded[windows[stones]])
+
     def detect_shapes(self):
         """
         Scan the board and detect patterns. Returns list of (pattern_type, owner_char).
         """
         shapes = []
-
-        patterns = {
-            'four_in_row': ['XXXX', 'OOOO'],
-            'open_3': ['-XXX-', '-OOO-'],
-            'jump_3': ['XX-X', 'X-XX', 'OO-O', 'O-OO'],
-            'blocked_3': [
-                'BXXX', 'XXXB', 'OXXX', 'XXXO',
-                'BOOO', 'OOOB', 'XOOO', 'OOOX'
-            ],
-            'open_2': ['-XX-', '-OO-'],
-            'blocked_2': [
-                'BXX', 'XXB', 'BOO', 'OOB',
-                'OXX', 'XXO', 'XOO', 'OOX'
-            ],
-            'single': ['X', 'O'],
-        }
-
-        for row in range(self.size):
-            for column in range(self.size):
-                stone_char = self._cell_char(row, column)
-                if stone_char == self.empty_char or stone_char == 'B':
-                    continue
-
-                for direction_row, direction_column in self.DIRECTIONS:
-                    line = ''
-                    for k in range(-2, 3):
-                        row_index = row + k * direction_row
-                        column_index = column + k * direction_column
-                        line += self._cell_char(row_index, column_index)
-
-                    for pattern_type, pattern_strings in patterns.items():
-                        for pattern in pattern_strings:
-                            if pattern in line:
-                                shapes.append((pattern_type, stone_char))
-
-        return shapes
\ No newline at end of file
+        stones, codes = self.window_codes()
+        for stone, stone_codes in zip(stones.tolist(), codes.tolist()):
+            stone_char = self.player_char[self.cells[stone]]
+            for code in stone_codes:
+                shapes.extend((pattern_type, stone_char) for pattern_type in SHAPE_TABLE[code])
+        return shapes
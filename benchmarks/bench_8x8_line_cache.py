@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+8x8 ``evaluate()`` with the board's ``LineCache`` vs rebuilding every
+line from the grid.
+
+Before the cache, ``ShapeDetector`` joined all 30 rows, columns and
+diagonals from ``board.grid`` on every call and ran the string pattern
+tests on every one of them, once per player. That path is reproduced
+here (``GridDetector``) and evaluated on a view exposing only the grid.
+
+Reported: per-call cost on the leaf positions of a depth-3 search, and
+the depth-3 searches themselves (copying and in-place), which must
+return the same move either way.
+"""
+
+from pathlib import Path
+import sys
+import time
+from types import SimpleNamespace
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+
+from Gomoku_8_8 import GOMOKU_8x8_eval, GOMOKU_8x8_minimax, GOMOKU_8x8_shape
+from Gomoku_8_8.GOMOKU_8x8_board import Board
+
+DEPTH = 3
+REPEATS = 5
+OPENINGS = [
+    [(3, 3), (3, 4), (4, 4), (2, 2)],
+    [(3, 3), (4, 4), (3, 4), (2, 5), (4, 3), (5, 2), (2, 3)],
+]
+
+
+def position(moves):
+    board = Board(player='X')
+    for move in moves:
+        board = board.play(move)
+    return board
+
+
+class GridDetector:
+    """ShapeDetector as before the line cache: strings joined from the grid."""
+
+    def __init__(self, grid):
+        self.lines = ["".join([grid[r][c] for r, c in coords])
+                      for coords in GOMOKU_8x8_shape._LINE_COORDS]
+
+    def count_patterns(self, player):
+        counts = dict.fromkeys(GOMOKU_8x8_shape.PATTERN_NAMES, 0)
+        for line in self.lines:
+            for name, n in zip(GOMOKU_8x8_shape.PATTERN_NAMES,
+                               GOMOKU_8x8_shape._count_line(line, player)):
+                counts[name] += n
+        return counts
+
+    def count_all(self):
+        return {player: self.count_patterns(player) for player in 'XO'}
+
+
+def evaluate_from_grid(board, player):
+    """evaluate() as before the line cache: lines rebuilt, counts recomputed."""
+    GOMOKU_8x8_eval.ShapeDetector = GridDetector
+    try:
+        return GOMOKU_8x8_eval.evaluate(SimpleNamespace(grid=board.grid), player)
+    finally:
+        GOMOKU_8x8_eval.ShapeDetector = GOMOKU_8x8_shape.ShapeDetector
+
+
+def leaf_positions(board):
+    """(board copy, player) of every leaf evaluated by a depth-3 search."""
+    leaves = []
+
+    def record(leaf, player):
+        leaves.append((leaf.copy(), player))
+        return GOMOKU_8x8_eval.evaluate(leaf, player)
+
+    GOMOKU_8x8_minimax.evaluate = record
+    try:
+        GOMOKU_8x8_minimax.find_best_move_inplace(board, depth=DEPTH)
+    finally:
+        GOMOKU_8x8_minimax.evaluate = GOMOKU_8x8_eval.evaluate
+    return leaves
+
+
+def us_per_call(leaves, evaluate):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for board, player in leaves:
+            evaluate(board, player)
+    return (time.perf_counter() - start) / (REPEATS * len(leaves)) * 1e6
+
+
+def timed_search(search, board, evaluate):
+    GOMOKU_8x8_minimax.evaluate = evaluate
+    try:
+        start = time.perf_counter()
+        move = search(board, depth=DEPTH)
+        return move, time.perf_counter() - start
+    finally:
+        GOMOKU_8x8_minimax.evaluate = GOMOKU_8x8_eval.evaluate
+
+
+def run():
+    for moves in OPENINGS:
+        board = position(moves)
+        leaves = leaf_positions(board)
+        for leaf, player in leaves:
+            assert GOMOKU_8x8_eval.evaluate(leaf, player) == evaluate_from_grid(leaf, player)
+
+        print(f"--- 8x8, depth {DEPTH}, opening {moves} ({len(leaves)} leaves) ---")
+        before = us_per_call(leaves, evaluate_from_grid)
+        after = us_per_call(leaves, GOMOKU_8x8_eval.evaluate)
+        print(f"  evaluate (us/call)  grid {before:8.1f}   line cache {after:8.1f}"
+              f"   ({before / after:.1f}x)")
+        for name, search in (("copying", GOMOKU_8x8_minimax.find_best_move),
+                             ("in-place", GOMOKU_8x8_minimax.find_best_move_inplace)):
+            move_before, t_before = timed_search(search, board, evaluate_from_grid)
+            move_after, t_after = timed_search(search, board, GOMOKU_8x8_eval.evaluate)
+            assert move_before == move_after, (move_before, move_after)
+            print(f"  {name:9s} search (s) grid {t_before:8.2f}   line cache {t_after:8.2f}"
+                  f"   ({t_before / t_after:.1f}x)  move={move_after}")
+        print()
+
+
+if __name__ == "__main__":
+    run()
+
+
+"""
+--- 8x8, depth 3, opening [(3, 3), (3, 4), (4, 4), (2, 2)] (1931 leaves) ---
+  evaluate (us/call)  grid    286.5   line cache     14.3   (20.0x)
+  copying   search (s) grid     0.49   line cache     0.06   (8.9x)  move=(4, 2)
+  in-place  search (s) grid     0.49   line cache     0.05   (9.9x)  move=(4, 2)
+
+--- 8x8, depth 3, opening [(3, 3), (4, 4), (3, 4), (2, 5), (4, 3), (5, 2), (2, 3)] (1187 leaves) ---
+  evaluate (us/call)  grid    211.6   line cache     11.0   (19.2x)
+  copying   search (s) grid     0.30   line cache     0.03   (9.4x)  move=(5, 3)
+  in-place  search (s) grid     0.28   line cache     0.04   (7.9x)  move=(5, 3)
+
+A move changes at most 4 of the 30 line codes (about 13%), kept on the
+board, so evaluate() no longer touches the grid: it is 30 lookups in
+LINE_TABLE (both players at once) and summing the counts.
+"""
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+8x8 pattern counting: the replace-based string scan, once per player,
+vs one pass of ``LINE_TABLE`` lookups for both players.
+
+The string scan runs ``_count_line`` (the ``in`` / ``replace`` tests
+``LINE_TABLE`` is built from) over the 30 line strings for 'X' and then
+for 'O'. The table path encodes the lines in base 3 from the grid, or
+reads the codes the board's ``LineCache`` already keeps. All three must
+give the same counts on the same random positions.
+"""
+
+from pathlib import Path
+import random
+import sys
+import time
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+
+from Gomoku_8_8.GOMOKU_8x8_board import Board
+from Gomoku_8_8.GOMOKU_8x8_shape import (
+    PATTERN_NAMES, ShapeDetector, _LINE_COORDS, _count_line,
+)
+
+N_POSITIONS = 500
+REPEATS = 20
+SEED = 0
+
+
+def count_by_strings(grid):
+    lines = ["".join([grid[r][c] for r, c in coords]) for coords in _LINE_COORDS]
+    result = {}
+    for player in 'XO':
+        counts = dict.fromkeys(PATTERN_NAMES, 0)
+        for line in lines:
+            for name, n in zip(PATTERN_NAMES, _count_line(line, player)):
+                counts[name] += n
+        result[player] = counts
+    return result
+
+
+def random_positions(n_positions, seed=SEED):
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(n_positions):
+        board = Board(player='X')
+        for _ in range(rng.randint(6, 30)):
+            board = board.play(rng.choice(board.legal_moves()))
+        positions.append(board)
+    return positions
+
+
+def us_per_call(positions, count):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for board in positions:
+            count(board)
+    return (time.perf_counter() - start) / (REPEATS * len(positions)) * 1e6
+
+
+def run():
+    positions = random_positions(N_POSITIONS)
+    for board in positions:
+        expected = count_by_strings(board.grid)
+        assert ShapeDetector(board.grid).count_all() == expected
+        assert ShapeDetector(board.line_cache).count_all() == expected
+
+    strings = us_per_call(positions, lambda board: count_by_strings(board.grid))
+    from_grid = us_per_call(positions, lambda board: ShapeDetector(board.grid).count_all())
+    cached = us_per_call(positions, lambda board: ShapeDetector(board.line_cache).count_all())
+    print(f"8x8, {N_POSITIONS} positions x {REPEATS} repeats (us per call, both players)\n")
+    print(f"  string scan x2:          {strings:8.1f}")
+    print(f"  table, lines from grid:  {from_grid:8.1f}   ({strings / from_grid:.1f}x)")
+    print(f"  table, LineCache codes:  {cached:8.1f}   ({strings / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    run()
+
+"""
+8x8, 500 positions x 20 repeats (us per call, both players)
+
+  string scan x2:             310.1
+  table, lines from grid:     100.3   (3.1x)
+  table, LineCache codes:      14.2   (21.8x)
+
+The table holds 9720 entries (3 ** 5 + ... + 3 ** 8, one range per line
+length) and is built once at import, in about 0.2 s. Encoding the lines
+from the grid is now most of the cost; with the codes the board already
+keeps, only the lookups and the column sums remain.
+"""
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the EASY_GOMOKU Minimax search on the list-based Board and on
+the BitBoard backend.
+
+Both boards run the unchanged ``EASY_GOMOKU_minimax.find_best_move`` at
+depth 4 from the same opening positions. Nodes are counted by wrapping
+``minimax`` (its recursive calls resolve through the module globals, so
+every visited node is seen).
+
+The search is timed twice: once with the real heuristic evaluation and
+once with ``evaluate`` replaced by a constant, which isolates the cost of
+the board operations (``play``, ``legal_moves``, ``check_winner``,
+``is_full``) that the bitboard replaces.
+"""
+
+from pathlib import Path
+import sys
+import time
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+sys.path.insert(0, str(repo_root / "EASY_GOMOKU"))
+
+import EASY_GOMOKU_minimax
+from EASY_GOMOKU_class_board import Board
+from EASY_GOMOKU_class_bitboard import BitBoard
+
+DEPTH = 4
+OPENINGS = [
+    [(2, 2), (2, 3)],
+    [(2, 2), (3, 3)],
+    [(2, 2), (1, 2), (3, 3)],
+]
+
+
+def count_nodes(board_cls, opening, depth=DEPTH):
+    """Run one search and return (best_move, nodes, seconds)."""
+    board = board_cls(player='X')
+    for move in opening:
+        board = board.play(move)
+
+    original = EASY_GOMOKU_minimax.minimax
+    nodes = [0]
+
+    def counted(*args, **kwargs):
+        nodes[0] += 1
+        return original(*args, **kwargs)
+
+    EASY_GOMOKU_minimax.minimax = counted
+    try:
+        start = time.perf_counter()
+        move = EASY_GOMOKU_minimax.find_best_move(board, depth=depth)
+        elapsed = time.perf_counter() - start
+    finally:
+        EASY_GOMOKU_minimax.minimax = original
+    return move, nodes[0], elapsed
+
+
+def compare(label):
+    print(f"--- {label} ---")
+    totals = {}
+    for board_cls in (Board, BitBoard):
+        total_nodes, total_time = 0, 0.0
+        for opening in OPENINGS:
+            move, nodes, elapsed = count_nodes(board_cls, opening)
+            total_nodes += nodes
+            total_time += elapsed
+            print(f"  {board_cls.__name__:8s} opening={opening} move={move} "
+                  f"nodes={nodes} time={elapsed:.2f}s "
+                  f"({nodes / elapsed:,.0f} nodes/s)")
+        totals[board_cls.__name__] = total_nodes / total_time
+
+    for name, nps in totals.items():
+        print(f"  {name:8s}: {nps:,.0f} nodes/s")
+    print(f"  Speedup: {totals['BitBoard'] / totals['Board']:.2f}x\n")
+
+
+def run():
+    print(f"EASY_GOMOKU Minimax, depth {DEPTH}\n")
+    compare("full search (heuristic evaluation at leaves)")
+
+    evaluate = EASY_GOMOKU_minimax.evaluate
+    EASY_GOMOKU_minimax.evaluate = lambda board, root_player: 0
+    try:
+        compare("board operations only (constant evaluation)")
+    finally:
+        EASY_GOMOKU_minimax.evaluate = evaluate
+
+
+if __name__ == "__main__":
+    run()
+
+"""
+EASY_GOMOKU Minimax, depth 4
+
+--- full search (heuristic evaluation at leaves) ---
+  Board   : 8,442 nodes/s
+  BitBoard: 8,770 nodes/s
+  Speedup: 1.04x
+
+--- board operations only (constant evaluation) ---
+  Board   : 46,711 nodes/s
+  BitBoard: 235,165 nodes/s
+  Speedup: 5.03x
+"""
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+EASY_GOMOKU Minimax with full leaf evaluation vs the incremental
+evaluator carried down the tree.
+
+Three depth-4 searches from the same positions, which must return the
+same move:
+  - copying: ``find_best_move`` (``play`` per node, ``evaluate`` per leaf);
+  - in-place: ``minimax_inplace`` without an evaluator (``do``/``undo``,
+    ``evaluate`` per leaf);
+  - incremental: ``find_best_move_inplace``, whose ``IncrementalEvaluator``
+    updates at most 20 windows per move and answers each leaf in O(1).
+Reported as wall time per search and leaf evaluations per second.
+"""
+
+from pathlib import Path
+import sys
+import time
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+sys.path.insert(0, str(repo_root / "EASY_GOMOKU"))
+
+import EASY_GOMOKU_evaluation_function
+import EASY_GOMOKU_minimax
+from EASY_GOMOKU_class_board import Board
+
+DEPTH = 4
+OPENINGS = [
+    [(2, 2), (2, 3), (3, 3)],
+    [(2, 2), (3, 3), (2, 3), (1, 1), (2, 4)],
+]
+
+
+def position(moves):
+    board = Board(player='X')
+    for move in moves:
+        board = board.play(move)
+    return board
+
+
+def find_best_move_full_eval(board, depth):
+    """find_best_move_inplace without the incremental evaluator."""
+    ai_player = board.player
+    best_val, best_move = -float('inf'), None
+    work_board = board.copy()
+    for move in work_board.legal_moves():
+        work_board.do(move)
+        move_val = EASY_GOMOKU_minimax.minimax_inplace(work_board, depth - 1, False, ai_player)
+        work_board.undo()
+        if move_val > best_val:
+            best_val, best_move = move_val, move
+    return best_move
+
+
+def count_leaves(search, board):
+    """Run search, counting leaf evaluations (full or incremental)."""
+    module = EASY_GOMOKU_evaluation_function
+    evaluate, score = module.evaluate, module.IncrementalEvaluator.score
+    leaves = [0]
+
+    def counted_evaluate(*args):
+        leaves[0] += 1
+        return evaluate(*args)
+
+    def counted_score(self, *args):
+        leaves[0] += 1
+        return score(self, *args)
+
+    EASY_GOMOKU_minimax.evaluate = counted_evaluate
+    module.IncrementalEvaluator.score = counted_score
+    try:
+        start = time.perf_counter()
+        move = search(board, DEPTH)
+        elapsed = time.perf_counter() - start
+    finally:
+        EASY_GOMOKU_minimax.evaluate = evaluate
+        module.IncrementalEvaluator.score = score
+    return move, leaves[0], elapsed
+
+
+SEARCHES = [
+    ("copying", EASY_GOMOKU_minimax.find_best_move),
+    ("in-place", find_best_move_full_eval),
+    ("incremental", EASY_GOMOKU_minimax.find_best_move_inplace),
+]
+
+
+def run():
+    for moves in OPENINGS:
+        print(f"--- EASY 6x6, depth {DEPTH}, opening {moves} ---")
+        found = set()
+        for name, search in SEARCHES:
+            move, leaves, elapsed = count_leaves(search, position(moves))
+            found.add(move)
+            print(f"  {name:12s} move={move} leaves={leaves:7d} time={elapsed:5.2f}s "
+                  f"({leaves / elapsed:,.0f} leaves/s)")
+        assert len(found) == 1, found
+        print()
+
+
+if __name__ == "__main__":
+    run()
+
+"""
+--- EASY 6x6, depth 4, opening [(2, 2), (2, 3), (3, 3)] ---
+  copying      move=(3, 2) leaves=  48106 time= 1.19s (40,531 leaves/s)
+  in-place     move=(3, 2) leaves=  48106 time= 1.16s (41,515 leaves/s)
+  incremental  move=(3, 2) leaves=  48106 time= 1.00s (48,206 leaves/s)
+
+--- EASY 6x6, depth 4, opening [(2, 2), (3, 3), (2, 3), (1, 1), (2, 4)] ---
+  copying      move=(2, 1) leaves= 101530 time= 2.75s (36,959 leaves/s)
+  in-place     move=(2, 1) leaves= 101530 time= 2.72s (37,384 leaves/s)
+  incremental  move=(2, 1) leaves= 101530 time= 2.28s (44,506 leaves/s)
+
+Since the window table, a full evaluate on 6x6 costs about the same as
+recomputing the 20 windows around one move, and each leaf is reached by
+one place() after its parent's. The gain (~15-20%) comes from undo
+restoring the saved window codes instead of recomputing them; it grows
+with the number of stones, which full evaluation pays for at every leaf.
+"""
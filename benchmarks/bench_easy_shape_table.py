@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Cost of the EASY_GOMOKU ``evaluate()`` with the 1024-entry window table
+vs the substring matcher it replaced.
+
+The substring matcher is rebuilt here from the pattern list it used
+(``match_patterns``): for every stone and direction it builds the
+5-character window string and tests every pattern string against it,
+then scores the shapes one by one. Both are run on the same random
+mid-game positions; their scores are checked to be identical.
+"""
+
+from pathlib import Path
+import random
+import sys
+import time
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+sys.path.insert(0, str(repo_root / "EASY_GOMOKU"))
+
+from EASY_GOMOKU_class_board import Board
+from EASY_GOMOKU_class_shape import Shape, match_patterns
+from EASY_GOMOKU_evaluation_function import evaluate, shape_score
+
+N_POSITIONS = 500
+REPEATS = 20
+SEED = 0
+
+
+def evaluate_by_substrings(board, root_player):
+    grid, size = board.grid, board.SIZE
+    total = 0
+    for row in range(size):
+        for column in range(size):
+            stone = grid[row][column]
+            if stone == '-':
+                continue
+            for direction_row, direction_column in Shape.DIRECTIONS:
+                line = ''
+                for k in range(-2, 3):
+                    r = row + k * direction_row
+                    c = column + k * direction_column
+                    line += grid[r][c] if 0 <= r < size and 0 <= c < size else 'B'
+                for shape_type in match_patterns(line):
+                    total += shape_score(shape_type, stone, root_player)
+    return total
+
+
+def random_positions(n_positions, seed=SEED):
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(n_positions):
+        board = Board(player='X')
+        for _ in range(rng.randint(6, 16)):
+            board = board.play(rng.choice(board.legal_moves()))
+        positions.append(board)
+    return positions
+
+
+def us_per_call(positions, evaluate_fn):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for board in positions:
+            evaluate_fn(board, 'X')
+    return (time.perf_counter() - start) / (REPEATS * len(positions)) * 1e6
+
+
+def run():
+    positions = random_positions(N_POSITIONS)
+    for board in positions:
+        for root_player in 'XO':
+            assert evaluate(board, root_player) == evaluate_by_substrings(board, root_player)
+    before = us_per_call(positions, evaluate_by_substrings)
+    after = us_per_call(positions, evaluate)
+    print(f"{N_POSITIONS} positions x {REPEATS} repeats (us per evaluate call)\n")
+    print(f"  substring matcher: {before:8.1f}")
+    print(f"  window table:      {after:8.1f}   ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    run()
+
+"""
+500 positions x 20 repeats (us per evaluate call)
+
+  substring matcher:    197.3
+  window table:          25.4   (7.8x)
+
+Each window now costs five list reads, a few shifts and one table lookup
+instead of building a string and running 30 substring tests.
+"""
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Minimax with and without an ``EvalCache`` (``common/eval_cache.py``)
+around the leaf evaluator, on the EASY (copying search, full
+``evaluate()`` per leaf) and 8x8 (in-place alpha-beta) engines.
+
+Every search must return the same move with and without the cache.
+Reported per search: wall time, cache hit rate, entries kept, and the
+memory held by the cache after the search (measured with tracemalloc in
+a separate, untimed run). The bounded runs cap the cache at a quarter of
+the entries the unbounded run needed, to show the LRU eviction at work.
+"""
+
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+sys.path.insert(0, str(repo_root / "EASY_GOMOKU"))
+
+import EASY_GOMOKU_evaluation_function
+import EASY_GOMOKU_minimax
+from EASY_GOMOKU_class_board import Board as EasyBoard
+from Gomoku_8_8 import GOMOKU_8x8_eval, GOMOKU_8x8_minimax
+from Gomoku_8_8.GOMOKU_8x8_board import Board as Board8x8
+from common.eval_cache import EvalCache
+
+
+def position(board, moves):
+    for move in moves:
+        board = board.play(move)
+    return board
+
+
+ENGINES = [
+    ("EASY 6x6", EASY_GOMOKU_minimax.find_best_move, EASY_GOMOKU_evaluation_function.evaluate,
+     position(EasyBoard(player='X'), [(2, 2), (2, 3), (3, 3)]), (3, 4, 5)),
+    ("8x8", GOMOKU_8x8_minimax.find_best_move_inplace, GOMOKU_8x8_eval.evaluate,
+     position(Board8x8(player='X'), [(3, 3), (3, 4), (4, 4), (2, 2)]), (3, 4, 5)),
+]
+
+
+def timed(search, board, depth, cache):
+    start = time.perf_counter()
+    move = search(board, depth, eval_cache=cache)
+    return move, time.perf_counter() - start
+
+
+def cache_bytes(search, board, depth, evaluate, max_entries):
+    tracemalloc.start()
+    cache = EvalCache(evaluate, max_entries)
+    before = tracemalloc.get_traced_memory()[0]
+    search(board, depth, eval_cache=cache)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return held
+
+
+def run():
+    for label, search, evaluate, board, depths in ENGINES:
+        print(f"--- {label} ---")
+        print(f"  {'depth':>5s} {'cache':>9s} {'time':>7s} {'hit rate':>9s} "
+              f"{'entries':>8s} {'evicted':>8s} {'memory':>9s}")
+        for depth in depths:
+            move, base = timed(search, board, depth, None)
+            print(f"  {depth:5d} {'none':>9s} {base:6.2f}s")
+            cache = EvalCache(evaluate, None)
+            cached_move, elapsed = timed(search, board, depth, cache)
+            assert cached_move == move, (cached_move, move)
+            limits = [None, max(1, len(cache) // 4)]
+            for limit in limits:
+                cache = EvalCache(evaluate, limit)
+                cached_move, elapsed = timed(search, board, depth, cache)
+                assert cached_move == move, (cached_move, move)
+                held = cache_bytes(search, board, depth, evaluate, limit)
+                name = "unbounded" if limit is None else f"{limit}"
+                print(f"  {depth:5d} {name:>9s} {elapsed:6.2f}s {cache.hit_rate():9.1%} "
+                      f"{len(cache):8d} {cache.evictions:8d} {held / 1e6:7.1f}MB"
+                      f"  ({base / elapsed:.2f}x)")
+        print()
+
+
+if __name__ == "__main__":
+    run()
+
+"""
+--- EASY 6x6 ---
+  depth     cache    time  hit rate  entries  evicted    memory
+      3      none   0.06s
+      3 unbounded   0.06s     24.5%     2122        0     0.4MB  (1.03x)
+      3       530   0.04s      8.1%      530     2052     0.1MB  (1.41x)
+      4      none   1.10s
+      4 unbounded   0.68s     51.7%    23240        0     5.4MB  (1.62x)
+      4      5810   0.76s     37.3%     5810    24338     1.8MB  (1.45x)
+      5      none  23.67s
+      5 unbounded  11.06s     76.3%   207389        0    46.4MB  (2.14x)
+      5     51847  14.71s     61.7%    51847   283686    15.2MB  (1.61x)
+
+--- 8x8 ---
+  depth     cache    time  hit rate  entries  evicted    memory
+      3      none   0.07s
+      3 unbounded   0.06s     12.6%     1687        0     0.3MB  (1.07x)
+      3       421   0.07s      6.8%      421     1378     0.1MB  (1.04x)
+      4      none   0.33s
+      4 unbounded   0.25s     28.5%     6347        0     1.4MB  (1.29x)
+      4      1586   0.24s     19.8%     1586     5537     0.4MB  (1.36x)
+      5      none   5.73s
+      5 unbounded   5.02s     41.1%   123162        0    25.6MB  (1.14x)
+      5     30790   5.63s     32.3%    30790   110796     8.2MB  (1.02x)
+
+Transpositions grow with depth, and so does the hit rate. EASY searches
+without pruning, so every transposed leaf is evaluated, and the cache
+pays off from depth 4. In the 8x8 alpha-beta search, pruning removes
+many transpositions, and evaluate() (about 15 us with the LineCache) is
+only a small part of each node. An entry costs about 200 bytes
+(OrderedDict slot, key tuple and score). Timings vary by roughly 10-20%
+between runs.
+"""
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Compare the copying Minimax path (``board.play``) against the in-place
+make/unmake path (``board.do`` / ``board.undo``) on the EASY, SPEEDUP and
+8x8 boards.
+
+For every engine the two searches must return the same move. Reported per
+search:
+  - boards copied: calls to ``Board.copy``. Each copy allocates a new board
+    object plus its storage (grid rows, or the states dict and availables
+    list), so this is the number of board allocations per search.
+  - wall time.
+
+The depth-first search frees boards as it backtracks, so the peak memory
+of both paths is similar; the difference is the allocation churn.
+"""
+
+from pathlib import Path
+import sys
+import time
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+sys.path.insert(0, str(repo_root / "EASY_GOMOKU"))
+sys.path.insert(0, str(repo_root / "SPEEDUP_EASY_GOMOKU"))
+
+import EASY_GOMOKU_class_board
+import EASY_GOMOKU_minimax
+import SPEEDUP_EASY_GOMOKU_board
+import SPEEDUP_EASY_GOMOKU_minimax
+from Gomoku_8_8 import GOMOKU_8x8_board
+from Gomoku_8_8 import GOMOKU_8x8_minimax
+
+
+def easy_position():
+    board = EASY_GOMOKU_class_board.Board(player='X')
+    for move in [(2, 2), (2, 3), (3, 3)]:
+        board = board.play(move)
+    return board
+
+
+def speedup_position():
+    board = SPEEDUP_EASY_GOMOKU_board.Board(current_player=1)
+    for move in [14, 15, 21]:
+        board = board.play(move)
+    return board
+
+
+def position_8x8():
+    board = GOMOKU_8x8_board.Board(player='X')
+    for move in [(3, 3), (3, 4), (4, 4), (2, 2)]:
+        board = board.play(move)
+    return board
+
+
+ENGINES = [
+    ("EASY 6x6, depth 4", easy_position, EASY_GOMOKU_class_board.Board,
+     EASY_GOMOKU_minimax, 4),
+    ("SPEEDUP 6x6, depth 4", speedup_position, SPEEDUP_EASY_GOMOKU_board.Board,
+     SPEEDUP_EASY_GOMOKU_minimax, 4),
+    ("8x8, depth 3", position_8x8, GOMOKU_8x8_board.Board,
+     GOMOKU_8x8_minimax, 3),
+]
+
+
+def count_copies(board_cls, search, board, depth):
+    original = board_cls.copy
+    copies = [0]
+
+    def counted(self):
+        copies[0] += 1
+        return original(self)
+
+    board_cls.copy = counted
+    try:
+        move = search(board, depth=depth)
+    finally:
+        board_cls.copy = original
+    return move, copies[0]
+
+
+def run():
+    for label, make_board, board_cls, module, depth in ENGINES:
+        print(f"--- {label} ---")
+        results = {}
+        for name, search in (("copying", module.find_best_move),
+                             ("in-place", module.find_best_move_inplace)):
+            board = make_board()
+            start = time.perf_counter()
+            move, copies = count_copies(board_cls, search, board, depth)
+            elapsed = time.perf_counter() - start
+
+            results[name] = move
+            print(f"  {name:9s} move={move} boards copied={copies:7d} "
+                  f"time={elapsed:.2f}s")
+        assert results["copying"] == results["in-place"], results
+        print()
+
+
+if __name__ == "__main__":
+    run()
+
+"""
+--- EASY 6x6, depth 4 ---
+  copying   move=(3, 2) boards copied=  51805 time=5.26s
+  in-place  move=(3, 2) boards copied=      1 time=6.95s
+
+--- SPEEDUP 6x6, depth 4 ---
+  copying   move=20 boards copied=  51805 time=8.53s
+  in-place  move=20 boards copied=      1 time=8.18s
+
+--- 8x8, depth 3 ---
+  copying   move=(4, 2) boards copied=   2101 time=0.38s
+  in-place  move=(4, 2) boards copied=      1 time=0.38s
+
+Wall time is dominated by the leaf evaluation and the full-board
+check_winner / legal_moves scans, so removing the copies alone shows up
+mostly as allocation churn rather than time.
+"""
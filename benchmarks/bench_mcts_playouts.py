@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Measure playout throughput of every MCTS variant at ``n_playout=2000``.
+
+Each variant runs one search (``get_move`` / ``get_move_probs``) from the
+same position three times:
+  - deepcopy: ``Board.clone`` patched back to ``copy.deepcopy``;
+  - clone: the board copied per playout by ``Board.clone()``;
+  - in-place: one working board, unwound with ``undo_move()`` after
+    every playout (``in_place=True``).
+Reported as playouts per second.
+
+Variants: pure MCTS (mcts/), heuristic MCTS (mcts/), guided MCTS and
+AlphaZero MCTS with the shipped 6x6 model (Monte_Carlo_guided_GOMOKU/).
+"""
+
+from pathlib import Path
+import copy
+import pickle
+import sys
+import time
+
+import numpy as np
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+sys.path.insert(0, str(repo_root / "Monte_Carlo_guided_GOMOKU"))
+
+from mcts.game import Board
+from mcts.mcts_pure import MCTS as PureMCTS, policy_value_fn as pure_policy
+from mcts.mcts_heuristic import HeuristicMCTSPlayer
+from mcts_game import Board as GuidedBoard
+from mcts_guided import MCTS as GuidedMCTS, policy_value_fn as guided_policy
+from mcts_alphaZero import MCTS as AlphaZeroMCTS
+from policy_value_net_numpy import PolicyValueNetNumpy
+
+N_PLAYOUT = 2000
+SIZE, N_IN_ROW = 6, 4
+OPENING = [14, 15, 21]
+MODEL_FILE = repo_root / "Monte_Carlo_guided_GOMOKU" / "best_policy_6_6_4.model"
+SEED = 0
+
+
+def position(board_cls):
+    board = board_cls(width=SIZE, height=SIZE, n_in_row=N_IN_ROW)
+    board.init_board()
+    for move in OPENING:
+        board.do_move(move)
+    return board
+
+
+def load_alphazero_policy():
+    try:
+        policy_param = pickle.load(open(MODEL_FILE, 'rb'))
+    except Exception:
+        policy_param = pickle.load(open(MODEL_FILE, 'rb'), encoding='bytes')
+    return PolicyValueNetNumpy(SIZE, SIZE, policy_param).policy_value_fn
+
+
+def variants():
+    return [
+        ("pure", Board,
+         lambda in_place: PureMCTS(pure_policy, 5, N_PLAYOUT, in_place),
+         "get_move"),
+        ("heuristic", Board,
+         lambda in_place: HeuristicMCTSPlayer(5, N_PLAYOUT, in_place).mcts,
+         "get_move"),
+        ("guided", GuidedBoard,
+         lambda in_place: GuidedMCTS(guided_policy, 5, N_PLAYOUT, in_place),
+         "get_move"),
+        ("alphazero", GuidedBoard,
+         lambda in_place: AlphaZeroMCTS(load_alphazero_policy(), 5,
+                                        N_PLAYOUT, in_place),
+         "get_move_probs"),
+    ]
+
+
+def playouts_per_second(board_cls, make_mcts, method, in_place=False):
+    np.random.seed(SEED)
+    mcts = make_mcts(in_place)
+    board = position(board_cls)
+    start = time.perf_counter()
+    getattr(mcts, method)(board)
+    return N_PLAYOUT / (time.perf_counter() - start)
+
+
+def run():
+    print(f"{SIZE}x{SIZE} (n_in_row={N_IN_ROW}), n_playout={N_PLAYOUT}\n")
+    print(f"  {'variant':10s}{'deepcopy':>12s}{'clone':>12s}{'in-place':>12s}")
+    for name, board_cls, make_mcts, method in variants():
+        clone = board_cls.clone
+        board_cls.clone = copy.deepcopy
+        try:
+            before = playouts_per_second(board_cls, make_mcts, method)
+        finally:
+            board_cls.clone = clone
+        cloned = playouts_per_second(board_cls, make_mcts, method)
+        in_place = playouts_per_second(board_cls, make_mcts, method, True)
+        print(f"  {name:10s}{before:12,.0f}{cloned:12,.0f}{in_place:12,.0f}")
+    print("\n  (playouts per second)")
+
+
+if __name__ == "__main__":
+    run()
+
+
+"""
+6x6 (n_in_row=4), n_playout=2000
+
+  variant       deepcopy       clone    in-place
+  pure             1,628       2,364       2,287
+  heuristic          419         452         419
+  guided             550         603         608
+  alphazero          417         498         525
+
+  (playouts per second)
+
+clone() removes most of the copying cost. On a 6x6 board the in-place
+path is within noise of it: each rollout move has to be undone, which
+costs about as much as the one clone it saves. The rollouts (pure,
+heuristic, guided) and the network forward pass (alphazero) dominate.
+"""
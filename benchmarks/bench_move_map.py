@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Per-move line walks vs one ``move_map`` pass (``common/move_scores.py``)
+over the whole board, at the three places that score candidate moves:
+
+  - the guided rollout scorer: ``_score_move_simple`` on every candidate
+    vs ``_score_moves`` on all of them (6x6 and 8x8 MCTS boards);
+  - the heuristic rollout policy: ``check_win_local`` on every free cell,
+    for the player then the opponent, vs the win/block flags of the map;
+  - 8x8 alpha-beta move ordering, which did not exist before: searches
+    with and without ``order_moves``, counting leaf evaluations.
+
+The per-move and map results are checked to be identical. For the
+ordered search, the chosen move must have the same minimax value as the
+unordered choice.
+"""
+
+from pathlib import Path
+import random
+import sys
+import time
+
+import numpy as np
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+sys.path.insert(0, str(repo_root / "Monte_Carlo_guided_GOMOKU"))
+
+from Gomoku_8_8 import GOMOKU_8x8_eval, GOMOKU_8x8_minimax
+from Gomoku_8_8.GOMOKU_8x8_board import Board as Board8x8
+from mcts.mcts_heuristic import check_win_local, heuristic_rollout_policy
+from mcts_game import Board as MCTSBoard
+from mcts_guided import _neighbors_of_existing_stones, _score_move_simple, _score_moves
+
+N_POSITIONS = 300
+REPEATS = 20
+SEED = 0
+SEARCHES = [
+    ([(3, 3), (3, 4), (4, 4), (2, 2)], (3, 4)),
+    ([(3, 3), (4, 4), (3, 4), (2, 5), (4, 3), (5, 2), (2, 3)], (3, 4)),
+]
+
+
+def random_boards(size, n_in_row, n_positions, seed=SEED):
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < n_positions:
+        board = MCTSBoard(width=size, height=size, n_in_row=n_in_row)
+        board.init_board()
+        for _ in range(rng.randint(4, size * size // 2)):
+            board.do_move(rng.choice(list(board.availables)))
+            if board.game_end()[0]:
+                break
+        if not board.game_end()[0]:
+            boards.append(board)
+    return boards
+
+
+def per_move_threats(board):
+    """heuristic_rollout_policy's forced move, walking lines per move."""
+    availables = np.flatnonzero(board.legal_mask).tolist()
+    player = board.current_player
+    for p in (player, 3 - player):
+        for move in availables:
+            if check_win_local(board.states, move, p, board.width, board.n_in_row):
+                return move
+    return None
+
+
+def map_threats(board):
+    probs = list(heuristic_rollout_policy(board))
+    return probs[0][0] if len(probs) == 1 else None
+
+
+def us_per_call(boards, fn):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for board in boards:
+            fn(board)
+    return (time.perf_counter() - start) / (REPEATS * len(boards)) * 1e6
+
+
+def score_per_move(board):
+    player = board.current_player
+    return [_score_move_simple(board, m, player) for m in _neighbors_of_existing_stones(board)]
+
+
+def score_with_map(board):
+    return _score_moves(board, _neighbors_of_existing_stones(board), board.current_player)
+
+
+def compare_scorers():
+    print(f"{N_POSITIONS} positions x {REPEATS} repeats (us per board)\n")
+    print(f"  {'call site':34s}{'per move':>10s}{'move_map':>10s}{'speedup':>10s}")
+    for size, n_in_row in ((6, 4), (8, 5)):
+        boards = random_boards(size, n_in_row, N_POSITIONS)
+        for board in boards:
+            assert list(score_with_map(board)) == score_per_move(board)
+            assert map_threats(board) == per_move_threats(board)
+        for label, before, after in (
+                ("guided scorer", score_per_move, score_with_map),
+                ("heuristic win/block", per_move_threats, map_threats)):
+            t_before, t_after = us_per_call(boards, before), us_per_call(boards, after)
+            print(f"  {f'{label} {size}x{size}':34s}{t_before:10.1f}{t_after:10.1f}"
+                  f"{t_before / t_after:9.2f}x")
+
+
+def search(board, depth, order_moves):
+    leaves = [0]
+
+    def counted(*args):
+        leaves[0] += 1
+        return GOMOKU_8x8_eval.evaluate(*args)
+
+    GOMOKU_8x8_minimax.evaluate = counted
+    try:
+        start = time.perf_counter()
+        move = GOMOKU_8x8_minimax.find_best_move_inplace(board, depth, order_moves=order_moves)
+        elapsed = time.perf_counter() - start
+    finally:
+        GOMOKU_8x8_minimax.evaluate = GOMOKU_8x8_eval.evaluate
+    return move, leaves[0], elapsed
+
+
+def move_value(board, move, depth):
+    child = board.play(move)
+    if child.winner_after_last_move() == board.player:
+        return float('inf')
+    return GOMOKU_8x8_minimax.minimax_inplace(child, depth - 1, -float('inf'), float('inf'),
+                                              False, board.player)
+
+
+def compare_ordering():
+    print("\n8x8 alpha-beta (find_best_move_inplace)\n")
+    for moves, depths in SEARCHES:
+        board = Board8x8(player='X')
+        for move in moves:
+            board = board.play(move)
+        print(f"  opening {moves}")
+        for depth in depths:
+            plain = search(board, depth, False)
+            ordered = search(board, depth, True)
+            assert move_value(board, plain[0], depth) == move_value(board, ordered[0], depth)
+            for name, (move, leaves, elapsed) in (("unordered", plain), ("ordered", ordered)):
+                print(f"    depth {depth} {name:10s} move={move} leaves={leaves:7d} "
+                      f"time={elapsed:6.2f}s")
+
+
+def run():
+    compare_scorers()
+    compare_ordering()
+
+
+if __name__ == "__main__":
+    run()
+
+"""
+300 positions x 20 repeats (us per board)
+
+  call site                           per move  move_map   speedup
+  guided scorer 6x6                      207.8      89.2     2.33x
+  heuristic win/block 6x6                 74.2      51.2     1.45x
+  guided scorer 8x8                      422.9     125.0     3.38x
+  heuristic win/block 8x8                138.0      64.5     2.14x
+
+8x8 alpha-beta (find_best_move_inplace)
+
+  opening [(3, 3), (3, 4), (4, 4), (2, 2)]
+    depth 3 unordered  move=(4, 2) leaves=   1931 time=  0.07s
+    depth 3 ordered    move=(4, 3) leaves=    345 time=  0.02s
+    depth 4 unordered  move=(1, 2) leaves=   8882 time=  0.34s
+    depth 4 ordered    move=(5, 5) leaves=   1679 time=  0.20s
+  opening [(3, 3), (4, 4), (3, 4), (2, 5), (4, 3), (5, 2), (2, 3)]
+    depth 3 unordered  move=(5, 3) leaves=   1187 time=  0.03s
+    depth 3 ordered    move=(5, 3) leaves=    528 time=  0.02s
+    depth 4 unordered  move=(5, 3) leaves=   9000 time=  0.29s
+    depth 4 ordered    move=(5, 3) leaves=    791 time=  0.14s
+
+A move_map call costs about 30-40 us whatever the number of candidates.
+The per-move walks cost a few us per candidate and direction. The
+heuristic policy's per-move version stops at the first forced move, so
+its gain is smaller. With ordering, alpha-beta evaluates 2-11x fewer
+leaves. Where several moves share the best value, it may return a
+different one of them.
+"""
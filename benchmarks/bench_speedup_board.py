@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the primitive board operations on the EASY_GOMOKU
+list-of-lists ``Board`` and the SPEEDUP_EASY_GOMOKU flat ``bytearray``
+``Board``.
+
+The same random mid-game positions are built on both boards. Each
+operation (``play``, ``legal_moves``, ``is_full``, ``check_winner``) is
+then timed over all positions and reported in nanoseconds per call.
+"""
+
+from pathlib import Path
+import random
+import sys
+import time
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+sys.path.insert(0, str(repo_root / "EASY_GOMOKU"))
+sys.path.insert(0, str(repo_root / "SPEEDUP_EASY_GOMOKU"))
+
+from EASY_GOMOKU_class_board import Board as EasyBoard
+from SPEEDUP_EASY_GOMOKU_board import Board as SpeedupBoard
+
+N_POSITIONS = 200
+REPEATS = 200
+SEED = 0
+
+
+def random_games(n_positions, seed=SEED):
+    """Flat move sequences of random games stopped before anyone wins."""
+    rng = random.Random(seed)
+    games = []
+    while len(games) < n_positions:
+        board = SpeedupBoard()
+        moves = []
+        for _ in range(rng.randint(4, 20)):
+            move = rng.choice(board.legal_moves())
+            board = board.play(move)
+            if board.winner_after_last_move():
+                break
+            moves.append(move)
+        games.append(moves)
+    return games
+
+
+def build_positions(games):
+    easy, speedup = [], []
+    for moves in games:
+        eb, sb = EasyBoard(player='X'), SpeedupBoard()
+        for move in moves:
+            eb = eb.play(divmod(move, EasyBoard.SIZE))
+            sb = sb.play(move)
+        # play() is timed with the first legal move of each position
+        move = sb.legal_moves()[0]
+        easy.append((eb, divmod(move, EasyBoard.SIZE)))
+        speedup.append((sb, move))
+    return easy, speedup
+
+
+def time_op(positions, op):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for board, move in positions:
+            op(board, move)
+    elapsed = time.perf_counter() - start
+    return elapsed / (REPEATS * len(positions)) * 1e9
+
+
+OPS = [
+    ("play", lambda board, move: board.play(move)),
+    ("legal_moves", lambda board, move: board.legal_moves()),
+    ("is_full", lambda board, move: board.is_full()),
+    ("check_winner", lambda board, move: board.check_winner('X')),
+]
+
+
+def run():
+    easy, speedup = build_positions(random_games(N_POSITIONS))
+    print(f"{N_POSITIONS} positions x {REPEATS} repeats (ns per call)\n")
+    print(f"  {'operation':14s}{'EASY Board':>12s}{'SPEEDUP Board':>15s}{'speedup':>10s}")
+    for name, op in OPS:
+        easy_ns = time_op(easy, op)
+        speedup_ns = time_op(speedup, op)
+        print(f"  {name:14s}{easy_ns:12,.0f}{speedup_ns:15,.0f}{easy_ns / speedup_ns:9.2f}x")
+
+
+if __name__ == "__main__":
+    run()
+
+"""
+200 positions x 200 repeats (ns per call)
+
+  operation       EASY Board  SPEEDUP Board   speedup
+  play                 1,935          1,660     1.17x
+  legal_moves          5,282          3,752     1.41x
+  is_full                106            103     1.02x
+  check_winner        11,411          6,689     1.71x
+
+EASY's legal_moves already reads an incrementally maintained frontier
+bitmask; the SPEEDUP board gets its gain from the per-cell neighbour
+counters. check_winner walks the 54 precomputed 4-cell windows instead of
+probing every cell in four directions.
+"""
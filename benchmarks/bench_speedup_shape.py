@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Cost of ``evaluate()`` on the SPEEDUP_EASY_GOMOKU board (padded integer
+grid, windows gathered through a precomputed NumPy index array) against
+the EASY_GOMOKU ``evaluate()`` (5-cell windows read from the list-of-lists
+grid one cell at a time, same 1024-entry shape table).
+
+For reference, the SPEEDUP substring matcher the index arrays replaced
+is rebuilt here from ``Shape._cell_char`` and ``match_patterns``: per
+stone and direction, five bounds-checked dict lookups into a window
+string, then every pattern string tested against it.
+
+The same random mid-game positions are built on both boards and all
+scores are checked to be equal (SPEEDUP's ``root_player`` 1/2 maps to
+EASY's 'X'/'O').
+"""
+
+from pathlib import Path
+import random
+import sys
+import time
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+sys.path.insert(0, str(repo_root / "EASY_GOMOKU"))
+sys.path.insert(0, str(repo_root / "SPEEDUP_EASY_GOMOKU"))
+
+from EASY_GOMOKU_class_board import Board as EasyBoard
+from EASY_GOMOKU_evaluation_function import evaluate as easy_evaluate
+from SPEEDUP_EASY_GOMOKU_board import Board as SpeedupBoard
+from SPEEDUP_EASY_GOMOKU_eval_function import SCORES, evaluate as speedup_evaluate
+from SPEEDUP_EASY_GOMOKU_shape import Shape, match_patterns
+
+N_POSITIONS = 500
+REPEATS = 20
+SEED = 0
+
+
+def evaluate_by_substrings(board, root_player):
+    shape = Shape(board)
+    total = 0
+    for row in range(shape.size):
+        for column in range(shape.size):
+            stone_char = shape._cell_char(row, column)
+            if stone_char == '-':
+                continue
+            owner = 1 if stone_char == 'X' else 2
+            for direction_row, direction_column in shape.DIRECTIONS:
+                line = ''.join(shape._cell_char(row + k * direction_row,
+                                                column + k * direction_column)
+                               for k in range(-2, 3))
+                for shape_type in match_patterns(line):
+                    if owner == root_player:
+                        total += SCORES[shape_type]
+                    elif shape_type == 'open_3':
+                        total -= SCORES['four_in_row'] * 0.9
+                    else:
+                        total -= SCORES[shape_type]
+    return total
+
+
+def random_positions(n_positions, seed=SEED):
+    rng = random.Random(seed)
+    easy, speedup = [], []
+    for _ in range(n_positions):
+        eb, sb = EasyBoard(player='X'), SpeedupBoard()
+        for _ in range(rng.randint(6, 16)):
+            move = rng.choice(sb.legal_moves())
+            sb = sb.play(move)
+            eb = eb.play(divmod(move, SpeedupBoard.SIZE))
+        easy.append(eb)
+        speedup.append(sb)
+    return easy, speedup
+
+
+def us_per_call(positions, evaluate, root_player):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for board in positions:
+            evaluate(board, root_player)
+    return (time.perf_counter() - start) / (REPEATS * len(positions)) * 1e6
+
+
+def run():
+    easy, speedup = random_positions(N_POSITIONS)
+    for eb, sb in zip(easy, speedup):
+        for root_player, stone in ((1, 'X'), (2, 'O')):
+            score = speedup_evaluate(sb, root_player)
+            assert score == easy_evaluate(eb, stone)
+            assert score == evaluate_by_substrings(sb, root_player)
+    substring_us = us_per_call(speedup, evaluate_by_substrings, 1)
+    easy_us = us_per_call(easy, easy_evaluate, 'X')
+    speedup_us = us_per_call(speedup, speedup_evaluate, 1)
+    print(f"{N_POSITIONS} positions x {REPEATS} repeats (us per evaluate call)\n")
+    print(f"  SPEEDUP substring matcher: {substring_us:8.1f}")
+    print(f"  EASY evaluate:             {easy_us:8.1f}")
+    print(f"  SPEEDUP evaluate:          {speedup_us:8.1f}"
+          f"   ({substring_us / speedup_us:.1f}x vs substrings,"
+          f" {easy_us / speedup_us:.1f}x vs EASY)")
+
+
+if __name__ == "__main__":
+    run()
+
+"""
+500 positions x 20 repeats (us per evaluate call)
+
+  SPEEDUP substring matcher:    297.4
+  EASY evaluate:                 23.8
+  SPEEDUP evaluate:              18.7   (15.9x vs substrings, 1.3x vs EASY)
+
+On a 6x6 board with 6-16 stones, SPEEDUP's evaluate is a fixed handful
+of NumPy calls: build the padded grid, gather all windows, and do the
+table lookups and the sum. EASY still reads each window cell by cell in
+Python, so its cost grows with the number of stones.
+"""
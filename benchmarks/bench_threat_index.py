@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Boards with a ``ThreatIndex`` (``common/threat_index.py``) vs without, at
+the places that look for immediate wins and forced blocks:
+
+  - the cost of keeping it: ``do_move``/``undo_move`` pairs on the 8x8
+    ``mcts`` board, plain, with ``WindowCounters`` and with the index;
+  - the heuristic rollout policy's forced move: a ``move_map`` pass over
+    the board vs two lookups in the index (results checked identical);
+  - full heuristic rollouts, each policy call included, from the same
+    random seed (same games, checked);
+  - 8x8 alpha-beta on positions with threats on the board, where the
+    index decides nodes with a winning cell (or two for the opponent)
+    without expanding them. The chosen move must be the same.
+"""
+
+from pathlib import Path
+import random
+import sys
+import time
+
+import numpy as np
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+
+from Gomoku_8_8 import GOMOKU_8x8_eval, GOMOKU_8x8_minimax
+from Gomoku_8_8.GOMOKU_8x8_board import Board as Board8x8
+from mcts.game import Board as MCTSBoard
+from mcts.mcts_heuristic import heuristic_rollout_policy
+
+N_POSITIONS = 300
+REPEATS = 20
+N_ROLLOUTS = 300
+SEED = 0
+DEPTH = 4
+SEARCHES = [
+    [(3, 3), (3, 4), (4, 4), (2, 2), (5, 5), (2, 4)],
+    [(3, 3), (4, 4), (3, 4), (2, 5), (4, 3), (5, 2), (2, 3)],
+    [(3, 3), (0, 0), (3, 4), (0, 7), (3, 5), (7, 0)],
+]
+
+
+def new_board(**kwargs):
+    board = MCTSBoard(width=8, height=8, n_in_row=5, **kwargs)
+    board.init_board()
+    return board
+
+
+def random_games(n_positions, seed=SEED):
+    """Move lists of random unfinished 8x8 positions."""
+    rng = random.Random(seed)
+    games = []
+    while len(games) < n_positions:
+        board = new_board()
+        for _ in range(rng.randint(4, 32)):
+            board.do_move(rng.choice(list(board.availables)))
+            if board.game_end()[0]:
+                break
+        if not board.game_end()[0]:
+            games.append([move for move, _, _ in board.history])
+    return games
+
+
+def replay(moves, **kwargs):
+    board = new_board(**kwargs)
+    for move in moves:
+        board.do_move(move)
+    return board
+
+
+def forced_move(board):
+    probs = list(heuristic_rollout_policy(board))
+    return int(probs[0][0]) if len(probs) == 1 else None
+
+
+def us_per_board(boards, fn):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for board in boards:
+            fn(board)
+    return (time.perf_counter() - start) / (REPEATS * len(boards)) * 1e6
+
+
+def do_undo(board):
+    for move in list(board.availables)[:8]:
+        board.do_move(move)
+        board.undo_move()
+
+
+def rollouts(**kwargs):
+    """Heuristic rollouts to the end; (winners, seconds)."""
+    np.random.seed(SEED)
+    winners = []
+    start = time.perf_counter()
+    for _ in range(N_ROLLOUTS):
+        board = new_board(**kwargs)
+        while True:
+            end, winner = board.game_end()
+            if end:
+                break
+            board.do_move(max(heuristic_rollout_policy(board), key=lambda p: p[1])[0])
+        winners.append(winner)
+    return winners, time.perf_counter() - start
+
+
+def compare_rollouts():
+    games = random_games(N_POSITIONS)
+    print(f"8x8 mcts board, {N_POSITIONS} positions x {REPEATS} repeats (us per board)\n")
+    variants = (("plain", {}), ("window counters", {'window_counters': True}),
+                ("threat index", {'threat_index': True}))
+    for label, kwargs in variants:
+        boards = [replay(moves, **kwargs) for moves in games]
+        print(f"  8 do_move/undo_move, {label:16s}{us_per_board(boards, do_undo):8.1f}")
+
+    plain = [replay(moves) for moves in games]
+    indexed = [replay(moves, threat_index=True) for moves in games]
+    assert [forced_move(b) for b in plain] == [forced_move(b) for b in indexed]
+    forced = sum(forced_move(b) is not None for b in plain)
+    t_map, t_index = us_per_board(plain, forced_move), us_per_board(indexed, forced_move)
+    print(f"\n  heuristic policy ({forced} forced)  move_map {t_map:6.1f}   threat index"
+          f" {t_index:6.1f}   ({t_map / t_index:.1f}x)")
+
+    winners_map, t_map = rollouts()
+    winners_index, t_index = rollouts(threat_index=True)
+    assert winners_map == winners_index
+    print(f"  {N_ROLLOUTS} heuristic rollouts (s)    move_map {t_map:6.2f}   threat index"
+          f" {t_index:6.2f}   ({t_map / t_index:.1f}x)")
+
+
+def search(board):
+    leaves = [0]
+
+    def counted(*args):
+        leaves[0] += 1
+        return GOMOKU_8x8_eval.evaluate(*args)
+
+    GOMOKU_8x8_minimax.evaluate = counted
+    try:
+        start = time.perf_counter()
+        move = GOMOKU_8x8_minimax.find_best_move_inplace(board, DEPTH)
+        elapsed = time.perf_counter() - start
+    finally:
+        GOMOKU_8x8_minimax.evaluate = GOMOKU_8x8_eval.evaluate
+    return move, leaves[0], elapsed
+
+
+def compare_search():
+    print(f"\n8x8 alpha-beta (find_best_move_inplace, depth {DEPTH})\n")
+    for moves in SEARCHES:
+        plain, indexed = Board8x8(player='X'), Board8x8(player='X', threat_index=True)
+        for move in moves:
+            plain, indexed = plain.play(move), indexed.play(move)
+        before, after = search(plain), search(indexed)
+        assert before[0] == after[0], (before[0], after[0])
+        print(f"  opening {moves}")
+        for name, (move, leaves, elapsed) in (("plain", before), ("threat index", after)):
+            print(f"    {name:13s} move={move} leaves={leaves:7d} time={elapsed:6.2f}s")
+
+
+def run():
+    compare_rollouts()
+    compare_search()
+
+
+if __name__ == "__main__":
+    run()
+
+"""
+8x8 mcts board, 300 positions x 20 repeats (us per board)
+
+  8 do_move/undo_move, plain               31.4
+  8 do_move/undo_move, window counters     32.1
+  8 do_move/undo_move, threat index        73.7
+
+  heuristic policy (68 forced)  move_map   60.6   threat index    6.9   (8.8x)
+  300 heuristic rollouts (s)    move_map   0.97   threat index   0.27   (3.6x)
+
+8x8 alpha-beta (find_best_move_inplace, depth 4)
+
+  opening [(3, 3), (3, 4), (4, 4), (2, 2), (5, 5), (2, 4)]
+    plain         move=(2, 3) leaves=  36935 time=  1.00s
+    threat index  move=(2, 3) leaves=  22703 time=  0.82s
+  opening [(3, 3), (4, 4), (3, 4), (2, 5), (4, 3), (5, 2), (2, 3)]
+    plain         move=(5, 3) leaves=   9000 time=  0.30s
+    threat index  move=(5, 3) leaves=   7992 time=  0.32s
+  opening [(3, 3), (0, 0), (3, 4), (0, 7), (3, 5), (7, 0)]
+    plain         move=(3, 2) leaves=  45738 time=  1.23s
+    threat index  move=(3, 2) leaves=  40461 time=  1.49s
+
+Keeping the index adds about 5 us per move and undo on 8x8, more than
+doubling the plain board's update. In exchange the forced-move question of
+the heuristic policy is two dictionary lookups instead of a move_map
+pass, and whole heuristic rollouts run 3-5x faster. In alpha-beta the
+index settles nodes where the side to move can win, or where the
+opponent has two winning cells, without expanding them (10-40% fewer
+leaves), but at depth 4 that barely pays for the per-move update: the
+search gains only in tactical positions.
+"""
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Compare boards with and without per-window stone counters
+(``window_counters=True``, see ``common/window_counters.py``).
+
+The same random mid-game positions are built on both kinds of board and
+timed on the queries the counters replace:
+  - 8x8 minimax ``Board.check_winner`` (window scan vs. O(1) lookup);
+  - the guided rollout scorer ``_score_move_simple`` on every available
+    move (direction walks vs. window counts) on the 8x8 MCTS board;
+and on one guided MCTS search, where every rollout move also pays for
+updating (and every playout for copying) the counters.
+"""
+
+from pathlib import Path
+import random
+import sys
+import time
+
+import numpy as np
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+sys.path.insert(0, str(repo_root / "Monte_Carlo_guided_GOMOKU"))
+
+from Gomoku_8_8.GOMOKU_8x8_board import Board as MinimaxBoard
+from mcts_game import Board as MCTSBoard
+from mcts_guided import MCTS, _score_move_simple, policy_value_fn
+
+N_POSITIONS = 200
+REPEATS = 50
+N_PLAYOUT = 1000
+SEED = 0
+
+
+def random_games(n_positions, seed=SEED):
+    """Move sequences (cell indices) of random 8x8 games with no winner."""
+    rng = random.Random(seed)
+    games = []
+    while len(games) < n_positions:
+        board = MCTSBoard(width=8, height=8, n_in_row=5)
+        board.init_board()
+        moves = []
+        for _ in range(rng.randint(6, 30)):
+            move = rng.choice(list(board.availables))
+            board.do_move(move)
+            if board.game_end()[0]:
+                break
+            moves.append(move)
+        games.append(moves)
+    return games
+
+
+def minimax_boards(games, counters):
+    boards = []
+    for moves in games:
+        board = MinimaxBoard(player='X', window_counters=counters)
+        for move in moves:
+            board = board.play(divmod(move, 8))
+        boards.append(board)
+    return boards
+
+
+def mcts_boards(games, counters):
+    boards = []
+    for moves in games:
+        board = MCTSBoard(width=8, height=8, n_in_row=5, window_counters=counters)
+        board.init_board()
+        for move in moves:
+            board.do_move(move)
+        boards.append(board)
+    return boards
+
+
+def ns_per_call(boards, op, calls_per_board=1):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for board in boards:
+            op(board)
+    elapsed = time.perf_counter() - start
+    return elapsed / (REPEATS * len(boards) * calls_per_board) * 1e9
+
+
+def score_all(board):
+    player = board.current_player
+    for move in board.availables:
+        _score_move_simple(board, move, player)
+
+
+def playouts_per_second(counters):
+    np.random.seed(SEED)
+    board = MCTSBoard(width=8, height=8, n_in_row=5, window_counters=counters)
+    board.init_board()
+    for move in [27, 28, 36]:
+        board.do_move(move)
+    mcts = MCTS(policy_value_fn, 5, N_PLAYOUT)
+    start = time.perf_counter()
+    mcts.get_move(board)
+    return N_PLAYOUT / (time.perf_counter() - start)
+
+
+def run():
+    games = random_games(N_POSITIONS)
+    n_free = sum(64 - len(moves) for moves in games) / len(games)
+
+    plain, counted = minimax_boards(games, False), minimax_boards(games, True)
+    check = lambda board: board.check_winner('X')
+    before, after = ns_per_call(plain, check), ns_per_call(counted, check)
+    print(f"8x8, {N_POSITIONS} positions x {REPEATS} repeats\n")
+    print(f"  {'query':26s}{'plain':>10s}{'counters':>10s}{'speedup':>10s}")
+    print(f"  {'check_winner (ns)':26s}{before:10,.0f}{after:10,.0f}{before / after:9.2f}x")
+
+    plain, counted = mcts_boards(games, False), mcts_boards(games, True)
+    before = ns_per_call(plain, score_all, n_free)
+    after = ns_per_call(counted, score_all, n_free)
+    print(f"  {'_score_move_simple (ns)':26s}{before:10,.0f}{after:10,.0f}{before / after:9.2f}x")
+
+    before, after = playouts_per_second(False), playouts_per_second(True)
+    print(f"  {'guided playouts/s':26s}{before:10,.0f}{after:10,.0f}{after / before:9.2f}x")
+
+
+if __name__ == "__main__":
+    run()
+
+"""
+8x8, 200 positions x 50 repeats
+
+  query                          plain  counters   speedup
+  check_winner (ns)              8,243       177    46.47x
+  _score_move_simple (ns)        8,649     7,175     1.21x
+  guided playouts/s                222       250     1.12x
+
+check_winner becomes a lookup of the number of filled windows. The scorer
+only gains on its win/block tests: the line-extension score after them
+still walks the four directions, since it rewards contiguous runs, which
+window counts do not describe. The guided search gains despite updating
+the counters on every rollout move and copying them with every clone().
+"""
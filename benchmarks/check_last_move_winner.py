@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Property check: ``winner_after_last_move()`` agrees with the full scan.
+
+On the EASY ``Board``, ``BitBoard``, SPEEDUP ``Board`` and 8x8 ``Board``,
+random games are played until a win or a full board, and after every
+move the local check must equal
+
+    'X' if check_winner('X') else 'O' if check_winner('O') else None
+
+(1/2 instead of 'X'/'O' on the SPEEDUP board). Games are played with
+``play`` and, where the board has them, with ``do`` and then taken back
+move by move with ``undo``, checking after every undo too. Boards built
+directly from a random grid (or states dict) have no known last move;
+there the check must fall back to the full scan, wins for both players
+included.
+
+Exits with an AssertionError on the first mismatch.
+"""
+
+from pathlib import Path
+import random
+import sys
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+sys.path.insert(0, str(repo_root / "EASY_GOMOKU"))
+sys.path.insert(0, str(repo_root / "SPEEDUP_EASY_GOMOKU"))
+
+from EASY_GOMOKU_class_bitboard import BitBoard
+from EASY_GOMOKU_class_board import Board as EasyBoard
+from Gomoku_8_8.GOMOKU_8x8_board import Board as Board8x8
+from Gomoku_8_8.GOMOKU_8x8_config import Config
+from SPEEDUP_EASY_GOMOKU_board import Board as SpeedupBoard
+
+N_GAMES = 1000
+N_GRIDS = 1000
+SEED = 0
+
+
+class Variant:
+    """How to drive one board class with (row, col) moves and 'X'/'O' stones."""
+
+    def __init__(self, name, size, new_board, from_grid, to_move, stones=('X', 'O')):
+        self.name = name
+        self.size = size
+        self.new_board = new_board    # () -> empty board, X to move
+        self.from_grid = from_grid    # grid of 'X'/'O'/None -> board
+        self.to_move = to_move        # (row, col) -> the board's move
+        self.stones = stones          # the board's codes for X and O
+
+
+def _grid_of(grid, empty):
+    return [[empty if stone is None else stone for stone in row] for row in grid]
+
+
+def _states_of(grid, size):
+    return {r * size + c: {'X': 1, 'O': 2}[stone]
+            for r, row in enumerate(grid) for c, stone in enumerate(row) if stone}
+
+
+VARIANTS = [
+    Variant("EASY Board", EasyBoard.SIZE, EasyBoard,
+            lambda grid: EasyBoard(_grid_of(grid, EasyBoard.EMPTY)), tuple),
+    Variant("EASY BitBoard", BitBoard.SIZE, BitBoard,
+            lambda grid: BitBoard(_grid_of(grid, BitBoard.EMPTY)), tuple),
+    Variant("SPEEDUP Board", SpeedupBoard.SIZE, SpeedupBoard,
+            lambda grid: SpeedupBoard(_states_of(grid, SpeedupBoard.SIZE)),
+            lambda move: move[0] * SpeedupBoard.SIZE + move[1], stones=(1, 2)),
+    Variant("8x8 Board", Config.SIZE, Board8x8,
+            lambda grid: Board8x8(_grid_of(grid, Config.EMPTY)), tuple),
+]
+
+
+def expected(board, variant):
+    x, o = variant.stones
+    return x if board.check_winner(x) else o if board.check_winner(o) else None
+
+
+def check(board, variant, context):
+    local, full = board.winner_after_last_move(), expected(board, variant)
+    assert local == full, f"{variant.name}, {context}: local {local!r} != full scan {full!r}"
+
+
+def random_game(variant, rng):
+    cells = [(r, c) for r in range(variant.size) for c in range(variant.size)]
+    rng.shuffle(cells)
+    return cells
+
+
+def check_play(variant, rng):
+    board = variant.new_board()
+    for ply, move in enumerate(random_game(variant, rng)):
+        board = board.play(variant.to_move(move))
+        check(board, variant, f"play, ply {ply}")
+        if board.winner_after_last_move() is not None:
+            break
+
+
+def check_do_undo(variant, rng):
+    board = variant.new_board()
+    played = 0
+    for move in random_game(variant, rng):
+        board.do(variant.to_move(move))
+        played += 1
+        check(board, variant, f"do, ply {played - 1}")
+        if board.winner_after_last_move() is not None:
+            break
+    for ply in range(played, 0, -1):
+        board.undo()
+        check(board, variant, f"undo back to ply {ply - 1}")
+
+
+def check_from_grid(variant, rng):
+    grid = [[rng.choice((None, None, 'X', 'O')) for _ in range(variant.size)]
+            for _ in range(variant.size)]
+    board = variant.from_grid(grid)
+    assert board.winner_after_last_move() == expected(board, variant)
+    return expected(board, variant) is not None
+
+
+def run():
+    rng = random.Random(SEED)
+    for variant in VARIANTS:
+        has_do = hasattr(variant.new_board(), 'do')
+        for _ in range(N_GAMES):
+            check_play(variant, rng)
+            if has_do:
+                check_do_undo(variant, rng)
+        won = sum(check_from_grid(variant, rng) for _ in range(N_GRIDS))
+        print(f"{variant.name:14s} ok: {N_GAMES} games with play"
+              f"{', do and undo' if has_do else ''}; {N_GRIDS} grids ({won} with a win)")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,4 @@
+"""
+Tables and helpers shared by every board representation in the project
+(EASY, SPEEDUP, 8x8 and the MCTS boards).
+"""
@@ -0,0 +1,81 @@
+"""
+Bounded memo of a static evaluation function.
+
+A depth-limited search reaches the same leaf position through many move
+orders (playing A then B, or B then A), and a static evaluator scores it
+from scratch each time. :class:`EvalCache` wraps an evaluator and keeps
+its results keyed by the position's Zobrist hash (see
+:mod:`common.zobrist`) and the perspective player, so a repeated position
+costs one dictionary lookup.
+
+The cache holds at most ``max_entries`` results and evicts the least
+recently used one when it is full. It counts hits, misses and evictions,
+so the speedup and the memory cost can be measured per search.
+
+A 64-bit hash collision would return the score of another position. With
+the numbers of positions a search here evaluates, the probability is
+negligible, and a transposition table would have the same risk.
+"""
+
+from collections import OrderedDict
+
+from common.zobrist import PLAYER_INDEX
+
+
+class EvalCache:
+    """
+    LRU memo of ``evaluate(board, player)``.
+
+    Call it like the evaluator it wraps. The board must expose
+    ``zobrist_key``, and the evaluator must depend only on the position
+    and ``player``.
+
+    Parameters
+    ----------
+    evaluate : callable
+        The evaluator, ``evaluate(board, player) -> score``.
+    max_entries : int or None, optional
+        Maximum number of cached scores; ``None`` for no limit.
+
+    Attributes
+    ----------
+    hits, misses, evictions : int
+        Calls answered from the cache, calls that ran the evaluator, and
+        entries dropped to respect ``max_entries``.
+    """
+
+    def __init__(self, evaluate, max_entries=100_000):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be positive or None")
+        self.evaluate = evaluate
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def __call__(self, board, player):
+        # players are keyed as 1/2 whatever the board encoding
+        key = (board.zobrist_key, PLAYER_INDEX[player])
+        entries = self._entries
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+        self.misses += 1
+        score = entries[key] = self.evaluate(board, player)
+        if self.max_entries is not None and len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return score
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def hit_rate(self):
+        """Fraction of calls answered from the cache (0.0 before any call)."""
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
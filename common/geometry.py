@@ -0,0 +1,172 @@
+"""
+Precomputed line geometry shared by all board representations.
+
+Win checks, pattern scans and rollout heuristics all need the same
+information about a board of a given size: which runs of ``n_in_row``
+cells can make a win, which of those runs pass through a cell, which
+cells surround a cell, and how to walk from a cell towards the edges.
+Recomputing it with bounds tests inside every call is wasted work, so
+:func:`board_geometry` derives it once per ``(width, height, n_in_row)``
+and every caller shares the result.
+
+Cells are indexed ``row * width + col`` as everywhere else in the
+project. Every table exists in two forms:
+
+- NumPy integer arrays (read-only), for vectorized code;
+- nested tuples of Python ints, for per-cell Python loops, where indexing
+  a NumPy array element by element would be slower than the bounds tests
+  it replaces.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Line directions as (d_row, d_col): horizontal, vertical, main diagonal,
+# anti-diagonal. Windows, rays and lines use this order.
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def _frozen(array):
+    array.flags.writeable = False
+    return array
+
+
+def _padded(rows, width):
+    """Stack ragged int rows into a (len(rows), width) array padded with -1."""
+    table = np.full((len(rows), width), -1, dtype=np.intp)
+    for i, row in enumerate(rows):
+        table[i, :len(row)] = row
+    return _frozen(table)
+
+
+class BoardGeometry:
+    """
+    Line geometry of a ``width`` x ``height`` board with ``n_in_row`` to win.
+
+    Attributes
+    ----------
+    width, height, n_in_row, n_cells : int
+        Board dimensions, win length and ``width * height``.
+    cell_coords : tuple[tuple[int, int], ...]
+        ``(row, col)`` of every cell, for boards stored as a grid.
+    window_cells : tuple[tuple[int, ...], ...]
+        Cells of every winning window (``n_in_row`` aligned cells), in
+        row-major order of their first cell, directions in
+        :data:`DIRECTIONS` order.
+    windows : np.ndarray
+        ``(n_windows, n_in_row)`` array of the same cells.
+    window_directions : np.ndarray
+        ``(n_windows,)`` index into :data:`DIRECTIONS` of each window.
+    cell_window_ids : tuple[tuple[int, ...], ...]
+        For each cell, the ids (rows of ``windows``) of the windows that
+        contain it.
+    cell_windows : np.ndarray
+        ``(n_cells, max_windows_per_cell)`` array of the same ids, padded
+        with -1; ``cell_window_counts`` holds the number of valid ids.
+    neighbor_cells : tuple[tuple[int, ...], ...]
+        For each cell, its on-board 8-neighbourhood in row-major order.
+    neighbors : np.ndarray
+        ``(n_cells, 8)`` array of the same cells, padded with -1;
+        ``neighbor_counts`` holds the number of valid neighbours.
+    rays : tuple
+        ``rays[cell][d]`` is a ``(forward, backward)`` pair of tuples: the
+        cells met walking from ``cell`` (excluded) to the edge along
+        direction ``d`` and along its opposite.
+    lines : tuple[tuple[int, ...], ...]
+        Every full row and column, then every main diagonal and every
+        anti-diagonal holding at least ``n_in_row`` cells, each from its
+        top end.
+    """
+
+    def __init__(self, width, height, n_in_row):
+        self.width = width
+        self.height = height
+        self.n_in_row = n_in_row
+        self.n_cells = width * height
+        self.cell_coords = tuple(divmod(cell, width) for cell in range(self.n_cells))
+
+        def on_board(r, c):
+            return 0 <= r < height and 0 <= c < width
+
+        windows, directions = [], []
+        for r in range(height):
+            for c in range(width):
+                for d, (dr, dc) in enumerate(DIRECTIONS):
+                    if on_board(r + (n_in_row - 1) * dr, c + (n_in_row - 1) * dc):
+                        windows.append(tuple((r + k * dr) * width + c + k * dc
+                                             for k in range(n_in_row)))
+                        directions.append(d)
+        self.window_cells = tuple(windows)
+        self.windows = _frozen(np.array(windows, dtype=np.intp).reshape(-1, n_in_row))
+        self.window_directions = _frozen(np.array(directions, dtype=np.intp))
+
+        ids_per_cell = [[] for _ in range(self.n_cells)]
+        for window_id, window in enumerate(windows):
+            for cell in window:
+                ids_per_cell[cell].append(window_id)
+        self.cell_window_ids = tuple(tuple(ids) for ids in ids_per_cell)
+        self.cell_windows = _padded(ids_per_cell, max(map(len, ids_per_cell), default=0))
+        self.cell_window_counts = _frozen(np.array([len(ids) for ids in ids_per_cell],
+                                                   dtype=np.intp))
+
+        neighbors, rays = [], []
+        for r in range(height):
+            for c in range(width):
+                neighbors.append(tuple(
+                    (r + dr) * width + c + dc
+                    for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                    if (dr or dc) and on_board(r + dr, c + dc)
+                ))
+                cell_rays = []
+                for dr, dc in DIRECTIONS:
+                    pair = []
+                    for sign in (1, -1):
+                        ray = []
+                        nr, nc = r + sign * dr, c + sign * dc
+                        while on_board(nr, nc):
+                            ray.append(nr * width + nc)
+                            nr += sign * dr
+                            nc += sign * dc
+                        pair.append(tuple(ray))
+                    cell_rays.append(tuple(pair))
+                rays.append(tuple(cell_rays))
+        self.neighbor_cells = tuple(neighbors)
+        self.neighbors = _padded(neighbors, 8)
+        self.neighbor_counts = _frozen(np.array([len(n) for n in neighbors], dtype=np.intp))
+        self.rays = tuple(rays)
+
+        lines = [tuple(r * width + c for c in range(width)) for r in range(height)]
+        lines += [tuple(r * width + c for r in range(height)) for c in range(width)]
+        # main diagonals: c - r == k; anti-diagonals: r + c == k
+        for k in range(-(height - 1), width):
+            line = tuple(r * width + r + k for r in range(height) if 0 <= r + k < width)
+            if len(line) >= n_in_row:
+                lines.append(line)
+        for k in range(width + height - 1):
+            line = tuple(r * width + k - r for r in range(height) if 0 <= k - r < width)
+            if len(line) >= n_in_row:
+                lines.append(line)
+        self.lines = tuple(lines)
+
+
+@lru_cache(maxsize=None)
+def board_geometry(width, height, n_in_row):
+    """
+    Return the shared :class:`BoardGeometry` for a board shape.
+
+    Parameters
+    ----------
+    width : int
+        Number of columns.
+    height : int
+        Number of rows.
+    n_in_row : int
+        Number of aligned stones needed to win.
+
+    Returns
+    -------
+    BoardGeometry
+        The geometry tables, built on first use and cached afterwards.
+    """
+    return BoardGeometry(width, height, n_in_row)
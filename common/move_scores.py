@@ -0,0 +1,119 @@
+"""
+Run lengths, immediate wins and forced blocks for every cell at once.
+
+Move ordering and rollout heuristics look at each candidate move the same
+way: how many stones of each player are lined up right next to the cell,
+along each direction, and whether a stone there would make ``n_in_row``
+(a win for the player, or a win to block for the opponent). Walking
+these lines cell by cell costs one Python loop per move and direction.
+
+:func:`move_map` answers the question for all cells of a board in one
+vectorized pass. It gathers the stones along the precomputed rays of
+:mod:`common.geometry`. The contiguous run length along a ray is then
+the position of the first cell that is not the player's stone.
+Callers combine the result into their own move scores.
+
+Cells are indexed ``row * width + col``. Stones are given as an array of
+0 (empty), 1 and 2, and players as 'X'/'O' or 1/2.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from common.geometry import board_geometry
+from common.zobrist import PLAYER_INDEX
+
+MoveMap = namedtuple('MoveMap', ['own_runs', 'opp_runs', 'wins', 'blocks'])
+MoveMap.__doc__ = """
+Per-cell result of :func:`move_map`.
+
+own_runs, opp_runs : np.ndarray
+    ``(n_cells, 4)`` int arrays. ``own_runs[cell, d]`` counts the
+    player's stones contiguous to ``cell`` on both sides along direction
+    ``d`` of :data:`common.geometry.DIRECTIONS`, not counting ``cell``
+    itself. ``opp_runs`` does the same for the opponent.
+wins, blocks : np.ndarray
+    ``(n_cells,)`` bool arrays. They mark the empty cells where a stone
+    of the player would complete ``n_in_row`` (``wins``), and where a
+    stone of the opponent would (``blocks``, the must-block cells).
+"""
+
+
+# Stone code of every byte value, for grids of 'X'/'O' and empty cells.
+_BYTE_STONES = np.zeros(256, dtype=np.int8)
+_BYTE_STONES[ord('X')], _BYTE_STONES[ord('O')] = 1, 2
+
+
+def stones_from_states(states, n_cells):
+    """Stone codes of a ``{cell: player}`` dict (players 1/2)."""
+    stones = np.zeros(n_cells, dtype=np.int8)
+    if states:
+        stones[list(states)] = list(states.values())
+    return stones
+
+
+def stones_from_grid(grid):
+    """Stone codes of a list-of-lists grid of 'X', 'O' and empty cells."""
+    text = ''.join([''.join(row) for row in grid])
+    return _BYTE_STONES[np.frombuffer(text.encode('ascii'), dtype=np.uint8)]
+
+
+@lru_cache(maxsize=None)
+def _ray_cells(width, height, n_in_row):
+    """
+    ``(2, n_cells, 4, max_ray + 1)`` index array of the rays of every
+    cell (forward, then backward), padded with at least one ``n_cells``:
+    an extra cell that :func:`move_map` always leaves empty, so that
+    every ray ends on a cell that is not a stone.
+    """
+    geometry = board_geometry(width, height, n_in_row)
+    n_cells = geometry.n_cells
+    longest = max(width, height) - 1
+    table = np.full((2, n_cells, 4, longest + 1), n_cells, dtype=np.intp)
+    for cell, cell_rays in enumerate(geometry.rays):
+        for d, pair in enumerate(cell_rays):
+            for side, ray in enumerate(pair):
+                table[side, cell, d, :len(ray)] = ray
+    table.flags.writeable = False
+    return table
+
+
+def move_map(geometry, stones, player):
+    """
+    Run lengths and win/block flags of every cell, in one pass.
+
+    Parameters
+    ----------
+    geometry : common.geometry.BoardGeometry
+        Geometry of the board.
+    stones : array-like
+        ``n_cells`` stone codes: 0 for empty, 1 and 2 for the players.
+    player : {'X', 'O', 1, 2}
+        The player to move; the other one is the opponent.
+
+    Returns
+    -------
+    MoveMap
+        The run lengths of both players around every cell, and the
+        cells where the player wins or must block.
+    """
+    n_cells = geometry.n_cells
+    rays = _ray_cells(geometry.width, geometry.height, geometry.n_in_row)
+    padded = np.zeros(n_cells + 1, dtype=np.int8)
+    padded[:n_cells] = stones
+    along = padded[rays]
+    player = PLAYER_INDEX[player]
+    opponent = 3 - player
+    # a run is the index of the first cell along the ray that is not the
+    # player's stone; the padding cell guarantees there is one
+    own = (along != player).argmax(axis=-1)
+    opp = (along != opponent).argmax(axis=-1)
+    own_runs = own[0] + own[1]
+    opp_runs = opp[0] + opp[1]
+    empty = padded[:n_cells] == 0
+    need = geometry.n_in_row - 1
+    wins = empty & (own_runs >= need).any(axis=1)
+    blocks = empty & (opp_runs >= need).any(axis=1)
+    return MoveMap(own_runs, opp_runs, wins, blocks)
@@ -0,0 +1,178 @@
+"""
+Threat cells of both players, updated per move.
+
+Built on the per-window stone counters of :mod:`common.window_counters`.
+A window that holds no opponent stone is *live* for a player. If it
+misses ``k`` of the player's stones, each of its empty cells is a
+``k``-window-threat cell for that player:
+
+- ``k == 1``: a stone there completes ``n_in_row``. These are the
+  winning cells, and the cells the opponent must block;
+- ``k == 2``: a stone there leaves some window one stone short, i.e.
+  creates a new winning cell;
+- ``k == 3``: a stone there leaves some window two stones short.
+
+Only ``k == 1`` is exact as a shape. The ``k == 2`` and ``k == 3``
+buckets are *window threats*, not the open fours and open threes of the
+8x8 evaluator (``OPEN_4``, ``OPEN_3``): a window only sees its own
+``n_in_row`` cells, so blocked and split shapes count too (e.g. the
+empty cell of ``OXXX-`` on 8x8, whose four has a single free end).
+Callers needing openness must check the run's ends themselves;
+``threat_value`` in the 8x8 minimax only relies on the winning cells.
+
+:class:`ThreatIndex` keeps, per player and per ``k``, the window-threat
+cells with the number of live windows behind each. A move only changes the
+windows through its cell, so only those are re-indexed. Questions such
+as "where can this player win right now?" become a dictionary lookup
+instead of a scan over every free cell.
+"""
+
+from common.window_counters import WindowCounters
+from common.zobrist import PLAYER_INDEX
+
+# Largest number of missing stones indexed (see the module docstring).
+MAX_MISSING = 3
+
+
+class ThreatIndex(WindowCounters):
+    """
+    :class:`~common.window_counters.WindowCounters` that also indexes the
+    window-threat cells of both players (see the module docstring: not
+    open fours or threes).
+
+    It can be used wherever window counters are, and boards create one
+    in their place on request (``threat_index=True``).
+
+    Parameters
+    ----------
+    geometry : common.geometry.BoardGeometry
+        Geometry of the board; its ``window_cells`` define the windows.
+
+    Attributes
+    ----------
+    stones : list[int]
+        Stone on every cell: 0 (empty), 1 or 2.
+    window_threats : list
+        ``window_threats[p][k]`` maps every ``k``-window-threat cell of
+        player ``p`` (1 or 2, ``1 <= k <= MAX_MISSING``) to the number of
+        live windows missing ``k`` stones through it.
+        ``window_threats[0]`` and ``window_threats[p][0]`` are unused.
+    """
+
+    def __init__(self, geometry):
+        super().__init__(geometry)
+        self.stones = [0] * geometry.n_cells
+        self.window_threats = [None] + [
+            [None] + [{} for _ in range(MAX_MISSING)] for _ in (1, 2)]
+        # an empty window misses n_in_row stones: indexed only when that
+        # is at most MAX_MISSING
+        for window in range(len(geometry.window_cells)):
+            self._index(window, 1)
+
+    def copy(self):
+        """Independent copy sharing the (immutable) geometry."""
+        new = ThreatIndex.__new__(ThreatIndex)
+        new.geometry = self.geometry
+        new.counts = [None, self.counts[1][:], self.counts[2][:]]
+        new.wins = self.wins[:]
+        new.stones = self.stones[:]
+        new.window_threats = [None] + [
+            [None] + [dict(cells) for cells in self.window_threats[p][1:]] for p in (1, 2)]
+        return new
+
+    def _index(self, window, sign):
+        """Add (sign 1) or drop (sign -1) the window-threat cells of ``window``."""
+        cells = self.geometry.window_cells[window]
+        for player in (1, 2):
+            if self.counts[3 - player][window]:
+                continue  # dead for this player
+            missing = self.geometry.n_in_row - self.counts[player][window]
+            if 1 <= missing <= MAX_MISSING:
+                _shift(self.window_threats[player][missing], cells, self.stones, sign)
+
+    def add(self, cell, player):
+        """Account for a stone of ``player`` placed on ``cell``."""
+        player = PLAYER_INDEX[player]
+        own, other = self.counts[player], self.counts[3 - player]
+        own_threats, other_threats = self.window_threats[player], self.window_threats[3 - player]
+        stones = self.stones
+        full = self.geometry.n_in_row
+        window_cells = self.geometry.window_cells
+        for window in self.geometry.cell_window_ids[cell]:
+            n_own, n_other = own[window], other[window]
+            if n_other == 0:
+                # one step closer for the player: the window moves up a level
+                missing = full - n_own
+                if missing <= MAX_MISSING:
+                    _shift(own_threats[missing], window_cells[window], stones, -1)
+                if 1 < missing <= MAX_MISSING + 1:
+                    stones[cell] = player
+                    _shift(own_threats[missing - 1], window_cells[window], stones, 1)
+                    stones[cell] = 0
+            if n_own == 0:
+                # the opponent's window dies
+                missing = full - n_other
+                if missing <= MAX_MISSING:
+                    _shift(other_threats[missing], window_cells[window], stones, -1)
+            own[window] = n_own + 1
+            if n_own + 1 == full:
+                self.wins[player] += 1
+        stones[cell] = player
+
+    def remove(self, cell, player):
+        """Undo :meth:`add` for a stone of ``player`` on ``cell``."""
+        player = PLAYER_INDEX[player]
+        own, other = self.counts[player], self.counts[3 - player]
+        own_threats, other_threats = self.window_threats[player], self.window_threats[3 - player]
+        stones = self.stones
+        full = self.geometry.n_in_row
+        window_cells = self.geometry.window_cells
+        stones[cell] = 0
+        for window in self.geometry.cell_window_ids[cell]:
+            n_own, n_other = own[window], other[window]
+            if n_other == 0:
+                # back down a level for the player
+                missing = full - n_own
+                if 1 <= missing <= MAX_MISSING:
+                    stones[cell] = player
+                    _shift(own_threats[missing], window_cells[window], stones, -1)
+                    stones[cell] = 0
+                if missing < MAX_MISSING:
+                    _shift(own_threats[missing + 1], window_cells[window], stones, 1)
+            if n_own == 1:
+                # the opponent's window comes back to life
+                missing = full - n_other
+                if missing <= MAX_MISSING:
+                    _shift(other_threats[missing], window_cells[window], stones, 1)
+            if n_own == full:
+                self.wins[player] -= 1
+            own[window] = n_own - 1
+
+    def winning_cells(self, player):
+        """
+        Empty cells where a stone of ``player`` completes ``n_in_row``
+        (the cells the opponent must block), as a read-only view. O(1).
+        """
+        return self.window_threats[PLAYER_INDEX[player]][1].keys()
+
+    def window_threat_cells(self, player, missing):
+        """
+        ``{cell: live windows}`` for the empty cells in a live window of
+        ``player`` missing ``missing`` stones (1 to :data:`MAX_MISSING`).
+        For ``missing`` 2 and 3 these include blocked and split shapes,
+        not only open fours and threes. The dict is the index itself: do
+        not modify it.
+        """
+        return self.window_threats[PLAYER_INDEX[player]][missing]
+
+
+def _shift(threat_cells, cells, stones, sign):
+    """Add ``sign`` to the count of every empty cell of a window."""
+    for cell in cells:
+        if stones[cell]:
+            continue
+        count = threat_cells.get(cell, 0) + sign
+        if count:
+            threat_cells[cell] = count
+        else:
+            del threat_cells[cell]
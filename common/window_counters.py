@@ -0,0 +1,95 @@
+"""
+Per-window stone counters.
+
+For every winning window of a board (see :mod:`common.geometry`) the
+counters keep how many stones each player has in it. Placing or removing
+a stone touches only the windows through that cell, and in exchange the
+usual threat questions no longer need a line scan:
+
+- "has this player won?" is a single lookup of the number of full
+  windows (:meth:`WindowCounters.has_win`);
+- "can this window still be completed by this player?" is one count
+  comparison (:meth:`WindowCounters.is_live`);
+- "how many windows would a stone on this cell complete?" only looks at
+  the windows through the cell (:meth:`WindowCounters.completing_windows`).
+
+Boards that support the counters create them on request and update them
+in their move methods; the counters themselves know nothing about the
+board's own encoding. Players may be given as 'X'/'O' or 1/2.
+"""
+
+from common.zobrist import PLAYER_INDEX
+
+
+class WindowCounters:
+    """
+    Stone counts of both players in every winning window of a board.
+
+    Parameters
+    ----------
+    geometry : common.geometry.BoardGeometry
+        Geometry of the board; its ``window_cells`` define the windows.
+
+    Attributes
+    ----------
+    counts : list
+        ``counts[p][w]`` is the number of stones of player ``p`` (1 or 2)
+        in window ``w``; ``counts[0]`` is unused.
+    wins : list[int]
+        ``wins[p]`` is the number of windows filled by player ``p``.
+    """
+
+    def __init__(self, geometry):
+        self.geometry = geometry
+        n_windows = len(geometry.window_cells)
+        self.counts = [None, [0] * n_windows, [0] * n_windows]
+        self.wins = [0, 0, 0]
+
+    def copy(self):
+        """Independent copy sharing the (immutable) geometry."""
+        new = WindowCounters.__new__(WindowCounters)
+        new.geometry = self.geometry
+        new.counts = [None, self.counts[1][:], self.counts[2][:]]
+        new.wins = self.wins[:]
+        return new
+
+    def add(self, cell, player):
+        """Account for a stone of ``player`` placed on ``cell``."""
+        player = PLAYER_INDEX[player]
+        counts = self.counts[player]
+        full = self.geometry.n_in_row
+        for window in self.geometry.cell_window_ids[cell]:
+            counts[window] += 1
+            if counts[window] == full:
+                self.wins[player] += 1
+
+    def remove(self, cell, player):
+        """Undo :meth:`add` for a stone of ``player`` on ``cell``."""
+        player = PLAYER_INDEX[player]
+        counts = self.counts[player]
+        full = self.geometry.n_in_row
+        for window in self.geometry.cell_window_ids[cell]:
+            if counts[window] == full:
+                self.wins[player] -= 1
+            counts[window] -= 1
+
+    def has_win(self, player):
+        """Whether ``player`` has filled at least one window. O(1)."""
+        return self.wins[PLAYER_INDEX[player]] > 0
+
+    def is_live(self, window, player):
+        """Whether ``player`` can still fill ``window`` (no opponent stone). O(1)."""
+        return self.counts[3 - PLAYER_INDEX[player]][window] == 0
+
+    def completing_windows(self, cell, player):
+        """
+        Number of windows a stone of ``player`` on the empty ``cell`` would
+        fill, i.e. windows through ``cell`` holding ``n_in_row - 1`` of the
+        player's stones and none of the opponent's.
+        """
+        player = PLAYER_INDEX[player]
+        own = self.counts[player]
+        other = self.counts[3 - player]
+        needed = self.geometry.n_in_row - 1
+        return sum(1 for window in self.geometry.cell_window_ids[cell]
+                   if own[window] == needed and other[window] == 0)
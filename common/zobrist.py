@@ -0,0 +1,89 @@
+"""
+Zobrist hashing shared by all board representations.
+
+Every board in the project indexes cells the same way (``row * width +
+col``) and, whatever its internal encoding, has exactly two kinds of
+stones: the first player ('X', or 1 in the MCTS-style boards) and the
+second player ('O', or 2). The keys below are therefore indexed by
+``(player, cell)`` with players numbered 1 and 2, which makes the hash of
+a position identical across representations: a transposition table, an
+evaluation cache or a network cache can share keys between engines.
+
+The hash of a position is the XOR of the keys of all stones on the board,
+further XOR-ed with :data:`SIDE_TO_MOVE_KEY` when the second player is to
+move. Placing or removing a stone and passing the turn are each a single
+XOR, so boards maintain the hash in O(1) per move.
+"""
+
+import random
+from functools import lru_cache
+
+# Both the 'X'/'O' and the 1/2 encodings map onto the same key rows.
+PLAYER_INDEX = {'X': 1, 'O': 2, 1: 1, 2: 2}
+
+# Keys are generated from a fixed seed so that hashes are reproducible
+# across processes and runs.
+_SEED = "gomoku-zobrist"
+
+SIDE_TO_MOVE_KEY = random.Random(_SEED).getrandbits(64)
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(width, height):
+    """
+    Return the piece keys for a board geometry.
+
+    Parameters
+    ----------
+    width : int
+        Number of columns.
+    height : int
+        Number of rows.
+
+    Returns
+    -------
+    tuple[tuple[int, ...], tuple[int, ...], tuple[int, ...]]
+        ``keys[player][cell]`` is the 64-bit key of a stone of ``player``
+        (1 or 2) on ``cell``. Row 0 is all zeros, so that an empty cell
+        (encoded as 0 by the numeric boards) contributes nothing.
+    """
+    rng = random.Random(f"{_SEED}-{width}x{height}")
+    n_cells = width * height
+    return (
+        (0,) * n_cells,
+        tuple(rng.getrandbits(64) for _ in range(n_cells)),
+        tuple(rng.getrandbits(64) for _ in range(n_cells)),
+    )
+
+
+def position_hash(width, height, stones, player_to_move):
+    """
+    Compute the Zobrist hash of a position from scratch.
+
+    Boards call this once when they are built from an existing position
+    and then update the hash incrementally.
+
+    Parameters
+    ----------
+    width : int
+        Number of columns.
+    height : int
+        Number of rows.
+    stones : iterable[tuple[int, object]]
+        ``(cell, player)`` pairs for every stone on the board, with
+        ``player`` in ``{'X', 'O', 1, 2}``.
+    player_to_move : {'X', 'O', 1, 2}
+        The side to move.
+
+    Returns
+    -------
+    int
+        The 64-bit hash of the position.
+    """
+    keys = zobrist_keys(width, height)
+    h = 0
+    for cell, player in stones:
+        h ^= keys[PLAYER_INDEX[player]][cell]
+    if PLAYER_INDEX[player_to_move] == 2:
+        h ^= SIDE_TO_MOVE_KEY
+    return h
@@ -7,7 +7,6 @@ network to guide the tree search and evaluate the leaf nodes
 """
 
 import numpy as np
-import copy
 
 
 def softmax(x):
@@ -88,7 +87,8 @@ class TreeNode(object):
 class MCTS(object):
     """An implementation of Monte Carlo Tree Search."""
 
-    def __init__(self, policy_value_fn, c_puct=5, n_playout=10000):
+    def __init__(self, policy_value_fn, c_puct=5, n_playout=10000,
+                 in_place=False):
         """
         policy_value_fn: a function that takes in a board state and outputs
             a list of (action, probability) tuples and also a score in [-1, 1]
@@ -97,16 +97,21 @@ class MCTS(object):
         c_puct: a number in (0, inf) that controls how quickly exploration
             converges to the maximum-value policy. A higher value means
             relying on the prior more.
+        in_place: if True, all playouts of a search run on one working
+            board and are unwound with undo_move() after backpropagation,
+            instead of cloning the board for every playout.
         """
         self._root = TreeNode(None, 1.0)
         self._policy = policy_value_fn
         self._c_puct = c_puct
         self._n_playout = n_playout
+        self._in_place = in_place
 
     def _playout(self, state):
         """Run a single playout from the root to the leaf, getting a value at
         the leaf and propagating it back through its parents.
-        State is modified in-place, so a copy must be provided.
+        State is modified in-place, so a copy (or a board that is unwound
+        afterwards, see _run_playouts) must be provided.
         """
         node = self._root
         while(1):
@@ -136,15 +141,27 @@ class MCTS(object):
         # Update value and visit count of nodes in this traversal.
         node.update_recursive(-leaf_value)
 
+    def _run_playouts(self, state):
+        """Run n_playout playouts from state, leaving state unchanged."""
+        if not self._in_place:
+            for n in range(self._n_playout):
+                state_copy = state.clone()
+                self._playout(state_copy)
+            return
+        board = state.clone()  # one working board for the whole search
+        n_moves = len(board.history)
+        for n in range(self._n_playout):
+            self._playout(board)
+            while len(board.history) > n_moves:
+                board.undo_move()
+
     def get_move_probs(self, state, temp=1e-3):
         """Run all playouts sequentially and return the available actions and
         their corresponding probabilities.
         state: the current game state
         temp: temperature parameter in (0, 1] controls the level of exploration
         """
-        for n in range(self._n_playout):
-            state_copy = copy.deepcopy(state)
-            self._playout(state_copy)
+        self._run_playouts(state)
 
         # calc the move probabilities based on visit counts at the root node
         act_visits = [(act, node._n_visits)
@@ -172,8 +189,8 @@ class MCTSPlayer(object):
     """AI player based on MCTS"""
 
     def __init__(self, policy_value_function,
-                 c_puct=5, n_playout=2000, is_selfplay=0):
-        self.mcts = MCTS(policy_value_function, c_puct, n_playout)
+                 c_puct=5, n_playout=2000, is_selfplay=0, in_place=False):
+        self.mcts = MCTS(policy_value_function, c_puct, n_playout, in_place)
         self._is_selfplay = is_selfplay
 
     def set_player_ind(self, p):
@@ -1,5 +1,7 @@
 import numpy as np
 from operator import itemgetter
+from common.geometry import board_geometry
+from common.move_scores import move_map, stones_from_states
 from .mcts_pure import MCTS, MCTSPlayer
 
 def check_win_local(states, move, player, size=8, n_win=5):
@@ -7,26 +9,20 @@ def check_win_local(states, move, player, size=8, n_win=5):
     Checks if placing a stone at 'move' creates a win.
     OPTIMIZATION: Only checks the 4 lines passing through 'move'.
     This is mathematically identical to scanning the whole board but O(1).
+    The lines are walked along the shared precomputed rays (common.geometry).
     """
-    r, c = divmod(move, size)
-    # Directions: Horizontal, Vertical, Diag \, Diag /
-    directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-    
-    for dr, dc in directions:
+    # Rays: Horizontal, Vertical, Diag \, Diag /
+    for forward, backward in board_geometry(size, size, n_win).rays[move]:
         count = 1
         # Scan forward
-        for k in range(1, n_win):
-            nr, nc = r + k*dr, c + k*dc
-            if not (0 <= nr < size and 0 <= nc < size): break
-            if states.get(nr * size + nc) != player: break
+        for m in forward:
+            if states.get(m) != player: break
             count += 1
         # Scan backward
-        for k in range(1, n_win):
-            nr, nc = r - k*dr, c - k*dc
-            if not (0 <= nr < size and 0 <= nc < size): break
-            if states.get(nr * size + nc) != player: break
+        for m in backward:
+            if states.get(m) != player: break
             count += 1
-            
+
         if count >= n_win:
             return True
     return False
@@ -38,24 +34,43 @@ def heuristic_rollout_policy(board):
     2. If opponent wins next turn -> Block it (100%).
     3. Otherwise -> Random.
     """
-    availables = board.availables
+    # ascending free moves, straight from the legal mask
+    availables = np.flatnonzero(board.legal_mask).tolist()
     if not availables: return None
     
     current_p = board.current_player
-    opp_p = 1 if current_p == 2 else 2
     size = board.width
     n_win = board.n_in_row
-    
-    # 1. Critical Offense: Can I win NOW?
-    for move in availables:
-        # We pass board.states directly to avoid slow object copying
-        if check_win_local(board.states, move, current_p, size, n_win):
-            return zip([move], [1.0])
-            
+
+    # Boards with a threat index (common.threat_index) keep both sets of
+    # cells up to date: no scan at all
+    index = getattr(board, 'threat_index', None)
+    if index is not None:
+        wins = index.winning_cells(current_p)
+        if wins: return zip([min(wins)], [1.0])
+        blocks = index.winning_cells(board.players[0] if current_p == board.players[1]
+                                     else board.players[1])
+        if blocks: return zip([min(blocks)], [1.0])
+        probs = np.random.rand(len(availables))
+        return zip(availables, probs)
+
+    # Win and must-block cells of the whole board in one vectorized pass
+    # (common.move_scores), instead of check_win_local on every move
+    geometry = board_geometry(size, size, n_win)
+    cells = getattr(board, 'cells', None)
+    stones = (np.frombuffer(cells, dtype=np.uint8) if cells is not None
+              else stones_from_states(board.states, geometry.n_cells))
+    threats = move_map(geometry, stones, current_p)
+
+    # 1. Critical Offense: Can I win NOW? (lowest such move, as before)
+    wins = np.flatnonzero(threats.wins)
+    if len(wins):
+        return zip([int(wins[0])], [1.0])
+
     # 2. Critical Defense: Must I block?
-    for move in availables:
-        if check_win_local(board.states, move, opp_p, size, n_win):
-            return zip([move], [1.0])
+    blocks = np.flatnonzero(threats.blocks)
+    if len(blocks):
+        return zip([int(blocks[0])], [1.0])
 
     # 3. Random
     probs = np.random.rand(len(availables))
@@ -78,12 +93,13 @@ class HeuristicMCTS(MCTS):
         return 1 if winner == player else -1
 
 class HeuristicMCTSPlayer(MCTSPlayer):
-    def __init__(self, c_puct=5, n_playout=400):
+    def __init__(self, c_puct=5, n_playout=400, in_place=False):
         # We override the internal MCTS instance with our Heuristic one
-        self.mcts = HeuristicMCTS(self.dummy_policy, c_puct, n_playout)
+        self.mcts = HeuristicMCTS(self.dummy_policy, c_puct, n_playout, in_place)
         
     def dummy_policy(self, board):
-        return zip(board.availables, np.ones(len(board.availables))/len(board.availables)), 0
+        legal_moves = np.flatnonzero(board.legal_mask).tolist()
+        return zip(legal_moves, np.ones(len(legal_moves))/len(legal_moves)), 0
         
     def get_action(self, board):
         if len(board.availables) > 0:
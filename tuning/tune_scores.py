@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Texel-style tuning of the heuristic ``SCORES`` tables from game records.
+
+Both evaluators are linear in the weights they use once the position is
+fixed:
+
+  - EASY (6x6, four in a row): ``evaluate`` sums ``SCORES[shape]`` over
+    the shapes around every stone, negated for the opponent, and an
+    opponent open three costs ``0.9 * SCORES['four_in_row']``;
+  - 8x8: below its game-deciding checks (a five or an open four on the
+    board), ``evaluate`` weighs the ``BLOCKED_4``, ``OPEN_3`` and
+    ``OPEN_2`` counts of each side, the opponent's multiplied by 10, 5
+    or 1.5 depending on its threats.
+
+So every position reduces to a small feature vector ``x`` with
+``evaluate == x @ SCORES``. The features of all positions are extracted
+in vectorized batches: the positions are replayed from the records as
+stone arrays, encoded with ``stone_window_codes`` / ``stone_line_codes``
+and looked up in per-code feature tables. Positions the tuned weights
+cannot change (EASY: a four on the board or an opponent open three, both
+scored by ``four_in_row``; 8x8: a five or an open four) are left out.
+
+The fit follows Texel tuning: the side to move wins with probability
+``sigmoid(k * evaluate)``. ``k`` is first fitted for the current table,
+which fixes the units, then the tuned weights are fitted by logistic
+regression (Newton steps on the log loss) with that ``k``. The weights
+that are kept are written out with the new ones as a ``SCORES`` table.
+
+Records are text files with one game per line: the result (``X``, ``O``
+or ``-`` for a draw), then the moves as ``row,col``, X moving first::
+
+    X 2,2 3,3 2,3 3,2 2,4 3,4 2,5
+
+``generate`` writes random games in that format, to try the pipeline
+and measure it; real games (e.g. engine matches) give meaningful weights.
+
+Usage::
+
+    python tuning/tune_scores.py generate easy 50000 easy_games.txt
+    python tuning/tune_scores.py tune easy easy_games.txt [--out scores.py]
+"""
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+
+# Make repo root and module folders importable regardless of invocation CWD
+repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repo_root))
+sys.path.insert(0, str(repo_root / "EASY_GOMOKU"))
+
+import EASY_GOMOKU_evaluation_function as easy_eval
+from EASY_GOMOKU_class_board import Board as EasyBoard
+from EASY_GOMOKU_class_shape import (
+    N_WINDOW_CODES, SHAPE_TABLE, SYMBOLS, stone_window_codes,
+)
+from Gomoku_8_8.GOMOKU_8x8_config import Config
+from Gomoku_8_8.GOMOKU_8x8_shape import LINE_COUNTS, PATTERN_NAMES, stone_line_codes
+from common.geometry import board_geometry
+
+CHUNK_POSITIONS = 50_000
+RESULTS = {'X': 1, 'O': 2, '-': 0}  # record result -> winner (0: draw)
+
+_EASY_KEYS = list(easy_eval.SCORES)
+# the Config.SCORES weights used by the weighted sum of the 8x8 evaluate()
+GOMOKU8_TUNED = ('BLOCKED_4', 'OPEN_3', 'OPEN_2')
+
+
+def _easy_feature_table():
+    """
+    Feature vector (one entry per key of the EASY ``SCORES``) of every
+    window code, for root player 'X', following ``shape_score``.
+    """
+    keys = _EASY_KEYS
+    table = np.zeros((N_WINDOW_CODES, len(keys)))
+    for code in range(N_WINDOW_CODES):
+        owner = SYMBOLS[(code >> 4) & 3]  # the centre cell of the window
+        if owner not in 'XO':
+            continue  # not counted by evaluate()
+        for shape_type in SHAPE_TABLE[code]:
+            if owner == 'X':
+                table[code, keys.index(shape_type)] += 1
+            elif shape_type == 'open_3':
+                table[code, keys.index('four_in_row')] -= 0.9
+            else:
+                table[code, keys.index(shape_type)] -= 1
+    return table
+
+
+_EASY_FEATURES = _easy_feature_table()
+
+
+def easy_features(stones):
+    """
+    (features, decided) of EASY positions with X to move: ``features @
+    SCORES`` is ``evaluate(board, 'X')``; decided rows have a non-zero
+    ``four_in_row`` feature.
+    """
+    codes = stone_window_codes(stones, EasyBoard.SIZE)
+    features = np.stack([column[codes].sum(axis=(1, 2)) for column in _EASY_FEATURES.T], axis=1)
+    return features, features[:, _EASY_KEYS.index('four_in_row')] != 0
+
+
+def gomoku8_features(stones):
+    """
+    (features, decided) of 8x8 positions with X to move: ``features @``
+    the :data:`GOMOKU8_TUNED` weights is ``evaluate(board, 'X')`` for the
+    rows that are not decided (a five or an open four on the board).
+    """
+    counts = LINE_COUNTS[stone_line_codes(stones)].sum(axis=1, dtype=np.int64)
+    n = len(PATTERN_NAMES)
+    mine, theirs = counts[:, :n], counts[:, n:]
+    col = {name: i for i, name in enumerate(PATTERN_NAMES)}
+    decided = (mine[:, col['WIN']] + theirs[:, col['WIN']]
+               + mine[:, col['OPEN_4']] + theirs[:, col['OPEN_4']]) > 0
+    # the opponent weights of evaluate()'s defensive panic logic
+    panic = np.where(theirs[:, col['BLOCKED_4']] > 0, 10,
+                     np.where(theirs[:, col['OPEN_3']] > 0, 5, 1.5))
+    tuned = [col[name] for name in GOMOKU8_TUNED]
+    return mine[:, tuned] - panic[:, None] * theirs[:, tuned], decided
+
+
+# size, n_in_row, SCORES table, tuned keys and feature extractor per engine
+ENGINES = {
+    'easy': (EasyBoard.SIZE, EasyBoard.GEOMETRY.n_in_row, easy_eval.SCORES,
+             tuple(key for key in _EASY_KEYS if key != 'four_in_row'), easy_features),
+    '8x8': (Config.SIZE, Config.WIN_LENGTH, Config.SCORES, GOMOKU8_TUNED, gomoku8_features),
+}
+
+
+def read_records(path, size):
+    """[(moves as flat cells, winner 1/2 or 0 for a draw)] of a record file."""
+    games = []
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if not fields:
+                continue
+            moves = [int(r) * size + int(c) for r, c in (move.split(',') for move in fields[1:])]
+            games.append((np.array(moves, dtype=np.intp), RESULTS[fields[0]]))
+    return games
+
+
+def write_records(path, games, size):
+    with open(path, 'w') as f:
+        for moves, winner in games:
+            moves = ' '.join(f"{cell // size},{cell % size}" for cell in moves)
+            f.write(f"{'-XO'[winner]} {moves}\n")
+
+
+def random_games(n_games, size, n_in_row, rng):
+    """
+    Uniformly random games, played out in one vectorized pass: a game is
+    a random order of all cells, cut at the first ply that fills a
+    window with one player's stones.
+    """
+    geometry = board_geometry(size, size, n_in_row)
+    n_cells = geometry.n_cells
+    order = rng.random((n_games, n_cells)).argsort(axis=1)  # cell played at each ply
+    ply = order.argsort(axis=1)  # ply at which each cell is played
+    window_plies = ply[:, np.array(geometry.window_cells)]
+    parity = window_plies % 2
+    one_player = (parity == parity[..., :1]).all(axis=2)
+    end = np.where(one_player, window_plies.max(axis=2), n_cells).min(axis=1)
+    return [(order[g, :min(end[g] + 1, n_cells)], int(1 + end[g] % 2) if end[g] < n_cells else 0)
+            for g in range(n_games)]
+
+
+def replay(games, n_cells):
+    """
+    Every position before each move of ``games``, with X to move: stone
+    arrays (colours swapped where O is to move, which evaluate() scores
+    the same way), and the result for the side to move (1, 0.5 or 0).
+    """
+    lengths = np.array([len(moves) for moves, _ in games])
+    ply = np.full((len(games), n_cells), n_cells, dtype=np.int16)
+    for g, (moves, _) in enumerate(games):
+        ply[g, moves] = np.arange(len(moves))
+    game = np.repeat(np.arange(len(games)), lengths)
+    t = (np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)).astype(np.int16)
+    to_move = 1 + t % 2
+    plies = ply[game]
+    # stone of the player to move: 1, of the opponent: 2
+    own_stone = (plies % 2 == t[:, None] % 2)
+    stones = np.where(plies < t[:, None], np.where(own_stone, 1, 2), 0).astype(np.int8)
+    winner = np.array([winner for _, winner in games])[game]
+    result = np.where(winner == 0, 0.5, (winner == to_move).astype(float))
+    return stones, result
+
+
+def extract(games, engine):
+    """Features and results of the undecided positions of ``games``."""
+    size, _, _, _, features_of = ENGINES[engine]
+    chunks, results = [], []
+    lengths = np.array([len(moves) for moves, _ in games])
+    start = 0
+    while start < len(games):
+        # whole games, about CHUNK_POSITIONS positions per batch
+        stop = start + max(1, np.searchsorted(np.cumsum(lengths[start:]), CHUNK_POSITIONS))
+        stones, result = replay(games[start:stop], size * size)
+        features, decided = features_of(stones)
+        chunks.append(features[~decided])
+        results.append(result[~decided])
+        start = stop
+    return np.concatenate(chunks), np.concatenate(results)
+
+
+def log_loss(z, y):
+    """Mean cross-entropy of win probabilities sigmoid(z) against results y."""
+    return float(np.mean(np.logaddexp(0, z) - y * z))
+
+
+def fit_scale(scores, y):
+    """Texel's k: the scale minimizing log_loss(k * scores, y), by golden section on log10 k."""
+    lo, hi = -12.0, 2.0
+    ratio = (5 ** 0.5 - 1) / 2
+    for _ in range(50):  # the bracket shrinks to ~1e-9 decades
+        a, b = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+        if log_loss(10 ** a * scores, y) < log_loss(10 ** b * scores, y):
+            hi = b
+        else:
+            lo = a
+    return 10 ** ((lo + hi) / 2)
+
+
+def fit_weights(features, y, k, weights, offset, iterations=50, ridge=1e-9):
+    """
+    Logistic regression of y on ``features`` (plus the fixed ``offset``
+    logits), by Newton steps from ``k * weights``, halving a step when
+    the loss does not drop. Returns the fitted weights, in SCORES units.
+    """
+    x = features
+    beta = k * np.asarray(weights, dtype=float)
+    loss = log_loss(offset + x @ beta, y)
+    for _ in range(iterations):
+        p = 1 / (1 + np.exp(-(offset + x @ beta)))
+        gradient = x.T @ (p - y) / len(y)
+        hessian = (x * (p * (1 - p))[:, None]).T @ x / len(y) + ridge * np.eye(len(beta))
+        step = np.linalg.solve(hessian, gradient)
+        for _ in range(30):
+            new_loss = log_loss(offset + x @ (beta - step), y)
+            if new_loss <= loss:
+                break
+            step = step / 2
+        else:
+            break
+        beta, improvement, loss = beta - step, loss - new_loss, new_loss
+        if improvement < 1e-12:
+            break
+    return beta / k
+
+
+def format_scores(scores):
+    """``SCORES = {...}`` in the style of the source files."""
+    lines = [f"    {name!r}: {value:_}," for name, value in scores.items()]
+    return "SCORES = {\n" + "\n".join(lines) + "\n}\n"
+
+
+def tune(engine, games):
+    """New SCORES table for ``engine`` fitted on ``games``, with a report."""
+    _, _, scores, tuned, _ = ENGINES[engine]
+    start = time.perf_counter()
+    features, y = extract(games, engine)
+    elapsed = time.perf_counter() - start
+    print(f"{len(games)} games: {len(y)} undecided positions, features extracted in {elapsed:.1f}s")
+
+    if engine == 'easy':
+        current = np.array([scores[key] for key in _EASY_KEYS], dtype=float)
+        columns = [_EASY_KEYS.index(key) for key in tuned]
+        fixed = [i for i in range(len(_EASY_KEYS)) if i not in columns]
+        fixed_scores = features[:, fixed] @ current[fixed]
+        features = features[:, columns]
+    else:
+        fixed_scores = np.zeros(len(y))
+    weights = np.array([scores[key] for key in tuned], dtype=float)
+    k = fit_scale(fixed_scores + features @ weights, y)
+    before = log_loss(k * (fixed_scores + features @ weights), y)
+    fitted = fit_weights(features, y, k, weights, k * fixed_scores)
+    after = log_loss(k * (fixed_scores + features @ fitted), y)
+    print(f"k = {k:.3g}   log loss {before:.5f} -> {after:.5f}")
+
+    new_scores = dict(scores)
+    for key, value in zip(tuned, fitted):
+        new_scores[key] = int(round(value))
+    return new_scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    generate = commands.add_parser('generate', help="write random games as records")
+    generate.add_argument('engine', choices=ENGINES)
+    generate.add_argument('n_games', type=int)
+    generate.add_argument('records')
+    generate.add_argument('--seed', type=int, default=0)
+    fit = commands.add_parser('tune', help="fit the SCORES table on game records")
+    fit.add_argument('engine', choices=ENGINES)
+    fit.add_argument('records', nargs='+')
+    fit.add_argument('--out', help="file to write the SCORES table to (default: print it)")
+    args = parser.parse_args()
+
+    size, n_in_row = ENGINES[args.engine][:2]
+    if args.command == 'generate':
+        games = random_games(args.n_games, size, n_in_row, np.random.default_rng(args.seed))
+        write_records(args.records, games, size)
+        print(f"{len(games)} games, {sum(len(moves) for moves, _ in games)} positions")
+        return
+
+    games = [game for path in args.records for game in read_records(path, size)]
+    table = format_scores(tune(args.engine, games))
+    if args.out:
+        Path(args.out).write_text(table)
+    else:
+        print(table, end='')
+
+
+if __name__ == "__main__":
+    main()